@@ -0,0 +1,134 @@
+import os
+import threading
+
+import pygame
+
+# Cache asset global (gambar, varian yang di-scale, font, suara).
+# Setiap file hanya di-decode dan di-convert sekali per proses; pemanggil berikutnya
+# mendapat Surface/Font yang sama. Surface hasil cache dipakai bersama: jangan
+# digambari langsung, copy() dulu kalau perlu dimodifikasi.
+# Pemakaian:
+#     from assets import assets
+#     heart = assets.image("graphics/items/heart.png", size=(64, 64))
+#     font = assets.font("graphics/font/joystix.ttf", 50)
+
+
+class AssetManager:
+    def __init__(self):
+        self.images = {}        # (path, alpha) -> Surface hasil decode + convert
+        self.scaled = {}        # (path, alpha, size, smooth) -> Surface
+        self.folders = {}       # path folder -> list Surface
+        self.fonts = {}         # (path, size) -> Font
+        self.sounds = {}        # path -> Sound
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.RLock()   # LevelPreloader bisa memuat asset dari thread lain
+
+    def _lookup(self, cache, key):
+        surface = cache.get(key)
+        if surface is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return surface
+
+    def _load_image(self, path, alpha):
+        """Gambar dasar dari cache atau disk, tanpa menghitung hit/miss (dipakai varian scale & folder)."""
+        key = (path, alpha)
+        surface = self.images.get(key)
+        if surface is None:
+            surface = pygame.image.load(path)
+            if pygame.display.get_surface() is not None:
+                surface = surface.convert_alpha() if alpha else surface.convert()
+            self.images[key] = surface
+        return surface
+
+    def image(self, path, alpha=True, size=None, smooth=False):
+        """
+        Surface untuk file gambar, sudah di-convert ke format display kalau display ada.
+        size: (w, h) untuk varian yang di-scale (di-cache terpisah); smooth memakai smoothscale.
+        Setiap panggilan dihitung tepat satu hit atau miss.
+        """
+        with self.lock:
+            if size is not None:
+                key = (path, alpha, tuple(size), smooth)
+                surface = self._lookup(self.scaled, key)
+                if surface is None:
+                    scale = pygame.transform.smoothscale if smooth else pygame.transform.scale
+                    surface = scale(self._load_image(path, alpha), tuple(size))
+                    self.scaled[key] = surface
+                return surface
+
+            if self._lookup(self.images, (path, alpha)) is not None:
+                return self.images[(path, alpha)]
+            return self._load_image(path, alpha)
+
+    def folder(self, path):
+        """Semua .png di folder (urut nama file), mis. frame animasi player."""
+        with self.lock:
+            frames = self._lookup(self.folders, path)
+            if frames is None:
+                frames = [self._load_image(f"{path}/{name}", True) for name in sorted(os.listdir(path))
+                          if name.endswith(".png")]
+                self.folders[path] = frames
+            return frames
+
+    def font(self, path, size):
+        """Font pygame; path None atau file tidak ada -> font default pygame."""
+        if path is not None and not os.path.exists(path):
+            path = None
+        with self.lock:
+            key = (path, size)
+            font = self._lookup(self.fonts, key)
+            if font is None:
+                font = pygame.font.Font(path, size)
+                self.fonts[key] = font
+            return font
+
+    def sound(self, path):
+        """pygame.mixer.Sound, atau None kalau mixer tidak aktif."""
+        if not pygame.mixer.get_init():
+            return None
+        with self.lock:
+            sound = self._lookup(self.sounds, path)
+            if sound is None:
+                sound = pygame.mixer.Sound(path)
+                self.sounds[path] = sound
+            return sound
+
+    def memory_bytes(self):
+        """Perkiraan memori pixel semua surface di cache."""
+        with self.lock:
+            surfaces = list(self.images.values()) + list(self.scaled.values())
+            for frames in self.folders.values():
+                surfaces.extend(frames)
+        unique = {id(s): s for s in surfaces}.values()
+        return sum(s.get_width() * s.get_height() * s.get_bytesize() for s in unique)
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "images": len(self.images),
+            "scaled": len(self.scaled),
+            "fonts": len(self.fonts),
+            "sounds": len(self.sounds),
+            "memory_mb": self.memory_bytes() / (1024 * 1024),
+        }
+
+    def report(self):
+        s = self.stats()
+        return (f"Assets: {s['hits']} hit / {s['misses']} miss, {s['images']} gambar, {s['scaled']} varian scale, "
+                f"{s['fonts']} font, {s['sounds']} suara, {s['memory_mb']:.1f} MB surface")
+
+    def clear(self):
+        with self.lock:
+            self.images.clear()
+            self.scaled.clear()
+            self.folders.clear()
+            self.fonts.clear()
+            self.sounds.clear()
+
+
+# Instance global untuk seluruh game
+assets = AssetManager()
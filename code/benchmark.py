@@ -0,0 +1,429 @@
+import argparse
+import contextlib
+import glob
+import io
+import json
+import os
+import platform
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")   # headless: tidak butuh window/monitor
+
+import numpy as np
+import pygame
+
+from settings import *
+from capture_sources import SYNTHETIC_POSES, synthetic_hand
+from assets import assets
+from hand_features import NUM_FEATURES, FeatureEngine, engineer_features, engineer_features_batch
+
+# Benchmark headless untuk hot path gesture dan rendering.
+# Jalankan dari root repo:
+#     python code/benchmark.py run --output cache/benchmarks/baseline.json
+#     python code/benchmark.py compare cache/benchmarks/baseline.json          (jalankan ulang lalu bandingkan)
+#     python code/benchmark.py compare baseline.json current.json --threshold 0.15
+# compare keluar dengan kode 1 kalau ada operasi yang p50-nya lebih lambat dari threshold.
+#     python code/benchmark.py check                                          (cek kebenaran, exit 1 kalau gagal)
+# check: parity NumPy vs Keras, budget waktu import (import_report), motion gate, urutan gambar map.
+
+DEFAULT_MODEL = "model/GRU/311025_GRU_3.keras"
+DEFAULT_MAPS = "map/*.tmx"
+DEFAULT_OUTPUT = "cache/benchmarks/latest.json"
+BENCHMARK_VERSION = 1
+
+
+def measure(fn, iterations, warmup=10):
+    """Jalankan fn() berulang dan kembalikan statistik latency (ms) + throughput."""
+    for _ in range(warmup):
+        fn()
+    samples = np.empty(iterations, dtype=np.float64)
+    clock = time.perf_counter_ns
+    for i in range(iterations):
+        start = clock()
+        fn()
+        samples[i] = clock() - start
+    samples /= 1e6
+    p50, p95, p99 = np.percentile(samples, (50, 95, 99))
+    total_s = samples.sum() / 1000
+    return {
+        "iterations": iterations,
+        "mean_ms": float(samples.mean()),
+        "p50_ms": float(p50),
+        "p95_ms": float(p95),
+        "p99_ms": float(p99),
+        "max_ms": float(samples.max()),
+        "ops_per_s": float(iterations / total_s) if total_s > 0 else 0.0,
+    }
+
+
+def synthetic_landmarks(count, noise=0.002, seed=0):
+    """Landmark (count, 21, 3) dari pose sintetis (semua gesture bergantian) + jitter."""
+    rng = np.random.default_rng(seed)
+    poses = [synthetic_hand(SYNTHETIC_POSES[label]) for label in sorted(SYNTHETIC_POSES)]
+    landmarks = np.stack([poses[i % len(poses)] for i in range(count)])
+    return landmarks + rng.normal(0.0, noise, landmarks.shape).astype(np.float32)
+
+
+# ==============================================================================
+# Benchmark per operasi. Masing-masing return {nama: statistik}.
+# ==============================================================================
+def bench_features(iterations):
+    landmarks = synthetic_landmarks(256)
+    engine = FeatureEngine()
+    counter = iter(range(10**9))
+    batch = synthetic_landmarks(64, seed=1)
+    out = np.empty((64, NUM_FEATURES), dtype=np.float32)
+    return {
+        "engineer_features": measure(lambda: engineer_features(landmarks[next(counter) % 256]), iterations),
+        "feature_engine.extract": measure(lambda: engine.extract(landmarks[next(counter) % 256]), iterations),
+        "engineer_features_batch[64]": measure(lambda: engineer_features_batch(batch, out=out),
+                                               max(1, iterations // 10)),
+    }
+
+
+def bench_model(model_path, iterations):
+    from numpy_inference import NumpyGestureModel
+
+    model = NumpyGestureModel(model_path)
+    features = FeatureEngine(capacity=64).extract_batch(synthetic_landmarks(64)).copy()
+    single = features[:1].reshape(1, 1, -1)
+    batch = features.reshape(64, 1, -1)
+    counter = iter(range(10**9))
+    results = {
+        "model.predict": measure(lambda: model.predict(single), iterations),
+        "model.predict_step": measure(lambda: model.predict_step(features[next(counter) % 64]), iterations),
+        "model.predict[64]": measure(lambda: model.predict(batch), max(1, iterations // 10)),
+    }
+    model.reset_state()
+    return results
+
+
+def bench_map(tmx_path, iterations, screen):
+    from map_loader import TiledMap
+    from level.level import Level
+
+    name = os.path.splitext(os.path.basename(tmx_path))[0]
+    results = {}
+
+    tiled = TiledMap(tmx_path)
+    surface = pygame.Surface(tiled.get_size())
+    tiled.render(surface)   # isi cache tile dulu, yang diukur render steady-state
+    results[f"map.render[{name}]"] = measure(lambda: tiled.render(surface), max(1, iterations // 20), warmup=1)
+
+    font = assets.font(None, 30)
+    level = Level(None, screen, font, tmx_path, 2)
+    player = level.player
+    group = level.visible_sprites
+    results[f"custom_draw[{name}]"] = measure(
+        lambda: group.custom_draw(player, level.map_surface, level.map.rect), max(1, iterations // 5))
+
+    # Hitbox acak di seluruh map: mewakili collision check player di posisi mana pun
+    rng = np.random.default_rng(0)
+    map_rect = level.map.rect
+    boxes = [player.hitbox.copy() for _ in range(512)]
+    for box in boxes:
+        box.center = (int(rng.integers(0, max(1, map_rect.width))), int(rng.integers(0, max(1, map_rect.height))))
+    counter = iter(range(10**9))
+    results[f"obstacle_collision[{name}]"] = measure(
+        lambda: player.check_obstacle_collision(boxes[next(counter) % 512]), iterations)
+    return results
+
+
+def run_benchmarks(maps, model_path, iterations):
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+
+    results = {}
+    skipped = {}
+    print("[BENCH] features")
+    results.update(bench_features(iterations))
+
+    print(f"[BENCH] model {model_path}")
+    try:
+        results.update(bench_model(model_path, iterations))
+    except Exception as e:
+        skipped["model"] = str(e)
+        print(f"[WARN] Benchmark model dilewati: {e}")
+
+    for tmx_path in maps:
+        print(f"[BENCH] map {tmx_path}")
+        try:
+            results.update(bench_map(tmx_path, iterations, screen))
+        except Exception as e:
+            skipped[tmx_path] = str(e)
+            print(f"[WARN] Benchmark map {tmx_path} dilewati: {e}")
+
+    return {
+        "version": BENCHMARK_VERSION,
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "numpy": np.__version__,
+            "pygame": pygame.version.ver,
+            "iterations": iterations,
+            "model": model_path,
+            "maps": list(maps),
+        },
+        "results": results,
+        "skipped": skipped,
+    }
+
+
+# ==============================================================================
+# Cek kebenaran optimasi. Masing-masing return list pesan kegagalan (kosong = OK).
+# ==============================================================================
+def reference_draw(group, player, base_surface, base_rect):
+    """
+    Sort Y penuh tanpa layer statis (cara lama): semua sprite `group` di-sort dan
+    di-blit di atas `base_surface` yang belum berisi tile statis.
+    """
+    if group.camera:
+        group.camera.update(player)
+    offset_x, offset_y = int(group.camera.offset.x), int(group.camera.offset.y)
+    screen = group.screen_surface
+    screen.blit(group.floor_surf, (group.floor_rect.x - offset_x, group.floor_rect.y - offset_y))
+    screen.blit(base_surface, (base_rect.x - offset_x, base_rect.y - offset_y))
+    for sprite in sorted(group.static_sprites + group.sprites(), key=group.draw_key):
+        screen.blit(sprite.image, (sprite.rect.x - offset_x, sprite.rect.y - offset_y))
+
+
+def check_draw_order(tmx_path, screen, frames=40):
+    """custom_draw (layer statis + redraw) harus sama piksel demi piksel dengan sort Y penuh."""
+    from level.level import Level
+
+    font = assets.font(None, 30)
+    level = Level(None, screen, font, tmx_path, 2)
+    group = level.visible_sprites
+    player = level.player
+
+    # Map surface sebelum tile statis di-bake, seperti yang dipakai sort penuh
+    base_surface = pygame.Surface(level.map_surface.get_size())
+    base_surface.fill((0, 0, 0))
+    base_surface.blit(level.map.map_layer, (0, 0))
+
+    rng = np.random.default_rng(0)
+    map_rect = level.map.rect
+    failures = []
+    for frame in range(frames):
+        if frame:   # frame 0: posisi spawn
+            player.rect.center = (int(rng.integers(0, max(1, map_rect.width))),
+                                  int(rng.integers(0, max(1, map_rect.height))))
+        group.custom_draw(player, level.map_surface, level.map.rect)
+        baked = pygame.image.tobytes(screen, "RGB")
+        reference_draw(group, player, base_surface, level.map.rect)
+        if baked != pygame.image.tobytes(screen, "RGB"):
+            failures.append(f"custom_draw[{tmx_path}] frame {frame} (player {player.rect.center}) beda dari sort penuh")
+    return failures
+
+
+def replay_actions(motion_gate_epsilon, seed, noise=0.002, duration=40.0, hold_seconds=3.0,
+                   confidence_threshold=0.10):
+    """
+    Label per frame + aksi terkonfirmasi + (hit, miss) motion gate dari sesi sintetis
+    (non-realtime, deterministik).
+    """
+    from camera import HandGestureCamera
+
+    with contextlib.redirect_stdout(io.StringIO()):     # log [GESTURE CONFIRMED] tidak perlu
+        cam = HandGestureCamera(source_config={"type": "synthetic", "duration": duration, "noise": noise,
+                                               "seed": seed, "hold_seconds": hold_seconds, "realtime": False},
+                                motion_gate_epsilon=motion_gate_epsilon)
+        if cam.model is None:
+            raise RuntimeError("model gesture gagal diload")
+        cam.confidence_threshold = confidence_threshold
+        labels, actions = [], []
+        while True:
+            previous = cam.last_result
+            cam.process()
+            if cam.last_result is previous:
+                break   # source habis
+            labels.append(cam.last_result.predicted_label)
+            action = cam.consume_action()
+            if action is not None:
+                actions.append(action)
+        cam.release()
+    return labels, actions, cam.motion_gate_stats()
+
+
+def check_motion_gate(motion_gate_epsilon, seeds=(0, 1, 2), noise=0.002, holds=(3.0, 8.0)):
+    """
+    Motion gate tidak boleh mengubah aksi terkonfirmasi dibanding inferensi tiap frame
+    (level 4), untuk tahan gesture pendek (3 s) dan panjang (8 s, konfirmasi berulang),
+    dan harus benar-benar melewati inferensi di sebagian frame.
+    """
+    failures = []
+    total_hits = total_frames = 0
+    for hold_seconds in holds:
+        duration = 40.0 if hold_seconds <= 3.0 else 60.0
+        for seed in seeds:
+            labels, actions, _ = replay_actions(None, seed, noise, duration, hold_seconds)
+            gated_labels, gated_actions, (hits, misses) = replay_actions(
+                motion_gate_epsilon, seed, noise, duration, hold_seconds)
+            total_hits += hits
+            total_frames += hits + misses
+            changed = sum(a != b for a, b in zip(labels, gated_labels))
+            print(f"[CHECK] motion gate eps={motion_gate_epsilon} hold={hold_seconds:.0f}s seed={seed}: "
+                  f"{hits}/{hits + misses} inferensi dilewati, {changed}/{len(labels)} label beda")
+            if gated_actions != actions:
+                failures.append(f"motion gate eps={motion_gate_epsilon} hold={hold_seconds:.0f}s seed={seed} "
+                                f"noise={noise}: aksi {gated_actions} != tanpa gate {actions}")
+    if total_hits == 0:
+        failures.append(f"motion gate eps={motion_gate_epsilon}: tidak pernah melewati inferensi")
+    return failures
+
+
+def run_checks(maps, motion_gate_epsilon=MOTION_GATE_EPSILON):
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+
+    failures = []
+    skipped = {}
+    from numpy_inference import PARITY_FIXTURE, check_parity_fixture
+    print(f"[CHECK] parity NumPy vs Keras ({PARITY_FIXTURE})")
+    try:
+        failures.extend(check_parity_fixture(PARITY_FIXTURE))
+    except Exception as e:
+        skipped["parity"] = str(e)
+        print(f"[WARN] Cek parity dilewati: {e}")
+
+    from import_report import DEFAULT_MODULES, check_imports
+    print(f"[CHECK] waktu import {', '.join(DEFAULT_MODULES)}")
+    import_failures, import_skipped = check_imports(top=5)
+    failures.extend(import_failures)
+    skipped.update({f"import {module}": reason for module, reason in import_skipped.items()})
+
+    if motion_gate_epsilon is None:
+        print("[CHECK] motion gate mati (MOTION_GATE_EPSILON=None), inferensi tiap frame")
+    else:
+        try:
+            failures.extend(check_motion_gate(motion_gate_epsilon))
+        except Exception as e:
+            skipped["motion_gate"] = str(e)
+            print(f"[WARN] Cek motion gate dilewati: {e}")
+    if not maps:
+        failures.append("draw order: tidak ada file TMX yang dicek")
+    for tmx_path in maps:
+        print(f"[CHECK] draw order {tmx_path}")
+        try:
+            failures.extend(check_draw_order(tmx_path, screen))
+        except Exception as e:
+            skipped[tmx_path] = str(e)
+            print(f"[WARN] Cek map {tmx_path} dilewati: {e}")
+    if maps and all(tmx_path in skipped for tmx_path in maps):
+        failures.append(f"draw order: semua {len(maps)} map gagal diload, tidak ada yang dicek")
+    return failures, skipped
+
+
+def print_results(report):
+    print(f"\n{'operation':<36} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9} {'ops/s':>11}")
+    for name, stats in report["results"].items():
+        print(f"{name:<36} {stats['p50_ms']:>9.4f} {stats['p95_ms']:>9.4f} {stats['p99_ms']:>9.4f} "
+              f"{stats['max_ms']:>9.4f} {stats['ops_per_s']:>11.1f}")
+    for name, reason in report.get("skipped", {}).items():
+        print(f"{name:<36} dilewati: {reason}")
+
+
+def compare_reports(baseline, current, threshold, metric="p50_ms"):
+    """
+    Bandingkan dua laporan. Return list regresi (nama, baseline, current, rasio):
+    operasi yang `metric`-nya naik lebih dari threshold (0.10 = 10% lebih lambat).
+    """
+    regressions = []
+    print(f"\n{'operation':<36} {'baseline':>10} {'current':>10} {'change':>8}")
+    for name, base_stats in baseline["results"].items():
+        stats = current["results"].get(name)
+        if stats is None:
+            print(f"{name:<36} {base_stats[metric]:>10.4f} {'-':>10} {'hilang':>8}")
+            continue
+        ratio = stats[metric] / base_stats[metric] if base_stats[metric] > 0 else 1.0
+        flag = ""
+        if ratio > 1.0 + threshold:
+            regressions.append((name, base_stats[metric], stats[metric], ratio))
+            flag = "  REGRESI"
+        print(f"{name:<36} {base_stats[metric]:>10.4f} {stats[metric]:>10.4f} {(ratio - 1) * 100:>+7.1f}%{flag}")
+    for name in current["results"]:
+        if name not in baseline["results"]:
+            print(f"{name:<36} {'-':>10} {current['results'][name][metric]:>10.4f} {'baru':>8}")
+    return regressions
+
+
+def save_report(report, path):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n[BENCH] Hasil disimpan ke {path}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark headless hot path gesture dan rendering.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    def add_run_options(p):
+        p.add_argument("--maps", nargs="*", default=None, help=f"file TMX (default {DEFAULT_MAPS})")
+        p.add_argument("--model", default=DEFAULT_MODEL)
+        p.add_argument("--iterations", type=int, default=2000)
+
+    run_parser = sub.add_parser("run", help="jalankan benchmark dan tulis JSON")
+    add_run_options(run_parser)
+    run_parser.add_argument("--output", default=DEFAULT_OUTPUT)
+
+    compare_parser = sub.add_parser("compare", help="bandingkan dengan baseline JSON")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current", nargs="?", help="JSON hasil run; kosong = jalankan benchmark sekarang")
+    compare_parser.add_argument("--threshold", type=float, default=0.10)
+    compare_parser.add_argument("--metric", default="p50_ms", choices=("mean_ms", "p50_ms", "p95_ms", "p99_ms"))
+    compare_parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    add_run_options(compare_parser)
+
+    check_parser = sub.add_parser("check", help="cek hasil optimasi sama dengan implementasi referensi")
+    check_parser.add_argument("--maps", nargs="*", default=None, help=f"file TMX (default {DEFAULT_MAPS})")
+    check_parser.add_argument("--motion-gate-epsilon", type=float, default=MOTION_GATE_EPSILON,
+                              help="epsilon motion gate yang dicek (default MOTION_GATE_EPSILON di settings)")
+    check_parser.add_argument("--allow-skipped", action="store_true",
+                              help="cek yang tidak bisa jalan hanya jadi peringatan (default: dihitung gagal)")
+
+    args = parser.parse_args(argv)
+    maps = args.maps if args.maps is not None else sorted(glob.glob(DEFAULT_MAPS))
+
+    if args.command == "check":
+        failures, skipped = run_checks(maps, args.motion_gate_epsilon)
+        for name, reason in skipped.items():
+            print(f"{name:<36} dilewati: {reason}")
+            if not args.allow_skipped:
+                failures.append(f"{name}: cek tidak bisa dijalankan ({reason})")
+        if failures:
+            print("\n[FAIL] " + "\n[FAIL] ".join(failures))
+            return 1
+        print("\n[OK] Semua cek lolos")
+        return 0
+
+    if args.command == "run":
+        report = run_benchmarks(maps, args.model, args.iterations)
+        print_results(report)
+        save_report(report, args.output)
+        return 0
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    if args.current:
+        with open(args.current, encoding="utf-8") as f:
+            current = json.load(f)
+    else:
+        current = run_benchmarks(maps or baseline["meta"].get("maps", []), args.model, args.iterations)
+        save_report(current, args.output)
+
+    regressions = compare_reports(baseline, current, args.threshold, args.metric)
+    if regressions:
+        print(f"\n[FAIL] {len(regressions)} operasi lebih lambat > {args.threshold * 100:.0f}% ({args.metric})")
+        return 1
+    print(f"\n[OK] Tidak ada regresi > {args.threshold * 100:.0f}% ({args.metric})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -17,8 +17,10 @@ class Button:
         self.bg_color = bg_color
         self.is_hovered = False
 
-        # Render teks
-        self.text_surface = self.font.render(self.text_input, True, self.base_color)
+        # Render teks untuk kedua state sekali saja
+        self.base_surface = self.font.render(self.text_input, True, self.base_color)
+        self.hover_surface = self.font.render(self.text_input, True, self.hover_color)
+        self.text_surface = self.base_surface
         self.rect = self.text_surface.get_rect(center=pos)
 
         # Background tombol (lebih besar sedikit)
@@ -40,10 +42,17 @@ class Button:
         screen.blit(self.text_surface, self.rect)
 
     def change_color(self, mouse_pos):
-        """Ubah warna teks dan status hover berdasarkan posisi mouse"""
-        self.is_hovered = self.bg_rect.collidepoint(mouse_pos)
-        color = self.hover_color if self.is_hovered else self.base_color
-        self.text_surface = self.font.render(self.text_input, True, color)
+        """Ubah warna teks dan status hover berdasarkan posisi mouse. True kalau status berubah."""
+        hovered = bool(self.bg_rect.collidepoint(mouse_pos))
+        changed = hovered != self.is_hovered
+        self.is_hovered = hovered
+        self.text_surface = self.hover_surface if hovered else self.base_surface
+        return changed
+
+    def move_to(self, pos):
+        """Pindahkan tombol (mis. saat menu di-scroll) tanpa render ulang teks"""
+        self.rect.center = pos
+        self.bg_rect.center = pos
 
     def check_click(self, mouse_pos):
         """True jika tombol diklik"""
@@ -1,80 +1,161 @@
 # camera_debug.py
-import cv2
-import mediapipe as mp
 import numpy as np
 import time
-from tensorflow.keras.models import load_model
 import pygame
 import math
-from keras.initializers import Orthogonal
-from keras.utils import custom_object_scope
+from capture_thread import FrameGrabber
+from capture_sources import create_capture_source
+from inference_worker import InferenceWorker
+from hand_features import HAND_CONNECTIONS, FeatureEngine, MotionGate
+from tracing import tracer
+from assets import assets
 
 # This code is used for capturing video from the camera and processing hand gestures using a pre-trained model.
 # It uses OpenCV for video capture and Mediapipe for hand detection and landmark extraction.
-# It also uses TensorFlow for loading the pre-trained model and making predictions.
+# The pre-trained model runs on the NumPy backend (numpy_inference.py) by default; TensorFlow
+# is only imported when INFERENCE_BACKEND = "keras". OpenCV and Mediapipe are imported lazily
+# through cv2_module() / mediapipe_module().
 # The camera feed is displayed in a Pygame window, and the detected hand landmarks are drawn on the video frame.
 
 # ==============================================================================
 # Constants
 # ==============================================================================
-HAND_CONNECTIONS = [
-    (0, 1), (1, 2), (2, 3), (3, 4),         # Thumb
-    (0, 5), (5, 6), (6, 7), (7, 8),         # Index finger
-    (9, 10), (10, 11), (11, 12),            # Middle finger
-    (13, 14), (14, 15), (15, 16),           # Ring finger
-    (17, 18), (18, 19), (19, 20),           # Pinky finger
-    (0, 9), (0, 13), (0, 17),               # Palm connections from wrist
-    (5, 9), (9, 13), (13, 17)               # Palm connections across fingers
-]
-
-# Helper function to calculate angles
-def calculate_angle(v1, v2):
-    """Calculates the angle in radians between two vectors."""
-    if np.linalg.norm(v1) == 0 or np.linalg.norm(v2) == 0:
-        return 0.0
-    v1_u = v1 / np.linalg.norm(v1)
-    v2_u = v2 / np.linalg.norm(v2)
-    dot_product = np.clip(np.dot(v1_u, v2_u), -1.0, 1.0)
-    return np.arccos(dot_product)
+MODEL_PATH = "model/GRU/311025_GRU_3.keras"
+PREVIEW_SIZE = (200, 160)   # ukuran thumbnail kamera di HUD (w, h)
+
+# ==============================================================================
+# Import berat (OpenCV, MediaPipe) ditunda sampai pertama dipakai, supaya
+# `import camera` (dan modul yang mengimpornya) tetap murah saat game start.
+# ==============================================================================
+def cv2_module():
+    import cv2
+    return cv2
+
+def mediapipe_module():
+    import mediapipe
+    return mediapipe
+
+def create_hands_detector():
+    mp = mediapipe_module()
+    return mp.solutions.hands.Hands(
+        static_image_mode=False,
+        max_num_hands=1,
+        min_detection_confidence=0.1
+    )
+
+def load_gesture_model(model_path=MODEL_PATH, backend="numpy"):
+    """
+    Load model gesture, return None kalau gagal (gesture recognition dinonaktifkan).
+    backend "numpy": NumpyGestureModel tanpa TensorFlow; kalau gagal, fallback ke Keras.
+    """
+    if backend == "numpy":
+        try:
+            from numpy_inference import NumpyGestureModel
+            model = NumpyGestureModel(model_path)
+            print("[DEBUG] Model berhasil diload (NumPy backend)")
+            return model
+        except Exception as e:
+            print(f"Error loading model dengan NumPy backend: {e}. Mencoba Keras...")
+
+    try:
+        from tensorflow.keras.models import load_model
+        from keras.initializers import Orthogonal
+        from keras.utils import custom_object_scope
+
+        with custom_object_scope({'Orthogonal': Orthogonal}):
+            model = load_model(model_path, compile=False, safe_mode=False)
+        print("[DEBUG] Model berhasil diload")
+        return model
+    except Exception as e:
+        print(f"Error loading Keras model: {e}. Gesture recognition akan dinonaktifkan.")
+        return None
+
+def run_gesture_model(model, features, streaming=False):
+    """
+    Prediksi satu frame. streaming=True memakai predict_step() (hidden state dibawa
+    antar frame) kalau backend mendukung; selain itu satu timestep tanpa memori.
+    """
+    if streaming and hasattr(model, "predict_step"):
+        return model.predict_step(features)
+    return model.predict(np.reshape(features, (1, 1, -1)), verbose=0)
+
+class FrameResult:
+    """
+    Hasil pemrosesan satu frame kamera: frame, landmark, fitur dan prediksi.
+    Dibuat sekali oleh process() lalu dibaca ulang oleh UI untuk preview.
+    """
+    def __init__(self, frame_id, timestamp, frame):
+        self.frame_id = frame_id
+        self.timestamp = timestamp
+        self.frame = frame                  # BGR, belum di-flip
+        self.hand_landmarks = None          # objek landmark MediaPipe
+        self.landmarks = None               # np.ndarray (21, 3)
+        self.features = None                # np.ndarray (76,)
+        self.prediction = None              # output softmax model
+        self.predicted_label = None
+        self.confidence = 0.0
+        self.prediction_time_ms = 0.0
+        self.preview_surface = None         # cache surface preview untuk frame ini
+        self.gated = False                  # True = prediksi dipakai ulang oleh MotionGate
 
 class HandGestureCamera:
-    def __init__(self):
+    def __init__(self, use_worker_process=False, source_config=None, recorder=None, inference_backend="numpy",
+                 streaming_inference=False, progress=None, motion_gate_epsilon=None):
+        """
+        source_config: konfigurasi capture source (lihat capture_sources.create_capture_source),
+        default webcam. Source non-realtime dibaca sinkron dan memakai timestamp-nya sendiri
+        sebagai jam untuk dwell time, sehingga sesi bisa diputar ulang secara deterministik.
+        recorder: LandmarkRecorder opsional untuk menyimpan landmark tiap frame.
+        inference_backend: "numpy" (tanpa TensorFlow) atau "keras".
+        streaming_inference: bawa hidden state GRU antar frame (reset saat tangan hilang).
+        progress: callback opsional progress(tahap, 0..1), dipakai StartupLoader untuk splash.
+        motion_gate_epsilon: pakai ulang prediksi saat landmark hampir diam (lihat MotionGate);
+        None = inferensi setiap frame. Tidak dipakai bersama streaming_inference.
+        """
         print("[DEBUG] Inisialisasi HandGestureCamera dimulai")
 
-        # --- Coba buka kamera dari index 0–2 ---
-        self.cap = None
-        for i in range(3):
-            cap_test = cv2.VideoCapture(i)
-            if cap_test.isOpened():
-                print(f"[DEBUG] Kamera berhasil dibuka di index {i}")
-                self.cap = cap_test
-                break
-            else:
-                print(f"[DEBUG] Kamera tidak tersedia di index {i}")
-
-        if self.cap is None:
-            print("Error: Tidak ada kamera yang bisa dibuka!")
-            self.is_camera_available = False
-            return
+        self.source = None
+        self.grabber = None
+        self.recorder = recorder
+        self.streaming_inference = streaming_inference
+        self.worker = None
+        self.hands = None
+        self.model = None
+        self._last_processed_frame_id = 0
+        self.feature_engine = FeatureEngine()
+        progress = progress or (lambda stage, fraction: None)
+
+        # --- Motion gate (hanya untuk prediksi per frame tanpa state) ---
+        if motion_gate_epsilon and streaming_inference:
+            print("[WARN] Motion gate dinonaktifkan: tidak kompatibel dengan streaming inference.")
+            motion_gate_epsilon = None
+        self.motion_gate = None             # dibuat di bawah untuk mode in-process
+        self._worker_gate_hits = 0          # mode worker: gate berjalan di proses worker
+        self._worker_gate_misses = 0
+
+        # Disimpan untuk fallback in-process kalau worker mati di tengah permainan
+        self._source_config = source_config
+        self._inference_backend = inference_backend
+        self._motion_gate_epsilon = motion_gate_epsilon
+        self._last_worker_frame = None      # frame video terakhir yang berhasil disalin dari worker
+
+        if use_worker_process:
+            progress("Menjalankan worker gesture", 0.1)
+            # --- Capture, MediaPipe dan model berjalan di proses terpisah ---
+            self.worker = InferenceWorker(MODEL_PATH, source_config, inference_backend, streaming_inference,
+                                          motion_gate_epsilon=motion_gate_epsilon)
+            self.is_camera_available = self.worker.start()
+            if not self.is_camera_available:
+                self.worker = None
+                return
         else:
-            self.is_camera_available = True
-
-        # --- Inisialisasi MediaPipe ---
-        self.hands = mp.solutions.hands.Hands(
-            static_image_mode=False,
-            max_num_hands=1,
-            min_detection_confidence=0.1
-        )
+            self.is_camera_available = self._start_in_process(source_config, inference_backend,
+                                                              motion_gate_epsilon, progress)
+            if not self.is_camera_available:
+                return
 
-        # --- Load model Keras ---
-        self.model = None
-        try:
-            with custom_object_scope({'Orthogonal': Orthogonal}):
-                self.model = load_model("model/GRU/311025_GRU_3.keras", compile=False, safe_mode=False)
-            print("[DEBUG] Model berhasil diload")
-        except Exception as e:
-            print(f"Error loading Keras model: {e}. Gesture recognition akan dinonaktifkan.")
-            self.model = None
+        # Jam simulasi untuk source non-realtime (timestamp frame terakhir)
+        self._source_time = 0.0
 
         # --- Gesture mapping ---
         self.gesture_dict = {
@@ -88,8 +169,15 @@ class HandGestureCamera:
         self.confidence_list = []
         self.log_writer = None
 
-        # --- Drawing util ---
-        self.mp_draw = mp.solutions.drawing_utils
+        # --- Buffer preview (dipakai ulang setiap frame) ---
+        # _preview_rgb dibungkus langsung oleh _preview_surface (pygame.image.frombuffer),
+        # jadi menulis ke buffer sudah meng-update surface tanpa copy tambahan.
+        self._preview_small = np.empty((PREVIEW_SIZE[1], PREVIEW_SIZE[0], 3), dtype=np.uint8)
+        self._preview_flipped = np.empty_like(self._preview_small)
+        self._preview_rgb = np.empty_like(self._preview_small)
+        self._preview_surface = pygame.image.frombuffer(self._preview_rgb, PREVIEW_SIZE, "RGB")
+        self._preview_frame_id = None
+        self._placeholders = {}
 
         # --- Dwell Time ---
         self.DWELL_TIME_SECONDS = 2
@@ -99,6 +187,7 @@ class HandGestureCamera:
         self._action_to_consume = None
         self._is_in_cooldown = False
         self._cooldown_end_time = 0
+        self.confidence_threshold = None    # diatur Game dari manifest level
 
         # --- Debug Info ---
         self.processing_latency_ms = 0
@@ -108,6 +197,7 @@ class HandGestureCamera:
         
         # AKURASI
         self.current_frame = None
+        self.last_result = None             # FrameResult terakhir dari process()
         self.game_fps = 0.0
 
         self.total_predictions = 0
@@ -135,110 +225,278 @@ class HandGestureCamera:
         self.MAX_BUFFER = 10                # jumlah frame untuk rata-rata confidence
         self.MIN_STABLE_FRAMES = 5          # berapa frame sama berturut-turut untuk valid
 
+    def _start_in_process(self, source_config, inference_backend, motion_gate_epsilon, progress):
+        """Capture, MediaPipe dan model di proses game. Returns True kalau kamera tersedia."""
+        # --- Buka capture source (default: webcam index 0–2) ---
+        progress("Membuka kamera", 0.0)
+        try:
+            self.source = create_capture_source(source_config)
+        except Exception as e:
+            print(f"Error membuka capture source: {e}")
+            self.source = None
+
+        if self.source is None or not self.source.isOpened():
+            print("Error: Tidak ada kamera yang bisa dibuka!")
+            return False
+
+        # --- Capture thread: source realtime tidak dibaca di game thread ---
+        if self.source.realtime:
+            self.grabber = FrameGrabber(self.source, buffer_size=2)
+            self.grabber.start()
+
+        # --- Inisialisasi MediaPipe (tidak perlu kalau source sudah berisi landmark) ---
+        if not self.source.provides_landmarks:
+            progress("Inisialisasi MediaPipe", 0.35)
+            self.hands = create_hands_detector()
+
+        # --- Load model Keras ---
+        progress("Memuat model gesture", 0.7)
+        self.model = load_gesture_model(MODEL_PATH, inference_backend)
+        if self.streaming_inference and self.model is not None and not hasattr(self.model, "predict_step"):
+            print("[WARN] Backend model tidak mendukung streaming, kembali ke prediksi per frame.")
+        if motion_gate_epsilon:
+            self.motion_gate = MotionGate(motion_gate_epsilon)
+        return True
+
+    def _fallback_from_worker(self):
+        """
+        Worker mati di tengah permainan: bebaskan resource-nya lalu jalankan pipeline
+        di proses game. Kalau itu juga gagal, pengenalan gesture dinonaktifkan.
+        """
+        self.worker.stop()
+        self.worker = None
+        self._last_worker_frame = None
+        print("[WARN] Beralih ke inferensi in-process")
+        self.is_camera_available = self._start_in_process(self._source_config, self._inference_backend,
+                                                          self._motion_gate_epsilon, lambda stage, fraction: None)
+        if not self.is_camera_available:
+            print("[WARN] Fallback in-process gagal, pengenalan gesture dinonaktifkan")
+
     def get_game_fps(self):
         return self.game_fps
+
+    def now(self):
+        """Jam untuk dwell/cooldown: jam dinding, atau timestamp source kalau non-realtime."""
+        if self.source is not None and not self.source.realtime:
+            return self._source_time
+        return time.time()
     
     # ==================================================================
     # Frame Handling
     # ==================================================================
     def update_frame(self):
         """Ambil frame baru dari kamera (sekali per loop)."""
-        if not self.is_camera_available:
+        if not self.is_camera_available or self.grabber is None:
             return False
-        ret, frame = self.cap.read()
-        if ret:
-            self.current_frame = frame
+        latest = self.grabber.read_latest()
+        if latest is not None and latest[2].frame is not None:
+            self.current_frame = latest[2].frame
             return True
         return False
     
     def engineer_features(self, landmarks_np):
         """
         Downgraded feature engineering to produce 76 features to match the old model.
+        Hasilnya view ke buffer FeatureEngine, valid sampai frame berikutnya.
         """
-        wrist_landmark = landmarks_np[0]
-        relative_landmarks = landmarks_np - wrist_landmark
+        return self.feature_engine.extract(landmarks_np)
 
-        max_distance = np.max(np.linalg.norm(relative_landmarks, axis=1))
-        normalized_landmarks = relative_landmarks / max_distance if max_distance > 0 else relative_landmarks
+    def analyze_frame(self, frame_id, timestamp, frame, classify=True, landmarks=None):
+        """
+        Satu kali pass per frame: MediaPipe -> fitur -> prediksi.
+        Hasilnya dipakai bersama oleh logika dwell dan preview kamera.
+        Kalau `landmarks` sudah diberikan (source landmark), MediaPipe dilewati.
+        """
+        result = FrameResult(frame_id, timestamp, frame)
 
-        bone_vectors = { (start, end): normalized_landmarks[end] - normalized_landmarks[start] for start, end in HAND_CONNECTIONS }
-        
-        angles = []
-        flexion_bones = [((0,1),(1,2)), ((1,2),(2,3)), ((0,5),(5,6)), ((5,6),(6,7)), ((0,9),(9,10)), ((9,10),(10,11)), ((0,13),(13,14)), ((13,14),(14,15)), ((0,17),(17,18)), ((17,18),(18,19))]
-        for bone1, bone2 in flexion_bones:
-            angles.append(calculate_angle(bone_vectors.get(bone1, np.zeros(3)), bone_vectors.get(bone2, np.zeros(3))))
-            
-        splay_bones = [((0,5),(0,9)), ((0,9),(0,13)), ((0,13),(0,17))]
-        for bone1, bone2 in splay_bones:
-            angles.append(calculate_angle(bone_vectors.get(bone1, np.zeros(3)), bone_vectors.get(bone2, np.zeros(3))))
+        if landmarks is not None:
+            result.landmarks = landmarks
+        elif frame is not None and self.hands is not None:
+            # Konversi ke RGB untuk diproses oleh model deteksi tangan
+            with tracer.span("detection"):
+                cv2 = cv2_module()
+                image_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+                detection = self.hands.process(image_rgb)
+            if detection is None or not detection.multi_hand_landmarks:
+                return result
+
+            result.hand_landmarks = detection.multi_hand_landmarks[0]
+            result.landmarks = np.array([[lm.x, lm.y, lm.z] for lm in result.hand_landmarks.landmark])
+        else:
+            return result
 
-        return np.concatenate([normalized_landmarks.flatten(), np.array(angles).flatten()])
+        if not classify or self.model is None:
+            return result
+
+        try:
+            with tracer.span("features"):
+                result.features = self.engineer_features(result.landmarks)
+
+            # Pose hampir sama dengan frame terakhir yang diklasifikasi -> pakai prediksi itu
+            cached = self.motion_gate.lookup(result.features, self.gate_label()) if self.motion_gate else None
+            if cached is not None:
+                result.prediction = cached
+                result.gated = True
+            else:
+                # Prediksi gesture menggunakan model
+                t_pred = time.perf_counter()
+                result.prediction = run_gesture_model(self.model, result.features, self.streaming_inference)
+                result.prediction_time_ms = (time.perf_counter() - t_pred) * 1000
+                tracer.record("inference", result.prediction_time_ms)
+                if self.motion_gate:
+                    self.motion_gate.store(result.features, result.prediction, int(np.argmax(result.prediction)))
+
+            # Ambil nilai confidence tertinggi dan label prediksi
+            result.confidence = float(np.max(result.prediction))
+            result.predicted_label = int(np.argmax(result.prediction))
+        except Exception as e:
+            # Jika prediksi gagal → hasil tanpa prediksi
+            print(f"Error during gesture prediction: {e}")
+            result.prediction = None
+            result.predicted_label = None
+            result.confidence = 0.0
+
+        return result
+
+    def _result_from_worker(self):
+        """Bangun FrameResult dari record terbaru yang dikirim inference worker."""
+        self.worker.set_gate_label(self.gate_label())
+        polled = self.worker.poll_latest()
+        if polled is None:
+            if not self.worker.alive:
+                self._fallback_from_worker()
+            return None
+        record, frame = polled
+        if frame is not None:
+            self._last_worker_frame = frame
+        elif record["slot"] is not None:
+            # Slot sudah ditimpa worker: tetap tampilkan frame terakhir yang berhasil disalin
+            frame = self._last_worker_frame
+        result = FrameResult(record["frame_id"], record["capture_ts"], frame)
+        result.landmarks = record["landmarks"]
+        result.predicted_label = record["label"]
+        result.confidence = record["confidence"]
+        result.prediction_time_ms = record["prediction_time_ms"]
+        result.gated = record.get("gated", False)
+        if result.predicted_label is not None:
+            if result.gated:
+                self._worker_gate_hits += 1
+            else:
+                self._worker_gate_misses += 1
+        # Latency tahap di worker dicatat dari record (diukur di proses worker)
+        for stage in ("detection", "features"):
+            duration = record.get(f"{stage}_ms")
+            if duration is not None:
+                tracer.record(stage, duration)
+        if result.predicted_label is not None and not result.gated:
+            tracer.record("inference", result.prediction_time_ms)
+        tracer.record("capture", (time.time() - record["capture_ts"]) * 1000)
+        return result
+
+    def gate_label(self):
+        """
+        Label yang boleh dipakai ulang motion gate, atau None.
+        Gate hanya aktif di dalam dwell yang stabil: buffer prediksi penuh dengan satu
+        label, dan label itu sama dengan gesture yang terakhir dikonfirmasi.
+        """
+        label = self._last_confirmed_label
+        if label is None or self._potential_label != label or len(self.prediction_buffer) < self.MAX_BUFFER:
+            return None
+        if any(prediction != label for prediction in self.prediction_buffer):
+            return None
+        return label
+
+    def motion_gate_stats(self):
+        """(hit, miss) motion gate: hit = inferensi dilewati, miss = model dijalankan."""
+        if self.motion_gate:
+            return self.motion_gate.hits, self.motion_gate.misses
+        return self._worker_gate_hits, self._worker_gate_misses
+
+    def _check_cooldown(self):
+        """True selama masih dalam POST_ACTION_COOLDOWN."""
+        if getattr(self, "_is_in_cooldown", False):
+            if self.now() < getattr(self, "_cooldown_end_time", 0):
+                return True
+            self._is_in_cooldown = False
+            # After cooldown finish, require release before new confirm
+            self._released = False
+        return False
 
     def process(self):
+        if not self.is_camera_available:
+            return
         start_time = time.perf_counter()
         try:
-            # --- CHECK COOLDOWN FIRST ---
-            if getattr(self, "_is_in_cooldown", False):
-                if time.time() < getattr(self, "_cooldown_end_time", 0):
-                    # masih di cooldown: jangan proses prediksi konfirmasi baru
-                    self.processing_latency_ms = (time.perf_counter() - start_time) * 1000
+            if self.worker is not None:
+                # Mode worker: hasil deteksi & prediksi sudah dihitung di proses lain
+                result = self._result_from_worker()
+                if result is None:
                     return
+                in_cooldown = self._check_cooldown()
+                if in_cooldown:
+                    # Prediksi selama cooldown diabaikan, frame tetap dipakai untuk preview
+                    result.predicted_label = None
+                    result.confidence = 0.0
+            else:
+                if self.grabber is not None:
+                    # Ambil frame terbaru dari capture thread (tidak menunggu kamera)
+                    latest = self.grabber.read_latest()
+                    if latest is not None and latest[0] != self._last_processed_frame_id:
+                        # Tahap capture = umur frame saat diambil game thread
+                        tracer.record("capture", (time.time() - latest[1]) * 1000)
                 else:
-                    self._is_in_cooldown = False
-                    # After cooldown finish, require release before new confirm
-                    self._released = False
+                    # Source non-realtime: baca satu frame secara sinkron
+                    with tracer.span("capture"):
+                        packet = self.source.grab()
+                    latest = None if packet is None else (self._last_processed_frame_id + 1, packet.timestamp, packet)
+                    if packet is not None:
+                        self._source_time = packet.timestamp
+                if latest is None:
+                    self.processing_latency_ms = (time.perf_counter() - start_time) * 1000
+                    return
+                frame_id, timestamp, packet = latest
+                if frame_id == self._last_processed_frame_id:
+                    # Belum ada frame baru sejak tick sebelumnya
+                    return
+                self._last_processed_frame_id = frame_id
 
-            # Ambil frame dari kamera
-            ret, frame = self.cap.read()
-            if not ret:
-                self.processing_latency_ms = (time.perf_counter() - start_time) * 1000
-                return
-            self.current_frame = frame.copy()
+                # masih di cooldown: deteksi tetap jalan untuk preview, tanpa prediksi
+                # (mode streaming tetap memberi frame ke model agar hidden state kontinu)
+                in_cooldown = self._check_cooldown()
+                result = self.analyze_frame(frame_id, timestamp, packet.frame,
+                                            classify=not in_cooldown or self.streaming_inference,
+                                            landmarks=packet.landmarks)
 
-            # Konversi ke RGB untuk diproses oleh model deteksi tangan
-            image_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            result = self.hands.process(image_rgb)
+            self.current_frame = result.frame
+            self.last_result = result
 
-            current_prediction = None
-            self.last_prediction_confidence = 0.0
-            self.last_predicted_label = None
-            self.last_prediction_time_ms = 0.0
+            if self.recorder is not None:
+                self.recorder.record(result.timestamp, result.frame_id, result.landmarks,
+                                     result.predicted_label, result.confidence)
 
-            # Tidak ada tangan terdeteksi
-            if result is None or not result.multi_hand_landmarks:
+            if result.landmarks is None:
                 self.landmark_status = "Not Detected"
-            
-            # Tangan terdeteksi → lakukan prediksi gesture
+                # Tangan hilang: konteks temporal model streaming dimulai ulang
+                if self.streaming_inference and hasattr(self.model, "reset_state"):
+                    self.model.reset_state()
+                if self.motion_gate:
+                    self.motion_gate.reset()
             else:
-                self.landmark_status = f"Detected ({len(result.multi_hand_landmarks[0].landmark)} landmarks)"
-                if self.model is not None:
-                    # Ekstrak fitur dari landmark tangan
-                    try:
-                        landmarks_raw_np = np.array([[lm.x, lm.y, lm.z] for lm in result.multi_hand_landmarks[0].landmark])
-                        features = self.engineer_features(landmarks_raw_np)
-                        model_input = np.reshape(features, (1, 1, -1))
-
-                        # Prediksi gesture menggunakan model
-                        t_pred = time.perf_counter()
-                        prediction = self.model.predict(model_input, verbose=0)
-                        prediction_time_ms = (time.perf_counter() - t_pred) * 1000
-                        self.last_prediction_time_ms = prediction_time_ms
-
-                        # Ambil nilai confidence tertinggi dan label prediksi
-                        self.last_prediction_confidence = float(np.max(prediction))
-                        current_prediction = int(np.argmax(prediction))
-                        self.last_predicted_label = current_prediction
-
-                        # Abaikan prediksi dengan confidence terlalu rendah (<0.1)
-                        if self.last_prediction_confidence < 0.1:
-                            return
-
-                    except Exception as e:
-                        # Jika prediksi gagal → reset variabel
-                        print(f"Error during gesture prediction: {e}")
-                        current_prediction = None
-                        self.last_prediction_confidence = 0.0
-                        self.last_predicted_label = None
+                self.landmark_status = f"Detected ({len(result.landmarks)} landmarks)"
+
+            if in_cooldown:
+                self.processing_latency_ms = (time.perf_counter() - start_time) * 1000
+                return
+
+            current_prediction = result.predicted_label
+            self.last_prediction_confidence = result.confidence
+            self.last_predicted_label = result.predicted_label
+            if not result.gated:
+                self.last_prediction_time_ms = result.prediction_time_ms
+
+            # Abaikan prediksi dengan confidence terlalu rendah (<0.1)
+            if current_prediction is not None and self.last_prediction_confidence < 0.1:
+                return
 
             # Jika tidak ada prediksi → reset potential gesture
             if current_prediction is None:
@@ -259,7 +517,7 @@ class HandGestureCamera:
                     # Cooldown selesai → reset dwell agar bisa trigger lagi
                     if self._potential_label_start_time == 0:
                         self._potential_label = current_prediction
-                        self._potential_label_start_time = time.time()
+                        self._potential_label_start_time = self.now()
             
             # --- BUFFER CONFIDENCE DAN PREDIKSI ---
             self.confidence_buffer.append(self.last_prediction_confidence)
@@ -289,18 +547,20 @@ class HandGestureCamera:
             if current_prediction != self._potential_label:
                 # new potential gesture (different from previous potential)
                 self._potential_label = current_prediction
-                self._potential_label_start_time = time.time()
+                self._potential_label_start_time = self.now()
             else:
-                time_held = time.time() - self._potential_label_start_time
+                time_held = self.now() - self._potential_label_start_time
                 if time_held >= self.DWELL_TIME_SECONDS:
                     # Confirm gesture once
                     # Determine dynamic mode: adaptive mode => true_label = current_prediction
                     true_label = current_prediction
 
-                    # threshold per level
+                    # threshold per level (dari manifest level; tabel lama sebagai fallback)
                     level_thresholds = {4:0.10, 5:0.30, 6:0.50, 7:0.70, 8:0.90}
                     current_level = getattr(self, "current_level", 6)
-                    current_threshold = level_thresholds.get(current_level, 0.1)
+                    current_threshold = self.confidence_threshold
+                    if current_threshold is None:
+                        current_threshold = level_thresholds.get(current_level, 0.1)
 
                     is_valid = (
                         self.last_prediction_confidence >= current_threshold and 
@@ -339,7 +599,7 @@ class HandGestureCamera:
                     self._last_confirmed_label = current_prediction
                     self._released = False
                     self._is_in_cooldown = True
-                    self._cooldown_end_time = time.time() + self.POST_ACTION_COOLDOWN
+                    self._cooldown_end_time = self.now() + self.POST_ACTION_COOLDOWN
 
                     # print summary for this confirmation
                     print("\n[GESTURE CONFIRMED]")
@@ -385,45 +645,64 @@ class HandGestureCamera:
         Used by the UI to draw the clock.
         """
         if self._potential_label is not None and self._potential_label_start_time > 0:
-            time_held = time.time() - self._potential_label_start_time
+            time_held = self.now() - self._potential_label_start_time
             progress = min(time_held / self.DWELL_TIME_SECONDS, 1.0)
             return progress
         return 0.0
 
     def get_frame(self):
         """Returns a Pygame surface of the current camera view for display."""
-        display_size = (200, 160)  # ukuran tampilan kamera 
+        return self.render_preview(self.last_result)
 
-        if not self.is_camera_available:
-            placeholder = pygame.Surface(display_size)
-            placeholder.fill((50, 50, 50))
-            font = pygame.font.Font(None, 32)
-            text = font.render("No Camera", True, (255, 255, 255))
-            text_rect = text.get_rect(center=(display_size[0]//2, display_size[1]//2))
-            placeholder.blit(text, text_rect)
-            return placeholder
-
-        ret, frame = self.cap.read()
-        if not ret:
-            placeholder = pygame.Surface(display_size)
-            placeholder.fill((50, 50, 50))
-            font = pygame.font.Font(None, 32)
-            text = font.render("Frame Error", True, (255, 255, 255))
-            text_rect = text.get_rect(center=(display_size[0]//2, display_size[1]//2))
-            placeholder.blit(text, text_rect)
-            return placeholder
-
-        frame = cv2.flip(frame, 1)
-        image_rgb_for_display = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        result_display = self.hands.process(image_rgb_for_display.copy())
-
-        if result_display.multi_hand_landmarks:
-            for hand_landmarks_display in result_display.multi_hand_landmarks:
-                self.mp_draw.draw_landmarks(frame, hand_landmarks_display, mp.solutions.hands.HAND_CONNECTIONS)
-
-        frame_resized = cv2.resize(frame, display_size)
-        frame_rgb_final = cv2.cvtColor(frame_resized, cv2.COLOR_BGR2RGB)
-        return pygame.surfarray.make_surface(frame_rgb_final.swapaxes(0, 1))
+    def render_preview(self, result):
+        """
+        Render preview 200x160 dari FrameResult yang sudah diproses.
+        Tidak membaca kamera dan tidak menjalankan MediaPipe lagi. Frame diperkecil dulu,
+        lalu flip + konversi warna ke buffer yang sama setiap frame; surface yang
+        dikembalikan selalu objek yang sama (di-update in place).
+        """
+        if not self.is_camera_available or result is None:
+            message = "No Camera" if not self.is_camera_available else "Frame Error"
+            return self._placeholder(message)
+
+        # Preview untuk frame yang sama cukup dirender sekali
+        if self._preview_frame_id == result.frame_id and result.preview_surface is not None:
+            return result.preview_surface
+
+        cv2 = cv2_module()
+        if result.frame is None:
+            # Source landmark tidak punya video: gambar landmark di kanvas gelap
+            self._preview_rgb.fill(50)
+        else:
+            cv2.resize(result.frame, PREVIEW_SIZE, dst=self._preview_small)
+            cv2.flip(self._preview_small, 1, dst=self._preview_flipped)
+            cv2.cvtColor(self._preview_flipped, cv2.COLOR_BGR2RGB, dst=self._preview_rgb)
+
+        if result.landmarks is not None:
+            # Landmark ternormalisasi [0, 1] -> koordinat thumbnail yang sudah di-mirror
+            w, h = PREVIEW_SIZE
+            points = [(int((1.0 - x) * w), int(y * h)) for x, y, _ in result.landmarks]
+            for start, end in HAND_CONNECTIONS:
+                cv2.line(self._preview_rgb, points[start], points[end], (255, 255, 255), 1, cv2.LINE_AA)
+            for point in points:
+                cv2.circle(self._preview_rgb, point, 2, (255, 0, 0), -1, cv2.LINE_AA)
+
+        self._preview_frame_id = result.frame_id
+        result.preview_surface = self._preview_surface
+        return result.preview_surface
+
+    def _placeholder(self, message):
+        """Surface abu-abu dengan pesan (dibuat sekali per pesan)."""
+        surface = self._placeholders.get(message)
+        if surface is None:
+            surface = pygame.Surface(PREVIEW_SIZE)
+            surface.fill((50, 50, 50))
+            font = assets.font(None, 32)
+            text = font.render(message, True, (255, 255, 255))
+            text_rect = text.get_rect(center=(PREVIEW_SIZE[0]//2, PREVIEW_SIZE[1]//2))
+            surface.blit(text, text_rect)
+            self._placeholders[message] = surface
+        return surface
 
     def evaluate_level(self):
         """Hitung rata-rata confidence dan tampilkan evaluasi."""
@@ -448,6 +727,13 @@ class HandGestureCamera:
         return self.last_evaluation
 
     def release(self):
-        if self.is_camera_available and self.cap.isOpened():
-            self.cap.release()
+        if self.recorder is not None:
+            self.recorder.close()
+        if self.worker is not None:
+            self.worker.stop()
+            self.worker = None
+        if self.grabber is not None:
+            self.grabber.stop()
+        if self.source is not None:
+            self.source.release()
         print("Camera released.")
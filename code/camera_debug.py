@@ -5,6 +5,8 @@ import csv
 from datetime import datetime
 import psutil
 import threading
+from tracing import tracer, STAGES
+from assets import assets
 
 class GameDebugger:
     def __init__(self, camera_instance):
@@ -36,6 +38,9 @@ class GameDebugger:
             "Timestamp", "FPS", "Processing_Latency_ms", "Landmark_Status",
             "Prediction_Confidence", "Predicted_Gesture_ID", "CPU_Usage_%", "Memory_Usage_MB"
         ]
+        # Rolling percentile latency per tahap (lihat tracing.py)
+        for stage in STAGES:
+            header += [f"{stage}_p50_ms", f"{stage}_p95_ms", f"{stage}_p99_ms"]
         self.log_writer.writerow(header)
         print(f"Debugger is logging to {log_filename}")
 
@@ -82,6 +87,12 @@ class GameDebugger:
                     f"{fps:.2f}", f"{latency:.2f}", landmark_status,
                     f"{confidence:.4f}", gesture_id, f"{cpu:.1f}", f"{memory:.1f}"
                 ]
+                for stage in STAGES:
+                    stats = tracer.percentiles(stage)
+                    if stats is None:
+                        log_row += ["", "", ""]
+                    else:
+                        log_row += [f"{stats['p50']:.2f}", f"{stats['p95']:.2f}", f"{stats['p99']:.2f}"]
                 self.log_writer.writerow(log_row)
                 
                 frame_count = 0
@@ -114,6 +125,13 @@ class GameDebugger:
         if self.log_file:
             self.log_file.close()
         print("\nDebugging thread stopped and log file closed.")
+        print("\n[DEBUG] Latency per tahap (rolling window):")
+        print(tracer.report())
+        print(f"[DEBUG] {assets.report()}")
+        hits, misses = self.camera.motion_gate_stats()
+        if hits + misses:
+            print(f"[DEBUG] Motion gate: {hits} inferensi dilewati, {misses} dijalankan "
+                  f"({hits / (hits + misses) * 100:.1f}% hit)")
 
         if hasattr(self, "confirmed_prediction_times") and self.confirmed_prediction_times:
             total_time = sum(self.confirmed_prediction_times)
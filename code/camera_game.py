@@ -15,8 +15,8 @@ class Camera:
         # offset world coordinates (kiri-atas kamera)
         self.offset = pygame.math.Vector2(0, 0)
 
-        # camera rect (optional, kalau perlu)
-        self.camera_rect = pygame.Rect(0, 0, width, height)
+        # viewport di world coords (dipakai untuk culling sprite)
+        self.camera_rect = pygame.Rect(0, 0, screen_width, screen_height)
 
     def apply(self, entity):
         """Return rect yang sudah disesuaikan dengan camera offset."""
@@ -49,5 +49,5 @@ class Camera:
         elif self.offset.y > max_y:
             self.offset.y = max_y
 
-        # sinkronkan camera_rect (opsional)
+        # sinkronkan viewport
         self.camera_rect.topleft = (int(self.offset.x), int(self.offset.y))
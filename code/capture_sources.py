@@ -0,0 +1,266 @@
+import abc
+import time
+
+import numpy as np
+
+# Sumber input untuk HandGestureCamera. Semua backend punya interface yang sama:
+#   grab()      -> SourceFrame atau None kalau belum/tidak ada frame
+#   isOpened()  -> bool
+#   release()
+#   realtime    -> True: dibaca lewat FrameGrabber dengan jam dinding,
+#                  False: dibaca sinkron dari process() dengan timestamp dari source
+# Backend non-realtime membuat seluruh pipeline (deteksi, prediksi, dwell)
+# deterministik dan bisa berjalan lebih cepat dari real time tanpa webcam.
+
+
+class SourceFrame:
+    """Satu frame dari capture source."""
+    def __init__(self, frame, landmarks, timestamp):
+        self.frame = frame            # BGR np.ndarray, atau None untuk source landmark
+        self.landmarks = landmarks    # np.ndarray (21, 3) kalau source sudah berisi landmark
+        self.timestamp = timestamp
+
+
+class CaptureSource(abc.ABC):
+    realtime = True
+    provides_landmarks = False
+
+    @abc.abstractmethod
+    def grab(self):
+        """SourceFrame berikutnya, atau None kalau belum/tidak ada frame."""
+
+    def isOpened(self):
+        return True
+
+    def release(self):
+        pass
+
+
+class _PacedSource(CaptureSource):
+    """Basis untuk source file/sintetis: timestamp dari nomor frame, opsional dipacu ke jam dinding."""
+    def __init__(self, fps, realtime=False, loop=False):
+        self.fps = float(fps)
+        self.realtime = realtime
+        self.loop = loop
+        self.frame_index = 0
+        self._start_wall = None
+
+    def _next_timestamp(self):
+        timestamp = self.frame_index / self.fps
+        if self.realtime:
+            if self._start_wall is None:
+                self._start_wall = time.time()
+            # Tunggu sampai frame ini "jatuh tempo" supaya kecepatan sama dengan rekaman
+            delay = self._start_wall + timestamp - time.time()
+            if delay > 0:
+                time.sleep(delay)
+            timestamp = self._start_wall + timestamp
+        self.frame_index += 1
+        return timestamp
+
+
+class WebcamSource(CaptureSource):
+    """Webcam fisik. index=None: coba index 0..max_index-1 seperti sebelumnya."""
+    def __init__(self, index=None, max_index=3):
+        import cv2
+
+        self.cap = None
+        indices = [index] if index is not None else range(max_index)
+        for i in indices:
+            cap_test = cv2.VideoCapture(i)
+            if cap_test.isOpened():
+                print(f"[DEBUG] Kamera berhasil dibuka di index {i}")
+                self.cap = cap_test
+                break
+            print(f"[DEBUG] Kamera tidak tersedia di index {i}")
+
+    def grab(self):
+        ret, frame = self.cap.read()
+        if not ret:
+            return None
+        return SourceFrame(frame, None, time.time())
+
+    def isOpened(self):
+        return self.cap is not None and self.cap.isOpened()
+
+    def release(self):
+        if self.cap is not None and self.cap.isOpened():
+            self.cap.release()
+
+
+class VideoFileSource(_PacedSource):
+    """Video rekaman sesi; landmark tetap dideteksi oleh MediaPipe."""
+    def __init__(self, path, fps=None, realtime=False, loop=False):
+        import cv2
+
+        self.path = path
+        self.cap = cv2.VideoCapture(path)
+        file_fps = self.cap.get(cv2.CAP_PROP_FPS) if self.cap.isOpened() else 0
+        super().__init__(fps or file_fps or 30.0, realtime, loop)
+
+    def grab(self):
+        ret, frame = self.cap.read()
+        if not ret and self.loop:
+            import cv2
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ret, frame = self.cap.read()
+        if not ret:
+            return None
+        return SourceFrame(frame, None, self._next_timestamp())
+
+    def isOpened(self):
+        return self.cap.isOpened()
+
+    def release(self):
+        if self.cap.isOpened():
+            self.cap.release()
+
+
+class LandmarkFileSource(_PacedSource):
+    """
+    Landmark yang sudah direkam, tanpa video dan tanpa MediaPipe.
+    Format: sesi .lmk dari LandmarkRecorder, .npy berisi (N, 21, 3), atau .npz
+    dengan key 'landmarks' (dan opsional 'timestamps').
+    Baris NaN (atau detected=0 di .lmk) berarti tangan tidak terdeteksi.
+    """
+    provides_landmarks = True
+
+    def __init__(self, path, fps=30.0, realtime=False, loop=False):
+        super().__init__(fps, realtime, loop)
+        self.path = path
+        self.timestamps = None
+        self.detected = None
+        if path.endswith(".lmk"):
+            from landmark_recorder import load_landmark_session
+            session = load_landmark_session(path)
+            self.landmarks = session["landmarks"]
+            self.detected = session["detected"]
+            # Timestamp relatif terhadap awal sesi
+            self.timestamps = session["timestamp"] - session["timestamp"][0] if len(session) else None
+        elif path.endswith(".npz"):
+            data = np.load(path)
+            self.landmarks = data["landmarks"]
+            if "timestamps" in data:
+                self.timestamps = data["timestamps"]
+        else:
+            self.landmarks = np.load(path, mmap_mode="r")
+        self.position = 0
+        self.loops = 0      # berapa kali rekaman sudah diulang (loop=True)
+        # Durasi satu putaran rekaman: timestamp terakhir + satu interval frame,
+        # supaya timestamp tetap naik saat rekaman diulang
+        self.duration = (float(self.timestamps[-1]) + 1.0 / self.fps
+                         if self.timestamps is not None and len(self.timestamps) else 0.0)
+
+    def grab(self):
+        if self.position >= len(self.landmarks):
+            if not self.loop:
+                return None
+            self.position = 0
+            self.loops += 1
+        landmarks = np.asarray(self.landmarks[self.position], dtype=np.float32)
+        timestamp = self._next_timestamp()
+        if self.timestamps is not None and not self.realtime:
+            timestamp = float(self.timestamps[self.position]) + self.loops * self.duration
+        detected = self.detected is None or self.detected[self.position]
+        self.position += 1
+        if not detected or np.isnan(landmarks).any():
+            landmarks = None
+        return SourceFrame(None, landmarks, timestamp)
+
+    def isOpened(self):
+        return len(self.landmarks) > 0
+
+
+# --- Pose sintetis -------------------------------------------------------------
+# Tekukan tiap jari (ibu jari, telunjuk, tengah, manis, kelingking); 0 = lurus, 1 = menggenggam
+SYNTHETIC_POSES = {
+    0: (0.0, 0.0, 0.0, 0.0, 0.0),    # Palm
+    1: (0.8, 1.0, 1.0, 1.0, 1.0),    # Fist
+    2: (0.0, 0.0, 1.0, 1.0, 1.0),    # Thumb Index
+    3: (0.5, 0.5, 0.5, 0.5, 0.5),    # Grabbing
+}
+_FINGER_BASES = (1, 5, 9, 13, 17)
+_FINGER_ANGLES = (-0.9, -0.3, 0.0, 0.25, 0.5)   # radian dari sumbu vertikal
+_SEGMENT_LENGTHS = (0.07, 0.05, 0.04, 0.035)
+
+
+def synthetic_hand(curls, center=(0.5, 0.75), scale=1.0):
+    """Bangun 21 landmark (x, y, z) ternormalisasi layar untuk pose dengan tekukan jari `curls`."""
+    landmarks = np.zeros((21, 3), dtype=np.float32)
+    wrist = np.array([center[0], center[1], 0.0])
+    landmarks[0] = wrist
+    for finger, (base, angle, curl) in enumerate(zip(_FINGER_BASES, _FINGER_ANGLES, curls)):
+        direction = angle
+        point = wrist.copy()
+        for joint, length in enumerate(_SEGMENT_LENGTHS):
+            if joint > 0:
+                # Setiap ruas berikutnya menekuk ke arah telapak
+                direction += curl * 1.2 * (1 if finger > 0 else -1)
+            step = np.array([np.sin(direction), -np.cos(direction), -0.02 * curl * joint]) * length * scale
+            if finger > 0 and joint == 0:
+                step *= 1.6    # metacarpal lebih panjang
+            point = point + step
+            landmarks[base + joint] = point
+    return landmarks
+
+
+class SyntheticSource(_PacedSource):
+    """
+    Generator landmark deterministik: memutar urutan gesture, masing-masing
+    ditahan `hold_seconds`, dengan jitter kecil dan jeda tanpa tangan di antaranya.
+    """
+    provides_landmarks = True
+
+    def __init__(self, gestures=(0, 1, 2, 3), hold_seconds=3.0, gap_seconds=0.5,
+                 fps=30.0, noise=0.002, seed=0, duration=None, realtime=False, loop=True):
+        super().__init__(fps, realtime, loop)
+        self.gestures = list(gestures)
+        self.hold_frames = int(hold_seconds * self.fps)
+        self.gap_frames = int(gap_seconds * self.fps)
+        self.noise = noise
+        self.rng = np.random.default_rng(seed)
+        self.max_frames = int(duration * self.fps) if duration is not None else None
+        self._poses = {label: synthetic_hand(SYNTHETIC_POSES[label]) for label in SYNTHETIC_POSES}
+
+    def expected_label(self, frame_index):
+        """Ground truth untuk frame ke-n (None selama jeda)."""
+        period = self.hold_frames + self.gap_frames
+        cycle, offset = divmod(frame_index, period)
+        if not self.loop and cycle >= len(self.gestures):
+            return None
+        if offset >= self.hold_frames:
+            return None
+        return self.gestures[cycle % len(self.gestures)]
+
+    def grab(self):
+        if self.max_frames is not None and self.frame_index >= self.max_frames:
+            return None
+        period = self.hold_frames + self.gap_frames
+        if not self.loop and self.frame_index >= period * len(self.gestures):
+            return None
+
+        label = self.expected_label(self.frame_index)
+        timestamp = self._next_timestamp()
+        if label is None:
+            return SourceFrame(None, None, timestamp)
+        landmarks = self._poses[label] + self.rng.normal(0.0, self.noise, (21, 3)).astype(np.float32)
+        return SourceFrame(None, landmarks, timestamp)
+
+
+def create_capture_source(config=None):
+    """
+    Buat capture source dari konfigurasi (lihat CAPTURE_SOURCE di settings.py).
+    Contoh: {"type": "webcam"}, {"type": "video", "path": "sesi.mp4"},
+            {"type": "landmarks", "path": "sesi.npy"}, {"type": "synthetic", "seed": 1}
+    """
+    config = dict(config or {"type": "webcam"})
+    source_type = config.pop("type", "webcam")
+    if source_type == "webcam":
+        return WebcamSource(**config)
+    if source_type == "video":
+        return VideoFileSource(**config)
+    if source_type == "landmarks":
+        return LandmarkFileSource(**config)
+    if source_type == "synthetic":
+        return SyntheticSource(**config)
+    raise ValueError(f"Unknown capture source type: {source_type}")
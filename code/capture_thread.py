@@ -0,0 +1,75 @@
+import threading
+import time
+from collections import deque
+
+
+class FrameGrabber:
+    """
+    Background thread yang terus membaca capture source dan menyimpan frame
+    terbaru di ring buffer kecil. Game thread tidak pernah menunggu kamera:
+    read_latest() langsung mengembalikan frame paling baru, frame lama dibuang.
+    """
+    def __init__(self, source, buffer_size=2, stale_after=0.5):
+        self.source = source                      # lihat capture_sources.py
+        self.buffer = deque(maxlen=buffer_size)   # isi: (frame_id, timestamp, SourceFrame)
+        self.stale_after = stale_after            # detik, frame lebih tua dianggap basi
+        self.lock = threading.Lock()
+        self.running = False
+        self.thread = None
+
+        # --- Statistik ---
+        self.frame_id = 0
+        self.frames_captured = 0
+        self.frames_dropped = 0
+        self.read_failures = 0
+        self._last_read_id = 0
+
+    def start(self):
+        """Mulai thread capture."""
+        if self.running:
+            return
+        self.running = True
+        self.thread = threading.Thread(target=self._capture_loop, name="FrameGrabber", daemon=True)
+        self.thread.start()
+        print("[DEBUG] FrameGrabber thread started")
+
+    def _capture_loop(self):
+        while self.running:
+            packet = self.source.grab()
+            if packet is None:
+                self.read_failures += 1
+                time.sleep(0.005)   # jangan spin kalau kamera sedang error
+                continue
+
+            timestamp = packet.timestamp
+            with self.lock:
+                # Frame terlama yang belum pernah dibaca game ikut terbuang
+                if len(self.buffer) == self.buffer.maxlen and self.buffer[0][0] > self._last_read_id:
+                    self.frames_dropped += 1
+                self.frame_id += 1
+                self.buffer.append((self.frame_id, timestamp, packet))
+                self.frames_captured += 1
+
+    def read_latest(self):
+        """
+        Returns (frame_id, timestamp, SourceFrame) untuk frame terbaru,
+        atau None kalau belum ada frame / frame terbaru sudah basi.
+        """
+        with self.lock:
+            if not self.buffer:
+                return None
+            latest = self.buffer[-1]
+            self._last_read_id = latest[0]
+
+        if self.stale_after is not None and time.time() - latest[1] > self.stale_after:
+            return None
+        return latest
+
+    def stop(self):
+        """Hentikan thread capture (tidak melepas source)."""
+        if not self.running:
+            return
+        self.running = False
+        if self.thread is not None:
+            self.thread.join(timeout=1.0)
+        print(f"[DEBUG] FrameGrabber stopped (captured={self.frames_captured}, dropped={self.frames_dropped})")
@@ -0,0 +1,52 @@
+import pygame
+
+from tracing import tracer
+
+# Urutan layer (kecil digambar dulu)
+LAYER_BACKGROUND = 0
+LAYER_WORLD = 10
+LAYER_HUD = 20
+LAYER_OVERLAY = 30
+
+
+class FrameCompositor:
+    """
+    Satu-satunya tempat yang menggambar ke layar dan memanggil display.update saat bermain.
+    Level, HUD, dan overlay hanya mendaftarkan draw pass lewat submit(); Game memanggil
+    present() sekali di akhir frame untuk menggambar semua pass (urut layer) lalu flip.
+    Pemakaian:
+        compositor.begin()
+        compositor.submit("world", level.draw_world, LAYER_WORLD)
+        compositor.present()
+    """
+    def __init__(self, surface):
+        self.surface = surface
+        self.passes = []            # (layer, urutan submit, nama, fn)
+        self.presented = False
+        self.frames = 0
+
+    def begin(self):
+        """Mulai frame baru (buang pass yang belum digambar)."""
+        self.passes.clear()
+        self.presented = False
+
+    def submit(self, name, fn, layer=LAYER_WORLD):
+        """Daftarkan fn(surface) untuk digambar di frame ini."""
+        self.passes.append((layer, len(self.passes), name, fn))
+
+    def render(self):
+        """Gambar semua pass yang terkumpul ke surface tanpa flip."""
+        passes = sorted(self.passes, key=lambda p: (p[0], p[1]))
+        self.passes.clear()
+        for _, _, _, fn in passes:
+            fn(self.surface)
+
+    def present(self):
+        """Gambar pass yang tersisa lalu flip layar, maksimal sekali per frame."""
+        if self.presented:
+            return
+        self.render()
+        with tracer.span("present"):
+            pygame.display.update()
+        self.presented = True
+        self.frames += 1
@@ -0,0 +1,141 @@
+import numpy as np
+
+# ==============================================================================
+# Feature engineering tervektorisasi (76 fitur per frame)
+# ==============================================================================
+# 63 fitur: 21 landmark relatif terhadap pergelangan, dinormalisasi jarak terjauh
+# 13 fitur: sudut antar tulang (10 fleksi + 3 splay), dalam radian
+# Dipakai bersama oleh inferensi live, pembuatan dataset dan re-scoring offline.
+
+HAND_CONNECTIONS = [
+    (0, 1), (1, 2), (2, 3), (3, 4),         # Thumb
+    (0, 5), (5, 6), (6, 7), (7, 8),         # Index finger
+    (9, 10), (10, 11), (11, 12),            # Middle finger
+    (13, 14), (14, 15), (15, 16),           # Ring finger
+    (17, 18), (18, 19), (19, 20),           # Pinky finger
+    (0, 9), (0, 13), (0, 17),               # Palm connections from wrist
+    (5, 9), (9, 13), (13, 17)               # Palm connections across fingers
+]
+
+FLEXION_BONES = [((0,1),(1,2)), ((1,2),(2,3)), ((0,5),(5,6)), ((5,6),(6,7)), ((0,9),(9,10)),
+                 ((9,10),(10,11)), ((0,13),(13,14)), ((13,14),(14,15)), ((0,17),(17,18)), ((17,18),(18,19))]
+SPLAY_BONES = [((0,5),(0,9)), ((0,9),(0,13)), ((0,13),(0,17))]
+
+NUM_LANDMARKS = 21
+NUM_FEATURES = NUM_LANDMARKS * 3 + len(FLEXION_BONES) + len(SPLAY_BONES)   # 76
+
+# Index array: sudut ke-k dihitung antara (P[B1]-P[A1]) dan (P[B2]-P[A2])
+_ANGLE_PAIRS = np.array([(b1[0], b1[1], b2[0], b2[1]) for b1, b2 in FLEXION_BONES + SPLAY_BONES], dtype=np.intp)
+_A1, _B1, _A2, _B2 = _ANGLE_PAIRS.T
+
+
+def engineer_features_batch(landmarks, out=None):
+    """
+    Hitung 76 fitur untuk batch landmark (N, 21, 3) sekaligus.
+    `out` opsional: buffer float32 (N, 76) yang diisi ulang tanpa alokasi baru.
+    """
+    landmarks = np.asarray(landmarks, dtype=np.float32)
+    if landmarks.ndim == 2:
+        landmarks = landmarks[None]
+    n = landmarks.shape[0]
+    if out is None:
+        out = np.empty((n, NUM_FEATURES), dtype=np.float32)
+
+    # --- Landmark relatif & normalisasi ---
+    relative = landmarks - landmarks[:, :1, :]
+    max_distance = np.sqrt(np.einsum("nij,nij->ni", relative, relative)).max(axis=1)
+    scale = np.where(max_distance > 0, max_distance, 1.0)
+    normalized = out[:, :NUM_LANDMARKS * 3].reshape(n, NUM_LANDMARKS, 3)
+    np.divide(relative, scale[:, None, None], out=normalized)
+
+    # --- Sudut antar tulang ---
+    v1 = normalized[:, _B1] - normalized[:, _A1]
+    v2 = normalized[:, _B2] - normalized[:, _A2]
+    norm1 = np.sqrt(np.einsum("nkj,nkj->nk", v1, v1))
+    norm2 = np.sqrt(np.einsum("nkj,nkj->nk", v2, v2))
+    valid = (norm1 > 0) & (norm2 > 0)
+    denom = np.where(valid, norm1 * norm2, 1.0)
+    cosine = np.clip(np.einsum("nkj,nkj->nk", v1, v2) / denom, -1.0, 1.0)
+    out[:, NUM_LANDMARKS * 3:] = np.where(valid, np.arccos(cosine), 0.0)
+    return out
+
+
+class FeatureEngine:
+    """
+    Pembungkus engineer_features_batch dengan buffer float32 yang dipakai ulang.
+    Hasil extract()/extract_batch() adalah view ke buffer internal: valid sampai
+    panggilan berikutnya, copy() kalau perlu disimpan.
+    """
+    def __init__(self, capacity=1):
+        self._buffer = np.empty((capacity, NUM_FEATURES), dtype=np.float32)
+
+    def extract_batch(self, landmarks):
+        n = len(landmarks)
+        if n > len(self._buffer):
+            self._buffer = np.empty((n, NUM_FEATURES), dtype=np.float32)
+        return engineer_features_batch(landmarks, out=self._buffer[:n])
+
+    def extract(self, landmarks_np):
+        """Satu frame (21, 3) -> (76,)."""
+        return self.extract_batch(np.asarray(landmarks_np)[None])[0]
+
+
+def engineer_features(landmarks_np):
+    """Satu frame (21, 3) -> array fitur (76,) baru."""
+    return engineer_features_batch(landmarks_np)[0]
+
+
+class MotionGate:
+    """
+    Lewati inferensi saat tangan diam di gesture yang sudah dikonfirmasi.
+    lookup(features, label) membandingkan 63 landmark ternormalisasi dengan frame terakhir
+    yang benar-benar diklasifikasi; kalau pergeseran RMS landmark < epsilon (dalam
+    satuan ukuran tangan), prediksi yang di-cache dipakai ulang (hit). Referensi baru
+    hanya disimpan lewat store() setelah inferensi, jadi drift pelan tetap terdeteksi.
+    Gate hanya aktif kalau pemanggil memberi `label` (dwell stabil pada gesture yang
+    terakhir dikonfirmasi, lihat HandGestureCamera.gate_label) dan label cache sama.
+    Paling banyak max_skip frame berturut-turut dilewati, jadi model tetap jalan di
+    sebagian frame dan kedipan label masih bisa me-reset dwell seperti tanpa gate.
+    Hanya untuk prediksi per frame tanpa state (bukan streaming inference).
+    """
+    def __init__(self, epsilon=0.05, max_skip=1):
+        self.epsilon = epsilon
+        self.max_skip = max_skip
+        self.reference = np.empty((NUM_LANDMARKS, 3), dtype=np.float32)
+        self.prediction = None
+        self.label = None
+        self.streak = 0             # hit berturut-turut sejak inferensi terakhir
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, features, label):
+        """
+        Prediksi yang di-cache kalau pose hampir sama dan label cache == `label`, selain itu None.
+        `label` adalah label dwell stabil yang boleh dipakai ulang (None = gate tidak aktif).
+        """
+        if (label is not None and self.prediction is not None and self.label == label
+                and self.streak < self.max_skip):
+            normalized = features[:NUM_LANDMARKS * 3].reshape(NUM_LANDMARKS, 3)
+            delta = normalized - self.reference
+            if np.einsum("ij,ij->", delta, delta) < self.epsilon * self.epsilon * NUM_LANDMARKS:
+                self.streak += 1
+                self.hits += 1
+                return self.prediction
+        self.misses += 1
+        return None
+
+    def store(self, features, prediction, label):
+        """Simpan frame yang baru diklasifikasi sebagai referensi (features di-copy)."""
+        self.reference[:] = features[:NUM_LANDMARKS * 3].reshape(NUM_LANDMARKS, 3)
+        self.prediction = prediction
+        self.label = label
+        self.streak = 0
+
+    def reset(self):
+        """Tangan hilang / model berganti: frame berikutnya selalu diklasifikasi."""
+        self.prediction = None
+        self.streak = 0
+
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
@@ -0,0 +1,130 @@
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+# Laporan waktu import (python -X importtime) untuk entry point game.
+# Setiap modul di-import di proses Python baru (cold start), dari folder code/.
+# Jalankan dari root repo:
+#     python code/import_report.py                       -> laporan + 15 import terberat
+#     python code/import_report.py --check               -> exit 1 kalau melewati budget
+#     python code/import_report.py --check --budget-ms 600 main
+# --check juga gagal kalau modul berat (cv2, mediapipe, tensorflow, keras) ikut ter-import:
+# modul itu harus ditunda sampai dipakai (lihat camera.cv2_module / mediapipe_module).
+# Cek yang sama dijalankan oleh `python code/benchmark.py check` (check_imports).
+
+CODE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_MODULES = ["main", "ui", "level.level"]
+DEFAULT_BUDGET_MS = 1000.0
+HEAVY_MODULES = ("cv2", "mediapipe", "tensorflow", "keras")
+
+
+def measure_import(module, python=sys.executable):
+    """
+    Import `module` di proses baru dengan -X importtime.
+    Return dict: total_ms (kumulatif modul itu), imports [(nama, self_ms, cumulative_ms)], error.
+    """
+    env = dict(os.environ)
+    env.setdefault("SDL_VIDEODRIVER", "dummy")
+    env.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+    proc = subprocess.run([python, "-X", "importtime", "-c", f"import {module}"],
+                          cwd=CODE_DIR, env=env, capture_output=True, text=True)
+
+    imports = []
+    errors = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:"):
+            errors.append(line)
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue    # baris header "self [us] | cumulative | imported package"
+        name = parts[2].strip()
+        imports.append((name, int(parts[0]) / 1000, int(parts[1]) / 1000))
+
+    total_ms = next((cumulative for name, _, cumulative in reversed(imports) if name == module), None)
+    return {
+        "module": module,
+        "total_ms": total_ms if total_ms is not None else 0.0,
+        "imports": imports,
+        "error": "\n".join(errors[-5:]) if proc.returncode != 0 else None,
+    }
+
+
+def heavy_imports(result):
+    """Modul berat (top-level package) yang ikut ter-import."""
+    found = {name.split(".")[0] for name, _, _ in result["imports"]}
+    return [name for name in HEAVY_MODULES if name in found]
+
+
+def missing_dependency(result):
+    """Nama modul yang tidak terpasang kalau import gagal karena ModuleNotFoundError, selain itu None."""
+    match = re.search(r"No module named '([^']+)'", result["error"] or "")
+    return match.group(1) if match else None
+
+
+def check_imports(modules=DEFAULT_MODULES, budget_ms=DEFAULT_BUDGET_MS, top=15):
+    """
+    Ukur import tiap modul di proses baru. Return (failures, skipped):
+    failures = pesan budget terlampaui / modul berat ter-import / import gagal;
+    skipped = {modul: alasan} kalau dependency non-berat (mis. psutil) tidak terpasang.
+    Modul berat yang tidak terpasang tetap dihitung gagal: berarti ia di-import saat start.
+    """
+    failures = []
+    skipped = {}
+    for module in modules:
+        result = measure_import(module)
+        print_report(result, top)
+        if result["error"]:
+            missing = missing_dependency(result)
+            if missing and missing.split(".")[0] not in HEAVY_MODULES:
+                skipped[module] = f"dependency {missing} tidak terpasang"
+            else:
+                failures.append(f"{module}: import gagal")
+            continue
+        if result["total_ms"] > budget_ms:
+            failures.append(f"{module}: {result['total_ms']:.0f} ms > budget {budget_ms:.0f} ms")
+        heavy = heavy_imports(result)
+        if heavy:
+            failures.append(f"{module}: meng-import {', '.join(heavy)} saat start")
+    return failures, skipped
+
+
+def print_report(result, top):
+    print(f"\n=== import {result['module']}: {result['total_ms']:.1f} ms ===")
+    if result["error"]:
+        print(f"[ERROR] Import gagal:\n{result['error']}")
+        return
+    heaviest = sorted(result["imports"], key=lambda item: item[1], reverse=True)[:top]
+    print(f"{'self ms':>9} {'cumul ms':>9}  modul")
+    for name, self_ms, cumulative_ms in heaviest:
+        print(f"{self_ms:>9.1f} {cumulative_ms:>9.1f}  {name}")
+    heavy = heavy_imports(result)
+    if heavy:
+        print(f"[WARN] Modul berat ikut ter-import: {', '.join(heavy)}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Laporan waktu import entry point game (-X importtime).")
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES)
+    parser.add_argument("--top", type=int, default=15, help="jumlah import terberat yang ditampilkan")
+    parser.add_argument("--check", action="store_true", help="exit 1 kalau budget terlampaui")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    args = parser.parse_args(argv)
+
+    failures, skipped = check_imports(args.modules, args.budget_ms, args.top)
+    for module, reason in skipped.items():
+        print(f"[WARN] {module} dilewati: {reason}")
+
+    if not args.check:
+        return 0
+    if failures:
+        print("\n[FAIL] " + "\n[FAIL] ".join(failures))
+        return 1
+    print(f"\n[OK] Semua modul di bawah budget {args.budget_ms:.0f} ms tanpa import berat")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,278 @@
+import multiprocessing as mp_proc
+import queue
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+# Ukuran maksimum frame yang bisa dikirim lewat shared memory (tinggi, lebar, channel)
+MAX_FRAME_SHAPE = (720, 1280, 3)
+# Jumlah slot frame; worker menulis bergiliran supaya slot yang sedang dibaca game tidak ditimpa
+FRAME_SLOTS = 3
+# Di depan slot frame ada cap frame_id per slot (int64): 0 = sedang ditulis.
+# Game hanya memakai frame kalau capnya sama dengan frame_id record, jadi record
+# yang slotnya sudah ditimpa frame lain tidak pernah dipasangkan dengan frame yang salah.
+STAMP_BYTES = 8 * FRAME_SLOTS
+# Antrian hasil latest-wins: kalau penuh, record tertua dibuang. Harus < FRAME_SLOTS
+# supaya record di antrian masih menunjuk slot yang belum ditimpa.
+RESULT_QUEUE_SIZE = 2
+
+
+def _frame_buffers(shm):
+    """(stamps (FRAME_SLOTS,), slots (FRAME_SLOTS, H, W, 3)) di atas satu shared memory."""
+    stamps = np.ndarray((FRAME_SLOTS,), dtype=np.int64, buffer=shm.buf)
+    slots = np.ndarray((FRAME_SLOTS,) + MAX_FRAME_SHAPE, dtype=np.uint8, buffer=shm.buf, offset=STAMP_BYTES)
+    return stamps, slots
+
+
+def _put_latest(result_queue, record):
+    """put_nowait; kalau antrian penuh, buang record tertua dulu (yang terbaru selalu masuk)."""
+    for _ in range(3):
+        try:
+            result_queue.put_nowait(record)
+            return
+        except queue.Full:
+            try:
+                result_queue.get_nowait()
+            except queue.Empty:
+                pass    # game baru saja mengosongkan antrian
+
+
+def _worker_main(shm_name, result_queue, stop_event, model_path, source_config, inference_backend,
+                 streaming_inference, motion_gate_epsilon=None, gate_label=None):
+    """
+    Loop di proses terpisah: capture source -> MediaPipe -> engineer_features -> GRU.
+    Frame ditulis ke shared memory, hanya record kecil yang dikirim lewat queue.
+    """
+    import cv2
+    import camera as camera_module
+    from capture_sources import create_capture_source
+    from hand_features import FeatureEngine, MotionGate
+
+    config = dict(source_config or {"type": "webcam"})
+    if config.get("type", "webcam") != "webcam":
+        # Di worker, rekaman selalu diputar dengan kecepatan aslinya
+        config["realtime"] = True
+    try:
+        source = create_capture_source(config)
+    except Exception as e:
+        print(f"[WORKER] Error membuka capture source: {e}")
+        source = None
+    if source is None or not source.isOpened():
+        result_queue.put({"type": "status", "camera_available": False})
+        return
+
+    hands = None if source.provides_landmarks else camera_module.create_hands_detector()
+    model = camera_module.load_gesture_model(model_path, inference_backend)
+    feature_engine = FeatureEngine()
+    motion_gate = MotionGate(motion_gate_epsilon) if motion_gate_epsilon and not streaming_inference else None
+
+    shm = shared_memory.SharedMemory(name=shm_name)
+    stamps, slots = _frame_buffers(shm)
+    result_queue.put({"type": "status", "camera_available": True, "model_loaded": model is not None})
+
+    frame_id = 0
+    try:
+        while not stop_event.is_set():
+            packet = source.grab()
+            if packet is None:
+                time.sleep(0.005)
+                continue
+            frame = packet.frame
+            frame_id += 1
+
+            record = {
+                "type": "result",
+                "frame_id": frame_id,
+                "slot": None,
+                "shape": None,
+                "capture_ts": packet.timestamp,
+                "landmarks": packet.landmarks,
+                "label": None,
+                "confidence": 0.0,
+                "prediction_time_ms": 0.0,
+                "detection_ms": None,
+                "features_ms": None,
+                "gated": False,
+            }
+
+            if frame is not None:
+                # Frame yang lebih besar dari slot di-resize agar muat
+                h, w = frame.shape[:2]
+                if h > MAX_FRAME_SHAPE[0] or w > MAX_FRAME_SHAPE[1]:
+                    frame = cv2.resize(frame, (MAX_FRAME_SHAPE[1], MAX_FRAME_SHAPE[0]))
+                    h, w = frame.shape[:2]
+                slot = frame_id % FRAME_SLOTS
+                stamps[slot] = 0            # slot tidak valid selama ditulis
+                slots[slot, :h, :w] = frame
+                stamps[slot] = frame_id
+                record["slot"] = slot
+                record["shape"] = (h, w)
+
+            if hands is not None and frame is not None:
+                t_detect = time.perf_counter()
+                detection = hands.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+                record["detection_ms"] = (time.perf_counter() - t_detect) * 1000
+                if detection is not None and detection.multi_hand_landmarks:
+                    record["landmarks"] = np.array(
+                        [[lm.x, lm.y, lm.z] for lm in detection.multi_hand_landmarks[0].landmark],
+                        dtype=np.float32)
+
+            landmarks = record["landmarks"]
+            if landmarks is None and streaming_inference and hasattr(model, "reset_state"):
+                model.reset_state()
+            if landmarks is None and motion_gate is not None:
+                motion_gate.reset()
+            if landmarks is not None and model is not None:
+                try:
+                    t_feat = time.perf_counter()
+                    features = feature_engine.extract(landmarks)
+                    t_pred = time.perf_counter()
+                    record["features_ms"] = (t_pred - t_feat) * 1000
+                    # gate_label: label dwell stabil dari game (-1 = gate tidak aktif)
+                    allowed = gate_label.value if gate_label is not None else -1
+                    cached = (motion_gate.lookup(features, allowed if allowed >= 0 else None)
+                              if motion_gate is not None else None)
+                    if cached is not None:
+                        record["label"], record["confidence"] = cached
+                        record["gated"] = True
+                    else:
+                        prediction = camera_module.run_gesture_model(model, features, streaming_inference)
+                        record["prediction_time_ms"] = (time.perf_counter() - t_pred) * 1000
+                        record["confidence"] = float(np.max(prediction))
+                        record["label"] = int(np.argmax(prediction))
+                        if motion_gate is not None:
+                            motion_gate.store(features, (record["label"], record["confidence"]), record["label"])
+                except Exception as e:
+                    print(f"[WORKER] Error during gesture prediction: {e}")
+
+            record["done_ts"] = time.time()
+            _put_latest(result_queue, record)
+    finally:
+        source.release()
+        del stamps, slots
+        shm.close()
+
+
+class InferenceWorker:
+    """
+    Menjalankan pipeline pengenalan gesture di proses terpisah supaya tidak
+    berebut GIL dengan rendering pygame. Dipakai oleh HandGestureCamera
+    saat use_worker_process=True.
+    """
+    def __init__(self, model_path, source_config=None, inference_backend="numpy", streaming_inference=False,
+                 queue_size=RESULT_QUEUE_SIZE, motion_gate_epsilon=None):
+        self.model_path = model_path
+        self.source_config = source_config
+        self.inference_backend = inference_backend
+        self.streaming_inference = streaming_inference
+        self.motion_gate_epsilon = motion_gate_epsilon
+        self.ctx = mp_proc.get_context("spawn")
+        self.result_queue = self.ctx.Queue(maxsize=queue_size)
+        # Label yang boleh dipakai ulang motion gate di worker, ditulis game tiap frame (-1 = tidak ada)
+        self.gate_label = self.ctx.Value("i", -1, lock=False)
+        self.stop_event = self.ctx.Event()
+        self.process = None
+        self.shm = None
+        self.stamps = None
+        self.slots = None
+
+        self.results_received = 0
+        self.results_skipped = 0
+        self.frames_stale = 0       # record yang slot frame-nya sudah ditimpa
+        self.alive = True           # False setelah poll_latest mendapati proses worker mati
+
+    def start(self, timeout=60.0):
+        """Start worker dan tunggu status awal. Returns True kalau kamera tersedia."""
+        frame_bytes = STAMP_BYTES + int(np.prod(MAX_FRAME_SHAPE)) * FRAME_SLOTS
+        self.shm = shared_memory.SharedMemory(create=True, size=frame_bytes)
+        self.stamps, self.slots = _frame_buffers(self.shm)
+        self.stamps[:] = 0
+
+        self.process = self.ctx.Process(
+            target=_worker_main,
+            args=(self.shm.name, self.result_queue, self.stop_event, self.model_path, self.source_config,
+                  self.inference_backend, self.streaming_inference, self.motion_gate_epsilon, self.gate_label),
+            name="GestureInferenceWorker",
+            daemon=True,
+        )
+        self.process.start()
+        print(f"[DEBUG] Inference worker started (pid={self.process.pid})")
+
+        # Record hasil yang mendahului status (antrian latest-wins) diabaikan
+        deadline = time.perf_counter() + timeout
+        status = None
+        while status is None or status.get("type") != "status":
+            try:
+                status = self.result_queue.get(timeout=max(0.0, deadline - time.perf_counter()))
+            except queue.Empty:
+                print("Error: Inference worker tidak merespons.")
+                self.stop()
+                return False
+
+        if not status.get("camera_available", False):
+            print("Error: Tidak ada kamera yang bisa dibuka di worker!")
+            self.stop()
+            return False
+        if not status.get("model_loaded", False):
+            print("Model gagal diload di worker. Gesture recognition akan dinonaktifkan.")
+        return True
+
+    def set_gate_label(self, label):
+        """Label dwell stabil untuk motion gate di worker (None = inferensi setiap frame)."""
+        self.gate_label.value = -1 if label is None else int(label)
+
+    def poll_latest(self):
+        """
+        Ambil record terbaru dari queue (record lama dibuang) beserta salinan
+        frame-nya dari shared memory. Returns (record, frame) atau None.
+        frame None kalau slot-nya sudah berisi frame lain (cap frame_id tidak cocok).
+        Kalau queue kosong dan proses worker sudah berhenti (crash/dibunuh),
+        self.alive menjadi False; record yang masih antri tetap dikembalikan dulu.
+        """
+        latest = None
+        while True:
+            try:
+                record = self.result_queue.get_nowait()
+            except queue.Empty:
+                break
+            if record.get("type") != "result":
+                continue
+            if latest is not None:
+                self.results_skipped += 1
+            latest = record
+
+        if latest is None:
+            if self.alive and self.process is not None and not self.process.is_alive():
+                self.alive = False
+                print(f"[WARN] Inference worker berhenti tanpa diminta (exitcode={self.process.exitcode})")
+            return None
+
+        self.results_received += 1
+        frame = None
+        if latest["slot"] is not None:
+            slot, frame_id = latest["slot"], latest["frame_id"]
+            if self.stamps[slot] == frame_id:
+                h, w = latest["shape"]
+                frame = self.slots[slot, :h, :w].copy()
+                if self.stamps[slot] != frame_id:
+                    frame = None    # worker menimpa slot saat disalin
+            if frame is None:
+                self.frames_stale += 1
+        return latest, frame
+
+    def stop(self):
+        """Hentikan worker dan bebaskan shared memory."""
+        self.stop_event.set()
+        if self.process is not None:
+            self.process.join(timeout=2.0)
+            if self.process.is_alive():
+                self.process.terminate()
+            self.process = None
+        if self.shm is not None:
+            self.stamps = self.slots = None
+            self.shm.close()
+            self.shm.unlink()
+            self.shm = None
+        print(f"[DEBUG] Inference worker stopped (received={self.results_received}, skipped={self.results_skipped}, "
+              f"stale frames={self.frames_stale})")
@@ -0,0 +1,165 @@
+import os
+import queue
+import struct
+import threading
+from datetime import datetime
+
+import numpy as np
+
+# ==============================================================================
+# Format file sesi landmark (.lmk)
+# ==============================================================================
+# [header 64 byte] [record 0] [record 1] ...
+# Header: magic (8s), versi (u4), ukuran record (u4), jumlah record (u8), sisanya nol.
+# File dialokasikan per chunk; jumlah record di header ditulis saat close().
+# Kalau sesi berhenti mendadak (jumlah = 0), reader menghitung dari ukuran file.
+MAGIC = b"EXGLMK01"
+VERSION = 1
+HEADER_SIZE = 64
+_HEADER_STRUCT = struct.Struct("<8sIIQ")
+
+RECORD_DTYPE = np.dtype([
+    ("timestamp", "<f8"),
+    ("frame_id", "<u4"),
+    ("label", "i1"),            # -1 = tidak ada prediksi
+    ("detected", "u1"),         # 0 = tangan tidak terdeteksi (landmarks berisi nol)
+    ("_pad", "<u2"),
+    ("confidence", "<f4"),
+    ("landmarks", "<f4", (21, 3)),
+])
+
+
+class LandmarkRecorder:
+    """
+    Merekam landmark per frame (timestamp, landmark 21x3, label, confidence)
+    ke file biner. Game thread hanya memasukkan tuple kecil ke queue;
+    penulisan ke disk dilakukan thread terpisah secara batch.
+    """
+    def __init__(self, path=None, chunk_records=4096, folder="debug_logs"):
+        if path is None:
+            if not os.path.exists(folder):
+                os.makedirs(folder)
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            path = os.path.join(folder, f"landmarks_{timestamp}.lmk")
+        self.path = path
+        self.chunk_records = chunk_records
+
+        self.queue = queue.Queue()
+        self.count = 0
+        self.capacity = 0
+        self.dropped = 0
+
+        self.file = open(self.path, "w+b")
+        self._write_header(0)
+        self._grow()
+
+        self.running = True
+        self.thread = threading.Thread(target=self._writer_loop, name="LandmarkRecorder", daemon=True)
+        self.thread.start()
+        print(f"[DEBUG] Landmark recorder menulis ke {self.path}")
+
+    def _write_header(self, count):
+        self.file.seek(0)
+        self.file.write(_HEADER_STRUCT.pack(MAGIC, VERSION, RECORD_DTYPE.itemsize, count).ljust(HEADER_SIZE, b"\0"))
+
+    def _grow(self):
+        """Alokasikan satu chunk lagi di akhir file."""
+        self.capacity += self.chunk_records
+        self.file.truncate(HEADER_SIZE + self.capacity * RECORD_DTYPE.itemsize)
+
+    def record(self, timestamp, frame_id, landmarks, label, confidence):
+        """Dipanggil dari game thread; tidak pernah menyentuh disk."""
+        if not self.running:
+            self.dropped += 1
+            return
+        self.queue.put((timestamp, frame_id, landmarks, label, confidence))
+
+    def _writer_loop(self):
+        batch = np.zeros(256, dtype=RECORD_DTYPE)
+        while True:
+            try:
+                item = self.queue.get(timeout=0.2)
+            except queue.Empty:
+                if not self.running:
+                    break
+                continue
+            if item is None:
+                break
+
+            # Kumpulkan item yang sudah menunggu supaya ditulis sekaligus
+            n = 0
+            stop = False
+            while item is not None:
+                self._fill(batch[n], item)
+                n += 1
+                if n == len(batch):
+                    break
+                try:
+                    item = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+            self._write_batch(batch[:n])
+            if stop:
+                break
+
+    @staticmethod
+    def _fill(row, item):
+        timestamp, frame_id, landmarks, label, confidence = item
+        row["timestamp"] = timestamp
+        row["frame_id"] = frame_id
+        row["label"] = -1 if label is None else label
+        row["confidence"] = confidence
+        if landmarks is None:
+            row["detected"] = 0
+            row["landmarks"] = 0.0
+        else:
+            row["detected"] = 1
+            row["landmarks"] = landmarks
+
+    def _write_batch(self, records):
+        while self.count + len(records) > self.capacity:
+            self._grow()
+        self.file.seek(HEADER_SIZE + self.count * RECORD_DTYPE.itemsize)
+        self.file.write(records.tobytes())
+        self.count += len(records)
+
+    def close(self):
+        """Tulis sisa queue, potong file ke jumlah record sebenarnya, lalu tutup."""
+        if not self.running:
+            return
+        self.running = False
+        self.queue.put(None)
+        self.thread.join(timeout=5.0)
+        self.file.truncate(HEADER_SIZE + self.count * RECORD_DTYPE.itemsize)
+        self._write_header(self.count)
+        self.file.close()
+        print(f"[DEBUG] Landmark recorder ditutup ({self.count} frame, {self.path})")
+
+
+def load_landmark_session(path):
+    """
+    Memory-map file .lmk sebagai structured array NumPy (lihat RECORD_DTYPE).
+    Contoh: session["landmarks"] -> (N, 21, 3), session["label"] -> (N,)
+    """
+    with open(path, "rb") as f:
+        magic, version, record_size, count = _HEADER_STRUCT.unpack(f.read(_HEADER_STRUCT.size))
+        file_size = os.fstat(f.fileno()).st_size
+    if magic != MAGIC:
+        raise ValueError(f"{path} bukan file sesi landmark")
+    if record_size != RECORD_DTYPE.itemsize:
+        raise ValueError(f"{path}: ukuran record {record_size} tidak cocok (versi {version})")
+
+    if count == 0:
+        # Sesi tidak ditutup dengan benar: ambil record sampai slot kosong pertama (frame_id nol)
+        count = (file_size - HEADER_SIZE) // record_size
+        if count == 0:
+            return np.zeros(0, dtype=RECORD_DTYPE)
+        session = np.memmap(path, dtype=RECORD_DTYPE, mode="r", offset=HEADER_SIZE, shape=(count,))
+        empty = np.flatnonzero(session["frame_id"] == 0)
+        count = int(empty[0]) if len(empty) else count
+        if count == 0:
+            return np.zeros(0, dtype=RECORD_DTYPE)
+
+    return np.memmap(path, dtype=RECORD_DTYPE, mode="r", offset=HEADER_SIZE, shape=(count,))
@@ -18,9 +18,15 @@ class Entity(pygame.sprite.Sprite):
 		self.collision('vertical')
 		self.rect.center = self.hitbox.center
 
+	def nearby_obstacles(self):
+		# SpatialGridGroup: hanya obstacle di sel sekitar hitbox
+		if hasattr(self.obstacle_sprites, 'query'):
+			return self.obstacle_sprites.query(self.hitbox)
+		return self.obstacle_sprites
+
 	def collision(self,direction):
 		if direction == 'horizontal':
-			for sprite in self.obstacle_sprites:
+			for sprite in self.nearby_obstacles():
 				if sprite.hitbox.colliderect(self.hitbox):
 					if self.direction.x > 0: # moving right
 						self.hitbox.right = sprite.hitbox.left
@@ -28,7 +34,7 @@ class Entity(pygame.sprite.Sprite):
 						self.hitbox.left = sprite.hitbox.right
 
 		if direction == 'vertical':
-			for sprite in self.obstacle_sprites:
+			for sprite in self.nearby_obstacles():
 				if sprite.hitbox.colliderect(self.hitbox):
 					if self.direction.y > 0: # moving down
 						self.hitbox.bottom = sprite.hitbox.top
@@ -1,14 +1,36 @@
 import pygame, sys
 from settings import *
 from tile import Tile
-from level.player import Player
+from level.player import Player, preload_assets as preload_player_assets
 from level.support import *
 from random import choice
-from ui import UI
+from ui import UI, HudLayer
 from button import Button
-from map_loader import TiledMap
-import pytmx
+from map_cache import load_map
 from camera_game import Camera
+from level.spatial_grid import SpatialGridGroup
+from tracing import tracer
+from assets import assets
+from compositor import LAYER_WORLD, LAYER_HUD
+
+# Asset yang dipakai setiap level (selain tile map), lihat preload_assets()
+FLOOR_IMAGE = "graphics/tilemap/Background.png"
+HEART_IMAGE = "graphics/items/heart.png"
+HEART_SIZE = (64, 64)
+GESTURE_KEYS = ("kiri", "kanan", "atas", "bawah")
+GESTURE_IMAGE_SIZE = (200, 100)
+
+
+def preload_assets():
+    """
+    Muat gambar level (background, heart, panel gesture) dan player ke cache
+    AssetManager, supaya Level baru tidak decode/scale file di thread utama.
+    """
+    assets.image(FLOOR_IMAGE, alpha=False)
+    assets.image(HEART_IMAGE, size=HEART_SIZE)
+    for key in GESTURE_KEYS:
+        assets.image(f"graphics/tutorials/{key}.png", size=GESTURE_IMAGE_SIZE, smooth=True)
+    preload_player_assets()
 
 class Item(pygame.sprite.Sprite):
     def __init__(self, pos, groups, item_type, surface=None):
@@ -25,7 +47,7 @@ class Item(pygame.sprite.Sprite):
 
 
 class Level:
-    def __init__(self, camera_instance, screen_surface, font_renderer, map_file, hearts_to_collect=2):
+    def __init__(self, camera_instance, screen_surface, font_renderer, map_file, hearts_to_collect=2, map_data=None):
         print("Loading TMX map:", map_file)
 
         # --- Surface & UI ---
@@ -42,7 +64,7 @@ class Level:
 
         # --- Sprite groups ---
         self.visible_sprites = YSortCameraGroup(self.screen_surface, None)
-        self.obstacle_sprites = pygame.sprite.Group()
+        self.obstacle_sprites = SpatialGridGroup()     # index grid untuk collision
         self.item_sprites = pygame.sprite.Group()
 
         # --- Player --- 
@@ -55,19 +77,24 @@ class Level:
         self.level_duration = 4 * 60        # 4 menit dalam detik
         self.start_time = pygame.time.get_ticks()
         self.time_up = False
+        self.remaining_time = self.level_duration
 
-        # --- Load map TMX ---
+        # --- HUD level yang di-cache ---
+        self.timer_layer = HudLayer(self.render_timer)   # render ulang hanya saat detik berubah
+        self.gesture_panel = None                         # (overlay, urutan blit), dibuat sekali
+
+        # --- Load map TMX (dari cache kompilasi kalau sumbernya tidak berubah) ---
         if map_file:
-            from map_loader import TiledMap
             print("DEBUG Loading TMX from:", map_file)
-            self.map = TiledMap(map_file)
+            # map_data: CompiledMap yang sudah disiapkan LevelPreloader di background
+            self.map = (map_data or load_map(map_file)).prepare()
 
             # --- Pastikan map surface minimal sebesar layar ---
             map_w = max(self.map.width, self.screen_surface.get_width())
             map_h = max(self.map.height, self.screen_surface.get_height())
             self.map_surface = pygame.Surface((map_w, map_h))
             self.map_surface.fill((0, 0, 0))  # background jika tile tidak menutupi
-            self.map.render(self.map_surface)
+            self.map_surface.blit(self.map.map_layer, (0, 0))
             self.map_rect = self.map_surface.get_rect(topleft=(0,0))
 
             # --- Kamera ---
@@ -79,69 +106,28 @@ class Level:
             )
             self.visible_sprites.camera = self.camera
 
-            # === Gesture panel ===
+            # === Gesture panel (di-resize ke 200x100, dibagi dengan TutorialOverlay) ===
             self.gesture_images = {
-                "kiri": pygame.image.load("graphics/tutorials/kiri.png"),
-                "kanan": pygame.image.load("graphics/tutorials/kanan.png"),
-                "atas": pygame.image.load("graphics/tutorials/atas.png"),
-                "bawah": pygame.image.load("graphics/tutorials/bawah.png")
+                key: assets.image(f"graphics/tutorials/{key}.png", size=GESTURE_IMAGE_SIZE, smooth=True)
+                for key in GESTURE_KEYS
             }
 
-            # Resize kalau mau sedikit lebih kecil
-            for key in self.gesture_images:
-                self.gesture_images[key] = pygame.transform.smoothscale(self.gesture_images[key], (200, 100))
-
-            # --- Spawn objects dari TMX ---
-            tile_w, tile_h = self.map.tmxdata.tilewidth, self.map.tmxdata.tileheight
-
-            # Default spawn → pakai tengah map (pixel, bukan tile)
-            default_spawn = (
-                (self.map.tmxdata.width * tile_w) // 2,
-                (self.map.tmxdata.height * tile_h) // 2
-            )
+            # --- Spawn objects dari map ---
+            for pos in self.map.hearts:
+                image = assets.image(HEART_IMAGE, size=HEART_SIZE)  # ubah ke ukuran tile
+                Item(pos, [self.visible_sprites, self.item_sprites], "heart", image)
 
-            player_spawn = None
-            for obj in self.map.tmxdata.objects:
-                
-                ox = obj.x * self.map.SCALE
-                oy = obj.y * self.map.SCALE
-
-                if obj.name == "Player":
-                    player_spawn = (obj.x, obj.y)
-
-                elif obj.name == "heart":
-                    image = pygame.image.load("graphics/items/heart.png").convert_alpha()
-                    image = pygame.transform.scale(image, (64, 64))  # ubah ke ukuran tile
-                    Item((ox, oy), [self.visible_sprites, self.item_sprites], "heart", image)
-
-                elif obj.name in ["obs", "0", "01", "02", "03", "04", "05", "06", "07", "08",
-                                "09", "10", "11", "12", "14", "15", "17", "18",
-                                "grass_1", "grass_2", "grass_3", "health"]:
-
-                    # Ambil tile image dari gid (gambar dari tileset)
-                    tile_img = self.map.tmxdata.get_tile_image_by_gid(obj.gid)
-
-                    if tile_img:
-                        tile_img = tile_img.convert_alpha()
-                        tile_img.set_colorkey((0,0,0))
-
-                        # scale dengan nearest-neighbor (pixel perfect)
-                        scaled = pygame.transform.scale(
-                            tile_img,
-                            (self.map.tmxdata.tilewidth * self.map.SCALE,
-                            self.map.tmxdata.tileheight * self.map.SCALE)
-                        )
-
-                        Tile(
-                            (ox, oy),
-                            [self.visible_sprites, self.obstacle_sprites],
-                            obj.name,
-                            scaled
-                        )
+            # Tile obstacle dengan gid sama memakai surface yang sama
+            for name, pos, gid in self.map.obstacles:
+                Tile(
+                    pos,
+                    [self.visible_sprites, self.obstacle_sprites],
+                    name,
+                    self.map.tiles[gid]
+                )
 
             # --- Buat player hanya sekali (di luar loop) ---
-            spawn_pos = player_spawn if player_spawn else default_spawn
-            spawn_pos = (spawn_pos[0] * self.map.SCALE, spawn_pos[1] * self.map.SCALE)
+            spawn_pos = self.map.player_spawn
 
             self.player = Player(
                 pos=spawn_pos,
@@ -152,6 +138,12 @@ class Level:
                 map_height=self.map.height
             )
 
+            # --- Index grid collision dibangun sekali setelah semua obstacle ada ---
+            self.obstacle_sprites.build_index()
+
+            # --- Tile obstacle tidak pernah bergerak: bake sekali ke layer map ---
+            self.visible_sprites.bake_static(self.obstacle_sprites, self.map_surface)
+
             # --- Paksa kamera langsung fokus ke player ---
             if hasattr(self, "camera") and self.camera:
                 self.camera.update(self.player)
@@ -166,7 +158,8 @@ class Level:
         if self.game_camera:
             self.ui.set_camera(self.game_camera)
 
-    def run(self):
+    def run(self, compositor):
+        """Update satu frame lalu daftarkan draw pass ke compositor (Game yang menggambar & flip)."""
         if self.level_complete:
             action = self.show_level_complete_screen()
             return action if action else "RUNNING"
@@ -174,40 +167,51 @@ class Level:
         if not self.game_paused:
             gesture_action = None
             if self.game_camera and self.player and self.player.control_with_gesture and not self.manual_gesture_input_mode:
-                self.game_camera.process()
+                with tracer.span("camera"):
+                    self.game_camera.process()
                 gesture_action = self.game_camera.consume_action()
 
             if gesture_action is not None:
                 self.player.execute_gesture_move(gesture_action)
 
-            # --- Bersihkan layar dulu agar sprite lama hilang ---
-            self.screen_surface.fill("black")
+            with tracer.span("update"):
+                self.visible_sprites.update()
+                self.player_item_collection_logic()
+                self.remaining_time = self.update_timer()
 
-            self.visible_sprites.update()
-            self.player_item_collection_logic()
-            remaining_time = self.update_timer()
-        
-            # --- gambar map + sprite ---
+        # Saat pause state tidak berubah, jadi world terakhir digambar ulang apa adanya
+        compositor.submit("world", self.draw_world, LAYER_WORLD)
+
+        if self.ui and self.player:
+            compositor.submit("hud", self.draw_hud, LAYER_HUD)
+
+    def draw_world(self, surface):
+        # --- Bersihkan layar dulu agar sprite lama hilang ---
+        surface.fill("black")
+
+        # --- gambar map + sprite ---
+        with tracer.span("render_world"):
             self.visible_sprites.custom_draw(
                 self.player,
                 map_surface=getattr(self, "map_surface", None),
                 map_rect=getattr(self, "map", None).rect if hasattr(self, "map") else None
             )
 
-        if hasattr(self, 'ui') and self.player:
-            self.ui.display(self.player, self.hearts_to_collect)
-            self.draw_gesture_panel() 
+    def draw_hud(self, surface):
+        self.ui.display(self.player, self.hearts_to_collect)
+        self.draw_gesture_panel()
+        self.timer_layer.draw(surface, self.remaining_time)
 
-            minutes = remaining_time // 60
-            seconds = remaining_time % 60
-            timer_text = self.font_renderer.render(f"{minutes:02d}:{seconds:02d}", True, (255,255,255))
-            self.screen_surface.blit(timer_text, (25, 140))   # 140 = di bawah tombol pause
-
-            pygame.display.update()
-            
-    
     def draw_gesture_panel(self):
         """Tampilkan panduan gesture (kanan atas, kiri bawah) di pojok kanan bawah."""
+        if self.gesture_panel is None:
+            self.gesture_panel = self.build_gesture_panel()
+        overlay, overlay_pos, image_blits = self.gesture_panel
+        self.screen_surface.blit(overlay, overlay_pos)
+        self.screen_surface.blits(image_blits, doreturn=False)
+
+    def build_gesture_panel(self):
+        """Hitung layout panel gesture sekali: overlay semi transparan + posisi tiap gambar."""
         margin = 20
         screen_w, screen_h = self.screen_surface.get_size()
 
@@ -230,7 +234,6 @@ class Level:
         # Background semi transparan
         overlay = pygame.Surface((panel_w, panel_h), pygame.SRCALPHA)
         overlay.fill((0, 0, 0, 120))
-        self.screen_surface.blit(overlay, panel_rect.topleft)
 
         # Layout 2 baris × 2 kolom
         layout = [
@@ -238,16 +241,22 @@ class Level:
             ["kiri", "bawah"]    # Baris kedua
         ]
 
-        # Gambar tiap gesture di posisi grid
+        # Posisi tiap gesture di grid
+        image_blits = []
         y = panel_rect.y + gap_y
         for row in layout:
             x = panel_rect.x + gap_x
             for key in row:
-                img = self.gesture_images[key]
-                # Pakai ukuran asli (tidak di-resize)
-                self.screen_surface.blit(img, (x, y))
+                image_blits.append((self.gesture_images[key], (x, y)))
                 x += img_w + gap_x
             y += img_h + gap_y
+        return overlay, panel_rect.topleft, image_blits
+
+    def render_timer(self, remaining_time):
+        minutes = remaining_time // 60
+        seconds = remaining_time % 60
+        timer_text = self.font_renderer.render(f"{minutes:02d}:{seconds:02d}", True, (255,255,255))
+        return timer_text, (25, 140)   # 140 = di bawah tombol pause
 
     def player_item_collection_logic(self):
         if self.player and not self.level_complete:
@@ -309,31 +318,96 @@ class YSortCameraGroup(pygame.sprite.Group):
         self.camera = camera_instance
         self.offset = pygame.math.Vector2()
 
+        # Sprite statis (tile obstacle TMX) sudah di-bake ke layer surface dan
+        # tidak ikut di-sort/blit per frame; lihat bake_static()
+        self.static_sprites = []
+        self.static_grid = SpatialGridGroup(box="rect")   # query overlap gambar, bukan hitbox
+        self.static_layer = None
+        self.draw_order = {}    # sprite -> urutan masuk group (tie-break sort Y seperti Group.sprites())
+
         try:
-            self.floor_surf = pygame.image.load("graphics/tilemap/Background.png").convert()
+            self.floor_surf = assets.image(FLOOR_IMAGE, alpha=False)
         except pygame.error:
             self.floor_surf = pygame.Surface(self.screen_surface.get_size())
             self.floor_surf.fill((30,30,30))
         self.floor_rect = self.floor_surf.get_rect(topleft=(0,0))
 
+    def bake_static(self, sprites, layer_surface=None):
+        """
+        Gambar sprite statis sekali ke `layer_surface` (biasanya map_surface level)
+        lalu keluarkan dari daftar draw per frame. Sprite tetap ada di group lain
+        (mis. obstacle_sprites) untuk collision.
+        """
+        sprites = list(sprites)
+        if not sprites:
+            return
+        if layer_surface is None:
+            # Tanpa map surface: buat layer transparan seukuran bounding box sprite
+            bounds = sprites[0].rect.unionall([s.rect for s in sprites[1:]])
+            layer_surface = pygame.Surface((bounds.right, bounds.bottom), pygame.SRCALPHA)
+        self.static_layer = layer_surface
+
+        # Urutan masuk group dicatat sebelum sprite dikeluarkan, supaya tie-break
+        # centery tetap sama dengan sort penuh
+        for sprite in self.sprites():
+            self.draw_order.setdefault(sprite, len(self.draw_order))
+
+        # Urutan Y dipertahankan di dalam layer
+        for sprite in sorted(sprites, key=self.draw_key):
+            layer_surface.blit(sprite.image, sprite.rect)
+        self.static_sprites.extend(sprites)
+        self.static_grid.add(sprites)
+        self.static_grid.build_index()
+        self.remove(*sprites)
+
+    def draw_key(self, sprite):
+        """Kunci sort Y: centery, lalu urutan masuk group (sprite baru di belakang)."""
+        return sprite.rect.centery, self.draw_order.get(sprite, len(self.draw_order))
+
+    def redraw_set(self, dynamic, viewport):
+        """
+        Sprite dinamis + tile statis yang harus digambar ulang di atas layer statis.
+        Tile yang bertumpuk dengan sprite di set ini dan urutannya lebih belakang
+        (centery lebih besar) ikut digambar ulang, berulang sampai tidak ada yang baru,
+        supaya tumpukan tile-dengan-tile tetap berurutan seperti sort penuh.
+        Tile di luar viewport tidak mempengaruhi layar, jadi tidak ikut.
+        """
+        redraw = dict.fromkeys(dynamic)     # dict: urutan masuk tetap (sort stabil)
+        pending = list(dynamic)
+        while pending:
+            sprite = pending.pop()
+            key = self.draw_key(sprite)
+            for tile in self.static_grid.query(sprite.rect):
+                if tile not in redraw and self.draw_key(tile) > key and viewport.colliderect(tile.rect):
+                    redraw[tile] = None
+                    pending.append(tile)
+        return list(redraw)
+
     def custom_draw(self, player, map_surface=None, map_rect=None):
         # Update kamera mengikuti player
         if self.camera:
             self.camera.update(player)
+        offset_x, offset_y = int(self.camera.offset.x), int(self.camera.offset.y)
 
         # Gambar background
-        floor_offset = pygame.math.Vector2(self.floor_rect.topleft) - self.camera.offset
-        self.screen_surface.blit(self.floor_surf, floor_offset)
+        self.screen_surface.blit(self.floor_surf, (self.floor_rect.x - offset_x, self.floor_rect.y - offset_y))
 
-        # Gambar map (hanya sekali blit)
+        # Gambar map + layer statis (hanya sekali blit)
         if map_surface and map_rect:
-            map_offset = pygame.math.Vector2(map_rect.topleft) - self.camera.offset
-            self.screen_surface.blit(map_surface, map_offset)
-
-        # Gambar semua sprite sesuai urutan Y
-        for sprite in sorted(self.sprites(), key=lambda spr: spr.rect.centery):
-            offset_pos = pygame.math.Vector2(sprite.rect.topleft) - self.camera.offset
-            self.screen_surface.blit(sprite.image, offset_pos)
+            self.screen_surface.blit(map_surface, (map_rect.x - offset_x, map_rect.y - offset_y))
+        if self.static_layer is not None and self.static_layer is not map_surface:
+            self.screen_surface.blit(self.static_layer, (-offset_x, -offset_y))
+
+        # Hanya sprite dinamis di dalam viewport (+ tile yang menimpanya) yang di-sort dan digambar
+        viewport = self.camera.camera_rect
+        visible = [sprite for sprite in self.sprites() if viewport.colliderect(sprite.rect)]
+        if self.static_sprites:
+            visible = self.redraw_set(visible, viewport)
+
+        self.screen_surface.blits(
+            [(sprite.image, (sprite.rect.x - offset_x, sprite.rect.y - offset_y))
+             for sprite in sorted(visible, key=self.draw_key)],
+            doreturn=False)
 
     def update(self, **kwargs):
         for sprite in self.sprites():
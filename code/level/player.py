@@ -3,12 +3,36 @@
 import pygame
 import os
 from settings import * 
+from assets import assets
+
+# Frame animasi (folder) dan gambar idle player, dipakai juga untuk preload level
+ANIMATION_FOLDERS = {
+    'up': 'graphics/player/up',
+    'down': 'graphics/player/down',
+    'left': 'graphics/player/left',
+    'right': 'graphics/player/right',
+}
+IDLE_IMAGES = {
+    'up_idle': 'graphics/player/up_idle/idle_up.png',
+    'down_idle': 'graphics/player/down_idle/idle_down.png',
+    'left_idle': 'graphics/player/left_idle/idle_left.png',
+    'right_idle': 'graphics/player/right_idle/idle_right.png',
+}
+
+
+def preload_assets():
+    """Muat semua gambar player ke cache AssetManager (dipanggil dari thread LevelPreloader)."""
+    for path in ANIMATION_FOLDERS.values():
+        assets.folder(path)
+    for path in IDLE_IMAGES.values():
+        assets.image(path)
+
 
 class Player(pygame.sprite.Sprite):
     def __init__(self, pos, groups, obstacle_sprites, camera_input=None, map_width=None, map_height=None):
         super().__init__(groups)
         try:
-            self.image = pygame.image.load('graphics/player/down_idle/idle_down.png').convert_alpha()
+            self.image = assets.image(IDLE_IMAGES['down_idle'])
         except pygame.error as e:
             print(f"Error loading player image: {e}. Creating placeholder.")
             self.image = pygame.Surface((TILESIZE, TILESIZE))
@@ -44,16 +68,8 @@ class Player(pygame.sprite.Sprite):
         self.moving_animation_until = 0
 
         # Animations dictionary
-        self.animations = {
-            'up': self.load_images('graphics/player/up'),
-            'down': self.load_images('graphics/player/down'),
-            'left': self.load_images('graphics/player/left'),
-            'right': self.load_images('graphics/player/right'),
-            'up_idle': [pygame.image.load('graphics/player/up_idle/idle_up.png').convert_alpha()],
-            'down_idle': [pygame.image.load('graphics/player/down_idle/idle_down.png').convert_alpha()],
-            'left_idle': [pygame.image.load('graphics/player/left_idle/idle_left.png').convert_alpha()],
-            'right_idle': [pygame.image.load('graphics/player/right_idle/idle_right.png').convert_alpha()]
-        }
+        self.animations = {status: self.load_images(path) for status, path in ANIMATION_FOLDERS.items()}
+        self.animations.update({status: [assets.image(path)] for status, path in IDLE_IMAGES.items()})
 
         self.direction = pygame.math.Vector2()
         self.speed = 2
@@ -188,6 +204,9 @@ class Player(pygame.sprite.Sprite):
             pass
 
     def check_obstacle_collision(self, future_hitbox):
+        # SpatialGridGroup: hanya cek obstacle di sel sekitar hitbox
+        if hasattr(self.obstacle_sprites, 'collides'):
+            return self.obstacle_sprites.collides(future_hitbox)
         for sprite in self.obstacle_sprites:
             if hasattr(sprite, 'hitbox') and sprite.hitbox.colliderect(future_hitbox):
                 return True 
@@ -217,9 +236,5 @@ class Player(pygame.sprite.Sprite):
         self.animate()
 
     def load_images(self, path):
-        images = []
-        for img_name in sorted(os.listdir(path)):
-            if img_name.endswith('.png'):
-                img = pygame.image.load(f"{path}/{img_name}").convert_alpha()
-                images.append(img)
-        return images
+        # Frame animasi di-cache AssetManager, dipakai bersama antar Player
+        return assets.folder(path)
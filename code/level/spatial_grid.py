@@ -0,0 +1,91 @@
+import pygame
+from settings import TILESIZE
+
+class SpatialGridGroup(pygame.sprite.Group):
+    """
+    Sprite group dengan index grid seragam untuk query collision.
+    Setiap sprite didaftarkan ke semua sel yang disentuh hitbox-nya; query(rect)
+    hanya memeriksa sel di sekitar rect, jadi biayanya tidak tumbuh dengan jumlah
+    obstacle. Index ikut diperbarui otomatis lewat add()/remove()/kill().
+    Sprite baru diindex saat query berikutnya, karena Tile/Player baru mengisi
+    rect dan hitbox setelah super().__init__(groups).
+    Sprite yang hitbox-nya berpindah harus memanggil relocate(sprite).
+    box="rect" mengindex rect gambar (untuk query overlap saat menggambar), bukan hitbox.
+    """
+    def __init__(self, *sprites, cell_size=TILESIZE * 2, box="hitbox"):
+        self.cell_size = cell_size
+        self.box = box
+        self.cells = {}             # (cx, cy) -> list sprite
+        self.sprite_cells = {}      # sprite -> list (cx, cy)
+        self.pending = []           # sprite yang belum diindex
+        super().__init__(*sprites)
+
+    def _hitbox(self, sprite):
+        return getattr(sprite, self.box, sprite.rect)
+
+    def _cells_for(self, rect):
+        size = self.cell_size
+        # right/bottom eksklusif: rect yang pas di batas sel tidak masuk sel berikutnya
+        x0, y0 = rect.left // size, rect.top // size
+        x1, y1 = (rect.right - 1) // size, (rect.bottom - 1) // size
+        return [(cx, cy) for cx in range(x0, x1 + 1) for cy in range(y0, y1 + 1)]
+
+    def add_internal(self, sprite, layer=None):
+        super().add_internal(sprite, layer)
+        self.pending.append(sprite)
+
+    def _index(self, sprite):
+        cells = self._cells_for(self._hitbox(sprite))
+        self.sprite_cells[sprite] = cells
+        for cell in cells:
+            self.cells.setdefault(cell, []).append(sprite)
+
+    def build_index(self):
+        """Index semua sprite yang belum terdaftar (dipanggil Level setelah spawn obstacle)."""
+        for sprite in self.pending:
+            self._index(sprite)
+        self.pending = []
+
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        if sprite in self.sprite_cells:
+            self._unindex(sprite)
+        else:
+            self.pending.remove(sprite)
+
+    def _unindex(self, sprite):
+        for cell in self.sprite_cells.pop(sprite, ()):
+            bucket = self.cells[cell]
+            bucket.remove(sprite)
+            if not bucket:
+                del self.cells[cell]
+
+    def relocate(self, sprite):
+        """Daftarkan ulang sprite setelah hitbox-nya berpindah."""
+        if sprite in self.sprite_cells:
+            self._unindex(sprite)
+            self._index(sprite)
+
+    def query(self, rect):
+        """Sprite yang hitbox-nya bertabrakan dengan rect."""
+        if self.pending:
+            self.build_index()
+        found = []
+        seen = set()
+        for cell in self._cells_for(rect):
+            for sprite in self.cells.get(cell, ()):
+                if sprite not in seen:
+                    seen.add(sprite)
+                    if self._hitbox(sprite).colliderect(rect):
+                        found.append(sprite)
+        return found
+
+    def collides(self, rect):
+        """True kalau ada hitbox yang bertabrakan dengan rect."""
+        if self.pending:
+            self.build_index()
+        for cell in self._cells_for(rect):
+            for sprite in self.cells.get(cell, ()):
+                if self._hitbox(sprite).colliderect(rect):
+                    return True
+        return False
@@ -0,0 +1,64 @@
+import queue
+import threading
+import time
+
+class LevelPreloader:
+    """
+    Menyiapkan data level berikutnya (parse/compile map, load asset) di thread
+    background selama level sekarang dimainkan.
+    preload(key, fn, *args) menjadwalkan fn(*args); take(key) mengambil hasilnya
+    saat transisi level. Kalau job gagal atau tidak pernah dijadwalkan, take()
+    return None dan pemanggil memuat secara sinkron seperti biasa.
+    """
+    def __init__(self):
+        self.jobs = {}                  # key -> {"done": Event, "result": ..., "error": ...}
+        self.queue = queue.Queue()
+        self.lock = threading.Lock()
+        self.running = True
+        self.thread = threading.Thread(target=self._worker_loop, name="LevelPreloader", daemon=True)
+        self.thread.start()
+
+    def preload(self, key, fn, *args):
+        """Jadwalkan fn(*args) di background (diabaikan kalau key sudah dijadwalkan)."""
+        with self.lock:
+            if key in self.jobs:
+                return
+            job = {"done": threading.Event(), "result": None, "error": None}
+            self.jobs[key] = job
+        self.queue.put((key, job, fn, args))
+
+    def _worker_loop(self):
+        while self.running:
+            item = self.queue.get()
+            if item is None:
+                break
+            key, job, fn, args = item
+            start = time.perf_counter()
+            try:
+                job["result"] = fn(*args)
+                print(f"[DEBUG] Preload {key} selesai ({(time.perf_counter() - start) * 1000:.0f} ms)")
+            except Exception as e:
+                job["error"] = e
+                print(f"[WARN] Preload {key} gagal: {e}")
+            job["done"].set()
+
+    def is_ready(self, key):
+        job = self.jobs.get(key)
+        return job is not None and job["done"].is_set()
+
+    def take(self, key, timeout=None):
+        """
+        Ambil hasil preload untuk key dan hapus dari daftar job. Kalau masih berjalan,
+        tunggu sampai selesai (tetap lebih cepat daripada mulai dari awal).
+        """
+        with self.lock:
+            job = self.jobs.pop(key, None)
+        if job is None:
+            return None
+        if not job["done"].wait(timeout):
+            return None
+        return job["result"]
+
+    def stop(self):
+        self.running = False
+        self.queue.put(None)
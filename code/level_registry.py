@@ -0,0 +1,99 @@
+import json
+import os
+import threading
+from collections import OrderedDict
+
+from map_cache import load_map
+
+# Registry level dari manifest JSON (default map/levels.json). Setiap entri:
+#   "LEVEL_1": {"map": "coba2.tmx", "hearts_to_collect": 2,
+#               "confidence_threshold": 0.10, "camera_level": 1, "next": "LEVEL_2"}
+# Path map relatif terhadap folder manifest. Data map (CompiledMap) dimuat saat
+# pertama dibutuhkan dan disimpan di LRU kecil, jadi main ulang / restart level
+# tidak perlu memuat map lagi.
+
+
+class LevelDefinition:
+    def __init__(self, key, map_file, hearts_to_collect=2, confidence_threshold=None, camera_level=None,
+                 next_key=None):
+        self.key = key
+        self.map_file = map_file
+        self.hearts_to_collect = hearts_to_collect
+        self.confidence_threshold = confidence_threshold
+        self.camera_level = camera_level
+        self.next_key = next_key
+
+
+class LevelRegistry:
+    def __init__(self, manifest_path, cache_size=3):
+        self.manifest_path = manifest_path
+        self.cache_size = cache_size
+        self.map_cache = OrderedDict()      # key -> CompiledMap, urutan = terakhir dipakai
+        self.lock = threading.Lock()        # dipakai juga oleh LevelPreloader di background
+
+        with open(manifest_path, encoding="utf-8") as f:
+            manifest = json.load(f)
+        base = os.path.dirname(manifest_path)
+        self.levels = {}
+        for key, entry in manifest["levels"].items():
+            self.levels[key] = LevelDefinition(
+                key,
+                os.path.join(base, entry["map"]),
+                hearts_to_collect=entry.get("hearts_to_collect", 2),
+                confidence_threshold=entry.get("confidence_threshold"),
+                camera_level=entry.get("camera_level"),
+                next_key=entry.get("next"),
+            )
+        for definition in self.levels.values():
+            if definition.next_key is not None and definition.next_key not in self.levels:
+                raise ValueError(f"{manifest_path}: level '{definition.key}' menunjuk ke "
+                                 f"level '{definition.next_key}' yang tidak ada")
+
+    def __contains__(self, key):
+        return key in self.levels
+
+    def keys(self):
+        """Key level sesuai urutan di manifest."""
+        return list(self.levels)
+
+    def get(self, key):
+        return self.levels.get(key)
+
+    def next_key(self, key):
+        definition = self.levels.get(key)
+        return definition.next_key if definition else None
+
+    def load_map_data(self, key):
+        """CompiledMap untuk level `key`, dari LRU atau dimuat (cache disk / kompilasi TMX)."""
+        with self.lock:
+            if key in self.map_cache:
+                self.map_cache.move_to_end(key)
+                return self.map_cache[key]
+
+        map_data = load_map(self.levels[key].map_file)
+
+        with self.lock:
+            self.map_cache[key] = map_data
+            self.map_cache.move_to_end(key)
+            while len(self.map_cache) > self.cache_size:
+                evicted, _ = self.map_cache.popitem(last=False)
+                print(f"[DEBUG] Map level {evicted} dikeluarkan dari cache")
+        return map_data
+
+    def preload_level(self, key):
+        """Job LevelPreloader: data map + gambar level/player ke cache, semua di background."""
+        from level.level import preload_assets
+
+        map_data = self.load_map_data(key)
+        preload_assets()
+        return map_data
+
+    def create_level(self, key, camera, screen, font):
+        """Bangun Level (lazy: hanya saat level dimulai)."""
+        from level.level import Level
+
+        definition = self.levels[key]
+        return Level(camera, screen, font,
+                     map_file=definition.map_file,
+                     hearts_to_collect=definition.hearts_to_collect,
+                     map_data=self.load_map_data(key))
@@ -1,13 +1,19 @@
 import pygame, sys
 from settings import *
 from main_menu import MainMenu
-from level.level import Level
-from camera import HandGestureCamera
+from landmark_recorder import LandmarkRecorder
 # from ui import UI # UI dikelola di dalam Level
 import threading  # --- PERUBAHAN UNTUK DEBUGGING ---
 from camera_debug import GameDebugger  # --- PERUBAHAN UNTUK DEBUGGING ---
 from ui import UI
 from button import Button
+from tracing import tracer
+from compositor import FrameCompositor, LAYER_OVERLAY
+from level_preloader import LevelPreloader
+from level_registry import LevelRegistry
+from startup_loader import StartupLoader
+from assets import assets
+import time
 
 class Game:
     def __init__(self):
@@ -19,111 +25,140 @@ class Game:
         self.current_game_state = "MENU" # Menggunakan nama state yang lebih deskriptif
         self.active_level_instance = None # Untuk menyimpan instance level yang sedang berjalan
 
-        self.camera = HandGestureCamera()
-        self.main_menu = MainMenu(self.screen) # MainMenu juga akan berfungsi sebagai font
+        # Kamera, MediaPipe dan model dimuat di background; menu langsung tampil.
+        # self.camera (dan debugger) baru diisi setelah startup selesai, lihat attach_camera().
+        self.camera = None
+        self.debugger = None
+        self.startup = StartupLoader()
+        self.startup.start(self.create_camera)
 
-        # --- PERUBAHAN UNTUK DEBUGGING ---
-        # Buat instance debugger dan berikan akses ke instance kamera
-        self.debugger = GameDebugger(self.camera)
-        # --------------------------------
+        # Daftar level dari manifest; Level dibangun saat dimulai, data map di-cache (LRU)
+        self.levels = LevelRegistry(LEVEL_MANIFEST, cache_size=LEVEL_CACHE_SIZE)
+
+        self.main_menu = MainMenu(self.screen, self.levels.keys()) # MainMenu juga akan berfungsi sebagai font
+        self.main_menu.status_provider = self.startup.status_text
 
         self.ui = UI(self.screen)
 
-        # Placeholder untuk Level
-        self.level_definitions = {
-            "LEVEL_1": lambda cam, screen_surface, font: Level(
-                cam, screen_surface, font,
-                map_file="/Users/luthfi/Downloads/Exergame_LSTM_Stroke-main copy 2/map/coba2.tmx",
-                hearts_to_collect=2
-            ),
-            "LEVEL_2": lambda cam, screen_surface, font: Level(
-                cam, screen_surface, font,
-                map_file="/Users/luthfi/Downloads/Exergame_LSTM_Stroke-main copy 2/map/lv2.tmx",
-                hearts_to_collect=2
-            ),
-            "LEVEL_3": lambda cam, screen_surface, font: Level(
-                cam, screen_surface, font,
-                map_file="/Users/luthfi/Downloads/Exergame_LSTM_Stroke-main copy 2/map/lv4.tmx",
-                hearts_to_collect=3
-            ),
-            "LEVEL_4": lambda cam, screen_surface, font: Level(
-                cam, screen_surface, font,
-                map_file="/Users/luthfi/Downloads/Exergame_LSTM_Stroke-main copy 2/map/lv5.tmx",
-                hearts_to_collect=3
-            ),
-            "LEVEL_5": lambda cam, screen_surface, font: Level(
-                cam, screen_surface, font,
-                map_file="/Users/luthfi/Downloads/Exergame_LSTM_Stroke-main copy 2/map/lv3.tmx",
-                hearts_to_collect=3
-            ),
-            "LEVEL_6": lambda cam, screen_surface, font: Level(
-                cam, screen_surface, font,
-                map_file="/Users/luthfi/Downloads/Exergame_LSTM_Stroke-main copy 2/map/lv7.tmx",
-                hearts_to_collect=4
-            ),
-            "LEVEL_7": lambda cam, screen_surface, font: Level(
-                cam, screen_surface, font,
-                map_file="/Users/luthfi/Downloads/Exergame_LSTM_Stroke-main copy 2/map/lv8.tmx",
-                hearts_to_collect=4
-            ),
-            "LEVEL_8": lambda cam, screen_surface, font: Level(
-                cam, screen_surface, font,
-                map_file="/Users/luthfi/Downloads/Exergame_LSTM_Stroke-main copy 2/map/lv6.tmx",
-                hearts_to_collect=4
-            ),
-            "TRIAL": lambda cam, screen_surface, font: Level(
-                cam, screen_surface, font,
-                map_file="/Users/luthfi/Downloads/Exergame_LSTM_Stroke-main copy 2/map/trial.tmx",
-                hearts_to_collect=1
-            ),
-        }
+        # Semua gambar saat bermain lewat compositor; layar di-flip tepat sekali per frame
+        self.compositor = FrameCompositor(self.screen)
+
+        # Map + gambar level berikutnya disiapkan di background selama level dimainkan
+        self.preloader = LevelPreloader()
+        # Level pertama (tombol PLAY) sudah bisa disiapkan selama menu tampil
+        self.preloader.preload("LEVEL_1", self.levels.preload_level, "LEVEL_1")
 
         self.current_level_key = None
 
+    def create_camera(self, progress):
+        """Tahap startup berat, berjalan di thread StartupLoader."""
+        progress("Memuat modul kamera", 0.0)
+        from camera import HandGestureCamera   # import cv2/MediaPipe juga di background
+
+        recorder = LandmarkRecorder() if RECORD_LANDMARKS else None
+        return HandGestureCamera(use_worker_process=GESTURE_WORKER_PROCESS,
+                                 source_config=CAPTURE_SOURCE, recorder=recorder,
+                                 inference_backend=INFERENCE_BACKEND,
+                                 streaming_inference=STREAMING_INFERENCE,
+                                 progress=progress,
+                                 motion_gate_epsilon=MOTION_GATE_EPSILON)
+
+    def attach_camera(self):
+        """Pasang kamera hasil startup (sekali) dan jalankan debugger. True kalau kamera siap."""
+        if self.camera is not None:
+            return True
+        if not self.startup.is_ready():
+            return False
+        self.camera = self.startup.wait()
+        if self.camera is None:
+            return False
+
+        # --- PERUBAHAN UNTUK DEBUGGING ---
+        # Buat instance debugger dan berikan akses ke instance kamera
+        self.debugger = GameDebugger(self.camera)
+        self.debugger.start()
+        # --------------------------------
+        return True
+
+    def wait_for_startup(self):
+        """Splash dengan progress selama kamera/model belum siap (hanya saat level akan dimulai)."""
+        font = assets.font(None, 40)
+        small_font = assets.font(None, 28)
+        bar_rect = pygame.Rect(0, 0, 400, 24)
+        bar_rect.center = (WIDTH // 2, HEIGHT // 2 + 40)
+        while not self.startup.is_ready():
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    pygame.quit()
+                    sys.exit()
+
+            stage, progress = self.startup.status()
+            self.screen.fill((20, 20, 30))
+            title = font.render("Menyiapkan pengenalan gesture", True, (255, 255, 255))
+            self.screen.blit(title, title.get_rect(center=(WIDTH // 2, HEIGHT // 2 - 30)))
+            pygame.draw.rect(self.screen, (60, 60, 70), bar_rect, border_radius=6)
+            fill_rect = bar_rect.copy()
+            fill_rect.width = int(bar_rect.width * progress)
+            pygame.draw.rect(self.screen, (0, 200, 120), fill_rect, border_radius=6)
+            text = small_font.render(stage, True, (200, 200, 200))
+            self.screen.blit(text, text.get_rect(center=(WIDTH // 2, bar_rect.bottom + 25)))
+            pygame.display.update()
+            self.clock.tick(30)
+        return self.attach_camera()
+
     def start_level(self, level_key):
         print(f"[DEBUG] Memulai level: {level_key}")
 
+        # Level butuh kamera: tunggu hanya kalau startup belum selesai
+        if not self.wait_for_startup():
+            print("[ERROR] Kamera/model gagal dimuat, level tidak bisa dimulai.")
+            self.current_game_state = "MENU"
+            return
+
         # Simpan level yang aktif
         self.current_level_key = level_key
 
-        # --- Atur current_level otomatis berdasarkan nama level ---
-        if "LEVEL_" in level_key:
-            try:
-                level_number = int(level_key.split("_")[1])
-                self.camera.current_level = level_number
-                print(f"[INFO] Kamera diatur ke level {level_number}")
-            except Exception as e:
-                print(f"[WARN] Tidak bisa baca nomor level dari '{level_key}': {e}")
-                self.camera.current_level = 6  # default
-        else:
-            self.camera.current_level = 6  # default (misal TRIAL)
-        # --------------------------------------------
+        definition = self.levels.get(level_key)
+        if definition is None:
+            print(f"[ERROR] Level '{level_key}' tidak ditemukan di {LEVEL_MANIFEST}!")
+            return
+
+        # --- Level kamera & threshold confidence dari manifest ---
+        self.camera.current_level = definition.camera_level if definition.camera_level is not None else 6
+        self.camera.confidence_threshold = definition.confidence_threshold
+        print(f"[INFO] Kamera diatur ke level {self.camera.current_level}")
 
         # Buat instance level sesuai definisi
-        level_factory = self.level_definitions.get(level_key)
-        if level_factory:
-            try:
-                self.active_level_instance = level_factory(self.camera, self.screen, self.main_menu.font)
-                self.active_level_instance.set_ui(self.ui)
-                self.current_game_state = "PLAYING_LEVEL"
-                print(f"[INFO] Level '{level_key}' dimulai dengan kamera level {self.camera.current_level}")
-            except Exception as e:
-                print(f"[ERROR] Gagal memulai level '{level_key}': {e}")
-        else:
-            print(f"[ERROR] Level '{level_key}' tidak ditemukan di level_definitions!")
+        try:
+            # Tunggu preload yang masih berjalan; hasilnya sudah masuk cache registry
+            self.preloader.take(level_key)
+            self.active_level_instance = self.levels.create_level(level_key, self.camera, self.screen,
+                                                                  self.main_menu.font)
+            self.active_level_instance.set_ui(self.ui)
+            self.current_game_state = "PLAYING_LEVEL"
+            print(f"[INFO] Level '{level_key}' dimulai dengan kamera level {self.camera.current_level}")
+        except Exception as e:
+            print(f"[ERROR] Gagal memulai level '{level_key}': {e}")
+            return
+        self.preload_next_level(level_key)
+
+    def preload_next_level(self, level_key):
+        """Mulai memuat map dan asset level berikutnya (menurut manifest) di thread background."""
+        next_key = self.levels.next_key(level_key)
+        if next_key is not None:
+            self.preloader.preload(next_key, self.levels.preload_level, next_key)
 
     def run(self):
-        # --- PERUBAHAN UNTUK DEBUGGING ---
-        # Jalankan debugger di thread terpisah
-        self.debugger.start()
-        # --------------------------------
-        
         while True:
+            frame_start = time.perf_counter()
+            self.compositor.begin()
             # --- PERUBAHAN UNTUK DEBUGGING ---
             # Berikan data FPS game ke instance kamera agar debugger bisa membacanya
             # Ini lebih akurat daripada menghitung FPS di dalam thread debug itu sendiri
             current_fps = self.clock.get_fps()
-            self.camera.game_fps = current_fps # Anda perlu menambahkan atribut ini di camera_debug.py
+            self.attach_camera()
+            if self.camera:
+                self.camera.game_fps = current_fps # Anda perlu menambahkan atribut ini di camera_debug.py
 
             # Event handling umum
             for event in pygame.event.get():  # Get all events
@@ -161,31 +196,17 @@ class Game:
                 level_choice = self.main_menu.show_levels_menu()
                 if level_choice == "BACK":
                     self.current_game_state = "MENU"
-                elif level_choice == "TRIAL": 
-                    self.start_level("TRIAL")
-                elif level_choice == "LEVEL_1":
-                    self.start_level("LEVEL_1")
-                elif level_choice == "LEVEL_2": 
-                    self.start_level("LEVEL_2")
-                elif level_choice == "LEVEL_3": 
-                    self.start_level("LEVEL_3")
-                elif level_choice == "LEVEL_4": 
-                    self.start_level("LEVEL_4")
-                elif level_choice == "LEVEL_5": 
-                    self.start_level("LEVEL_5")
-                elif level_choice == "LEVEL_6": 
-                    self.start_level("LEVEL_6")
-                elif level_choice == "LEVEL_7": 
-                    self.start_level("LEVEL_7")
-                elif level_choice == "LEVEL_8": 
-                    self.start_level("LEVEL_8")
+                elif level_choice in self.levels:
+                    self.start_level(level_choice)
 
             elif self.current_game_state == "PLAYING_LEVEL":
-                self.screen.fill("black") 
+                # Level.draw_world sendiri yang membersihkan layar (juga saat pause: world terakhir digambar ulang)
                 if self.active_level_instance:
-                    level_status = self.active_level_instance.run()
-
-                    self.ui.display(self.active_level_instance.player, getattr(self.active_level_instance, "hearts_to_collect", 0))
+                    level_status = self.active_level_instance.run(self.compositor)
+                    if self.ui.is_paused:
+                        self.compositor.submit("pause_overlay", lambda surface: self.ui.draw_pause_overlay(), LAYER_OVERLAY)
+                    # Satu-satunya flip saat bermain; menu, pilih level, dan pause punya loop sendiri
+                    self.compositor.present()
 
                     if getattr(self.active_level_instance, "level_complete", False):
                         # Ambil data evaluasi dari kamera
@@ -200,26 +221,11 @@ class Game:
 
                     if level_status == "LEVEL_COMPLETE_PROCEED":
                         print(f"{self.current_level_key} complete. Proceeding...")
-                        if self.current_level_key == "LEVEL_1":
-                            self.start_level("LEVEL_2")
-                        elif self.current_level_key == "LEVEL_2":
-                            self.start_level("LEVEL_3")
-                        elif self.current_level_key == "LEVEL_3":
-                            self.start_level("LEVEL_4")
-                        elif self.current_level_key == "LEVEL_4":
-                            self.start_level("LEVEL_5")
-                        elif self.current_level_key == "LEVEL_5":
-                            self.start_level("LEVEL_6")
-                        elif self.current_level_key == "LEVEL_6":
-                            self.start_level("LEVEL_7")
-                        elif self.current_level_key == "LEVEL_7":
-                            self.start_level("LEVEL_8")
-                        elif self.current_level_key == "LEVEL_8":
-                            print("Level 8 complete! Congratulations!")
-                            self.active_level_instance = None
-                            self.current_game_state = "MENU"
+                        next_key = self.levels.next_key(self.current_level_key)
+                        if next_key is not None:
+                            self.start_level(next_key)
                         else:
-                            print(f"No next level defined after {self.current_level_key}. Returning to menu.")
+                            print(f"{self.current_level_key} adalah level terakhir. Congratulations! Kembali ke menu.")
                             self.active_level_instance = None
                             self.current_game_state = "MENU"
                     
@@ -248,22 +254,8 @@ class Game:
                 
                 if hasattr(self, 'last_game_surface_before_pause'):
                     del self.last_game_surface_before_pause
-                
-                if self.ui.is_paused:
-                    overlay = pygame.Surface(self.screen.get_size(), pygame.SRCALPHA)
-                    overlay.fill((0, 0, 0, 150))
-                    self.screen.blit(overlay, (0, 0))
-
-                    font = pygame.font.Font(None, 60)
-                    text = font.render("Game Paused", True, (255, 255, 255))
-                    text_rect = text.get_rect(center=(self.screen.get_width()//2, self.screen.get_height()//2))
-                    self.screen.blit(text, text_rect)
-
-                    pygame.display.update()
-                    self.clock.tick(FPS)
-                    continue  # lewati update game kalau paused
-
-            pygame.display.update()
+            # Waktu kerja satu frame (tanpa tidur di clock.tick)
+            tracer.record("frame", (time.perf_counter() - frame_start) * 1000)
             self.clock.tick(FPS)
 
     def show_evaluation_screen(self, total_valid, total_gesture, avg_confidence):
@@ -340,9 +332,11 @@ if __name__ == '__main__':
         # --- PERUBAHAN UNTUK DEBUGGING ---
         # Pastikan debugger dan kamera dihentikan dengan benar saat program keluar
         print("\nExiting game...")
-        if hasattr(game, 'debugger'):
+        if getattr(game, 'debugger', None):
             game.debugger.stop()
-        if hasattr(game, 'camera'):
+        if hasattr(game, 'preloader'):
+            game.preloader.stop()
+        if getattr(game, 'camera', None):
             game.camera.release()
         pygame.quit()
         sys.exit()
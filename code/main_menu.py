@@ -3,21 +3,70 @@ import os
 from button import Button
 from settings import *
 from tutorial_overlay import TutorialOverlay
+from assets import assets
+from level_registry import LevelRegistry
 
 class MainMenu:
-    def __init__(self, screen):
+    def __init__(self, screen, level_keys=None):
         self.screen = screen
-        self.font = pygame.font.Font("graphics/font/joystix.ttf", 45) if os.path.exists("graphics/font/joystix.ttf") else pygame.font.Font(None, 45)
+        self.font = self.get_font(45)
         self.tutorial = TutorialOverlay(self.screen)
+        self.clock = pygame.time.Clock()
+
+        # Menu hanya digambar ulang saat ada perubahan (hover, klik, scroll).
+        # Saat diam, loop menunggu event dengan pygame.event.wait sehingga CPU hampir 0%.
+        self.MENU_FPS = 30
+        self.IDLE_TIMEOUT_MS = 500
+
+        # Status startup (mis. "Memuat model gesture... 70%"), diisi Game; None = tidak ada
+        self.status_provider = None
+        self.status_font = self.get_font(18)
+        self.status_text = None
+        self.status_surface = None
 
         # Load background image (fallback to gradient if not found)
         try:
-            self.background = pygame.image.load("graphics/tilemap/Background.png")
-            self.background = pygame.transform.scale(self.background, (WIDTH, HEIGHT))
+            self.background = assets.image("graphics/tilemap/Background.png", alpha=False, size=(WIDTH, HEIGHT))
         except:
             # Create gradient background as fallback
             self.background = self.create_gradient_background()
 
+        # === Widget menu utama (dibuat sekali) ===
+        self.title = self.get_font(80).render("MAIN MENU", True, TEXT_COLOR_SELECTED)
+        self.title_rect = self.title.get_rect(center=(WIDTH // 2, 100))
+        self.title_shadow = self.get_font(80).render("MAIN MENU", True, (50, 50, 50))
+        self.play_button = Button((WIDTH // 2, 250), "PLAY", self.get_font(50), "white", "green")
+        self.levels_button = Button((WIDTH // 2, 375), "LEVELS", self.get_font(50), "white", "dodgerblue")
+        self.quit_button = Button((WIDTH // 2, 500), "QUIT", self.get_font(50), "white", "red")
+        self.help_button = Button((WIDTH - 90, 50), "HELP", self.get_font(28), "white", "yellow")
+        self.main_buttons = [self.play_button, self.levels_button, self.quit_button, self.help_button]
+
+        # === Widget menu pause ===
+        self.pause_overlay = pygame.Surface((WIDTH, HEIGHT))
+        self.pause_overlay.set_alpha(150)
+        self.pause_overlay.fill((0, 0, 0))
+        self.pause_title = self.get_font(60).render("PAUSED", True, "white")
+        self.pause_rect = self.pause_title.get_rect(center=(WIDTH // 2, 150))
+        self.resume_button = Button((WIDTH // 2, 280), "RESUME", self.get_font(50), "white", "green")
+        self.menu_button = Button((WIDTH // 2, 400), "MENU", self.get_font(50), "white", "orange")
+        self.pause_buttons = [self.resume_button, self.menu_button]
+
+        # === Widget menu level ===
+        self.levels_title = self.get_font(80).render("LEVELS", True, TEXT_COLOR_SELECTED)
+        # Tombol level mengikuti urutan manifest (map/levels.json), BACK selalu terakhir
+        if level_keys is None:
+            level_keys = LevelRegistry(LEVEL_MANIFEST).keys()
+        self.level_buttons = []
+        for key in list(level_keys) + ["BACK"]:
+            if key == "TRIAL":
+                color = "green"
+            elif key == "BACK":
+                color = "red"
+            else:
+                color = "blue"
+            label = key.replace("_", " ")   # LEVEL_1 -> "LEVEL 1"
+            self.level_buttons.append((key, Button((WIDTH // 2, 0), label, self.get_font(50), "white", color)))
+
     def create_gradient_background(self):
         """Create a gradient background if image not found"""
         surface = pygame.Surface((WIDTH, HEIGHT))
@@ -28,146 +77,177 @@ class MainMenu:
         return surface
 
     def get_font(self, size):
-        if os.path.exists("graphics/font/joystix.ttf"):
-            return pygame.font.Font("graphics/font/joystix.ttf", size)
-        return pygame.font.Font(None, size)
+        # Font di-cache per ukuran (fallback ke font default kalau joystix.ttf tidak ada)
+        return assets.font("graphics/font/joystix.ttf", size)
+
+    def wait_events(self):
+        """Tunggu event (maks IDLE_TIMEOUT_MS), lalu ambil semua event yang sudah antri."""
+        event = pygame.event.wait(self.IDLE_TIMEOUT_MS)
+        events = [] if event.type == pygame.NOEVENT else [event]
+        events.extend(pygame.event.get())
+        return events
+
+    def update_status(self):
+        """Ambil status startup terbaru; True kalau berubah (perlu digambar ulang)."""
+        text = self.status_provider() if self.status_provider else None
+        if text == self.status_text:
+            return False
+        self.status_text = text
+        self.status_surface = self.status_font.render(text, True, "white") if text else None
+        return True
+
+    def draw_status(self):
+        if self.status_surface:
+            rect = self.status_surface.get_rect(bottomleft=(20, HEIGHT - 20))
+            pygame.draw.rect(self.screen, (0, 0, 0), rect.inflate(16, 10), border_radius=6)
+            self.screen.blit(self.status_surface, rect)
+
+    def update_hover(self, buttons, mouse_pos):
+        """Update hover semua tombol; True kalau ada yang berubah (perlu digambar ulang)."""
+        changed = False
+        for button in buttons:
+            changed = button.change_color(mouse_pos) or changed
+        return changed
 
     def show_main_menu(self):
+        self.update_hover(self.main_buttons, pygame.mouse.get_pos())
+        self.update_status()
+        dirty = True
         while True:
-            self.screen.blit(self.background, (0, 0))
-            mouse_pos = pygame.mouse.get_pos()
-
-            # Judul dengan shadow
-            title = self.get_font(80).render("MAIN MENU", True, TEXT_COLOR_SELECTED)
-            title_rect = title.get_rect(center=(WIDTH // 2, 100))
-            shadow = self.get_font(80).render("MAIN MENU", True, (50, 50, 50))
-            self.screen.blit(shadow, (title_rect.x + 3, title_rect.y + 3))
-            self.screen.blit(title, title_rect)
-
-            # === Tombol utama ===
-            play_button = Button((WIDTH // 2, 250), "PLAY", self.get_font(50), "white", "green")
-            levels_button = Button((WIDTH // 2, 375), "LEVELS", self.get_font(50), "white", "dodgerblue")
-            quit_button = Button((WIDTH // 2, 500), "QUIT", self.get_font(50), "white", "red")
-            help_button = Button((WIDTH - 90, 50), "HELP", self.get_font(28), "white", "yellow")
-
-            buttons = [play_button, levels_button, quit_button, help_button]
-
-            for button in buttons:
-                button.change_color(mouse_pos)
-                button.draw(self.screen)
-
-            for event in pygame.event.get():
+            for event in self.wait_events():
                 if event.type == pygame.QUIT:
                     pygame.quit()
                     sys.exit()
+                if event.type == pygame.MOUSEMOTION:
+                    dirty = self.update_hover(self.main_buttons, event.pos) or dirty
                 if event.type == pygame.MOUSEBUTTONDOWN:
-                    if play_button.check_click(mouse_pos):
+                    mouse_pos = event.pos
+                    if self.play_button.check_click(mouse_pos):
                         return "PLAY"
-                    if levels_button.check_click(mouse_pos):
+                    if self.levels_button.check_click(mouse_pos):
                         return "LEVELS"
-                    if help_button.check_click(mouse_pos):
+                    if self.help_button.check_click(mouse_pos):
                         self.tutorial.show_help_menu()
                         pygame.event.clear()
-                    if quit_button.check_click(mouse_pos):
+                        self.update_hover(self.main_buttons, pygame.mouse.get_pos())
+                        dirty = True
+                    if self.quit_button.check_click(mouse_pos):
                         return "QUIT"
+                if event.type in (pygame.WINDOWEXPOSED, pygame.VIDEOEXPOSE):
+                    dirty = True
+            dirty = self.update_status() or dirty
 
-            pygame.display.update()
+            if dirty:
+                self.screen.blit(self.background, (0, 0))
 
+                # Judul dengan shadow
+                self.screen.blit(self.title_shadow, (self.title_rect.x + 3, self.title_rect.y + 3))
+                self.screen.blit(self.title, self.title_rect)
 
-    def show_pause_menu(self, frozen_surface=None):
-        while True:
-            # Tampilkan tampilan game beku + overlay
-            if frozen_surface:
-                self.screen.blit(frozen_surface, (0, 0))
-                overlay = pygame.Surface((WIDTH, HEIGHT))
-                overlay.set_alpha(150)
-                overlay.fill((0, 0, 0))
-                self.screen.blit(overlay, (0, 0))
-            else:
-                self.screen.fill("gray")
+                for button in self.main_buttons:
+                    button.draw(self.screen)
+                self.draw_status()
 
-            mouse_pos = pygame.mouse.get_pos()
+                pygame.display.update()
+                dirty = False
+            self.clock.tick(self.MENU_FPS)
 
-            # Judul PAUSED
-            pause_title = self.get_font(60).render("PAUSED", True, "white")
-            pause_rect = pause_title.get_rect(center=(WIDTH // 2, 150))
-            self.screen.blit(pause_title, pause_rect)
 
-            # Tombol
-            resume_button = Button((WIDTH // 2, 280), "RESUME", self.get_font(50), "white", "green")
-            menu_button = Button((WIDTH // 2, 400), "MENU", self.get_font(50), "white", "orange")
-
-            for button in [resume_button, menu_button]:
-                button.change_color(mouse_pos)
-                button.draw(self.screen)
-
-            for event in pygame.event.get():
+    def show_pause_menu(self, frozen_surface=None):
+        self.update_hover(self.pause_buttons, pygame.mouse.get_pos())
+        dirty = True
+        while True:
+            for event in self.wait_events():
                 if event.type == pygame.QUIT:
                     pygame.quit()
                     sys.exit()
                 if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
                     return "RESUME"
+                if event.type == pygame.MOUSEMOTION:
+                    dirty = self.update_hover(self.pause_buttons, event.pos) or dirty
                 if event.type == pygame.MOUSEBUTTONDOWN:
-                    if resume_button.check_click(mouse_pos):
+                    if self.resume_button.check_click(event.pos):
                         return "RESUME"
-                    if menu_button.check_click(mouse_pos):
+                    if self.menu_button.check_click(event.pos):
                         return "MENU"
+                if event.type in (pygame.WINDOWEXPOSED, pygame.VIDEOEXPOSE):
+                    dirty = True
+
+            if dirty:
+                # Tampilkan tampilan game beku + overlay
+                if frozen_surface:
+                    self.screen.blit(frozen_surface, (0, 0))
+                    self.screen.blit(self.pause_overlay, (0, 0))
+                else:
+                    self.screen.fill("gray")
+
+                # Judul PAUSED
+                self.screen.blit(self.pause_title, self.pause_rect)
+
+                for button in self.pause_buttons:
+                    button.draw(self.screen)
 
-            pygame.display.update()
+                pygame.display.update()
+                dirty = False
+            self.clock.tick(self.MENU_FPS)
 
 
+    def layout_level_buttons(self, scroll_y):
+        start_y = 250  # posisi awal tombol
+        gap = 100      # jarak antar tombol
+        for i, (_, button) in enumerate(self.level_buttons):
+            button.move_to((WIDTH // 2, start_y + i * gap - scroll_y))
+
     def show_levels_menu(self):
         scroll_y = 0  # posisi scroll
         scroll_speed = 50  # seberapa cepat scroll
+        buttons = [button for _, button in self.level_buttons]
 
-        # Daftar level
-        level_names = ["TRIAL"] + [f"LEVEL {i}" for i in range(1, 9)] + ["BACK"]
-
+        self.layout_level_buttons(scroll_y)
+        self.update_hover(buttons, pygame.mouse.get_pos())
+        dirty = True
         while True:
-            self.screen.fill("black")
-            mouse_pos = pygame.mouse.get_pos()
-
-            title = self.get_font(80).render("LEVELS", True, TEXT_COLOR_SELECTED)
-            title_rect = title.get_rect(center=(WIDTH//2, 100 - scroll_y))
-            self.screen.blit(title, title_rect)
-
-            buttons = []
-            start_y = 250  # posisi awal tombol
-            gap = 100      # jarak antar tombol
-
-            for i, name in enumerate(level_names):
-                btn_y = start_y + i * gap - scroll_y
-                if name == "TRIAL":
-                    color = "green"
-                elif name == "BACK":
-                    color = "red"
-                else:
-                    color = "blue"
-
-                button = Button((WIDTH//2, btn_y), name, self.get_font(50), "white", color)
-                button.change_color(mouse_pos)
-                button.draw(self.screen)
-                buttons.append((name, button))
-
-            for event in pygame.event.get():
+            old_scroll = scroll_y
+            for event in self.wait_events():
                 if event.type == pygame.QUIT:
                     pygame.quit()
                     sys.exit()
+                if event.type == pygame.MOUSEMOTION:
+                    dirty = self.update_hover(buttons, event.pos) or dirty
                 if event.type == pygame.MOUSEBUTTONDOWN:
                     if event.button == 4:  # scroll up
                         scroll_y = max(0, scroll_y - scroll_speed)
                     elif event.button == 5:  # scroll down
                         scroll_y += scroll_speed
                     else:
-                        for name, button in buttons:
-                            if button.check_click(mouse_pos):
-                                if name == "BACK":
-                                    return "BACK"
-                                return name.replace(" ", "_")  # TRIAL, LEVEL_1, LEVEL_2, ...
+                        for key, button in self.level_buttons:
+                            if button.check_click(event.pos):
+                                return key  # key manifest (TRIAL, LEVEL_1, ...) atau BACK
                 if event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_UP:
                         scroll_y = max(0, scroll_y - scroll_speed)
                     elif event.key == pygame.K_DOWN:
                         scroll_y += scroll_speed
+                if event.type in (pygame.WINDOWEXPOSED, pygame.VIDEOEXPOSE):
+                    dirty = True
+
+            dirty = self.update_status() or dirty
+
+            if scroll_y != old_scroll:
+                self.layout_level_buttons(scroll_y)
+                self.update_hover(buttons, pygame.mouse.get_pos())
+                dirty = True
+
+            if dirty:
+                self.screen.fill("black")
+
+                title_rect = self.levels_title.get_rect(center=(WIDTH//2, 100 - scroll_y))
+                self.screen.blit(self.levels_title, title_rect)
+
+                for button in buttons:
+                    button.draw(self.screen)
+                self.draw_status()
 
-            pygame.display.update()
+                pygame.display.update()
+                dirty = False
+            self.clock.tick(self.MENU_FPS)
@@ -0,0 +1,203 @@
+import hashlib
+import os
+import pickle
+import sys
+import time
+import xml.etree.ElementTree as ElementTree
+
+import pygame
+
+# ==============================================================================
+# Cache map hasil kompilasi TMX
+# ==============================================================================
+# Parse TMX (pytmx), render layer tile yang sudah di-scale dan scale tile object
+# hanya dilakukan sekali; hasilnya disimpan di CACHE_DIR sebagai file .mapc.
+# Key cache = hash isi TMX + semua tileset (.tsx) + gambar yang dipakai, jadi
+# cache otomatis dibangun ulang kalau salah satu file sumber berubah.
+# Precompile semua level:  python code/map_cache.py map/*.tmx
+
+CACHE_DIR = os.path.join("cache", "maps")
+CACHE_VERSION = 1
+
+# Nama object TMX yang menjadi tile obstacle
+OBSTACLE_OBJECT_NAMES = {"obs", "0", "01", "02", "03", "04", "05", "06", "07", "08",
+                         "09", "10", "11", "12", "14", "15", "17", "18",
+                         "grass_1", "grass_2", "grass_3", "health"}
+OBSTACLE_COLORKEY = (0, 0, 0)
+
+
+class CompiledMap:
+    """
+    Data map yang siap dipakai Level: layer tile yang sudah dirender, tile
+    obstacle (surface per gid), posisi heart dan spawn player, semua dalam
+    koordinat world yang sudah di-scale.
+    """
+    def __init__(self, data):
+        self.source = data["source"]
+        self.SCALE = data["scale"]
+        self.tilewidth = data["tilewidth"]
+        self.tileheight = data["tileheight"]
+        self.width = data["width"]
+        self.height = data["height"]
+        self.rect = pygame.Rect(0, 0, self.width, self.height)
+
+        self.map_layer = _surface_from_record(data["map_layer"])
+        self.tiles = {}
+        for gid, record in data["tiles"].items():
+            surface = _surface_from_record(record)
+            surface.set_colorkey(OBSTACLE_COLORKEY)
+            self.tiles[gid] = surface
+        self.obstacles = data["obstacles"]          # [(name, (x, y), gid)]
+        self.hearts = data["hearts"]                # [(x, y)]
+        self.player_spawn = data["player_spawn"]    # (x, y)
+        self.prepared = False
+
+    def prepare(self):
+        """Konversi surface ke format display (sekali, setelah set_mode)."""
+        if not self.prepared and pygame.display.get_surface() is not None:
+            self.prepared = True
+            self.map_layer = self.map_layer.convert()
+            for gid, surface in self.tiles.items():
+                self.tiles[gid] = surface.convert_alpha()
+        return self
+
+    def get_size(self):
+        return (self.width, self.height)
+
+
+def _surface_to_record(surface, fmt):
+    return (surface.get_size(), fmt, pygame.image.tobytes(surface, fmt))
+
+
+def _surface_from_record(record):
+    size, fmt, data = record
+    return pygame.image.frombuffer(data, size, fmt)
+
+
+def _source_files(tmx_path):
+    """TMX + tileset eksternal + gambar tileset, sebagai path absolut."""
+    files = [os.path.abspath(tmx_path)]
+    pending = [os.path.abspath(tmx_path)]
+    while pending:
+        path = pending.pop()
+        base = os.path.dirname(path)
+        root = ElementTree.parse(path).getroot()
+        for node in root.iter():
+            source = node.get("source")
+            if node.tag not in ("tileset", "image") or not source:
+                continue
+            resolved = os.path.abspath(os.path.join(base, source))
+            if resolved in files:
+                continue
+            files.append(resolved)
+            if node.tag == "tileset":
+                pending.append(resolved)
+    return files
+
+
+def map_cache_key(tmx_path, scale=4):
+    """Hash isi TMX dan semua file yang dirujuknya (file hilang ikut di-hash sebagai 'missing')."""
+    digest = hashlib.sha1(f"v{CACHE_VERSION}:scale{scale}".encode())
+    for path in _source_files(tmx_path):
+        digest.update(os.path.basename(path).encode())
+        try:
+            with open(path, "rb") as f:
+                digest.update(f.read())
+        except OSError:
+            digest.update(b"missing")
+    return digest.hexdigest()
+
+
+def _cache_path(tmx_path, key):
+    name = os.path.splitext(os.path.basename(tmx_path))[0]
+    return os.path.join(CACHE_DIR, f"{name}-{key[:16]}.mapc")
+
+
+def compile_map(tmx_path, scale=4):
+    """Parse dan render TMX, return dict yang bisa di-pickle (lihat CompiledMap)."""
+    from map_loader import TiledMap
+
+    tiled = TiledMap(tmx_path, scale=scale)
+    map_layer = pygame.Surface((tiled.width, tiled.height))
+    map_layer.fill((0, 0, 0))  # background jika tile tidak menutupi
+    tiled.render(map_layer)
+
+    obstacles, hearts, tiles = [], [], {}
+    tmxdata = tiled.tmxdata
+    # Default spawn → pakai tengah map
+    player_spawn = ((tmxdata.width * tmxdata.tilewidth) // 2 * scale,
+                    (tmxdata.height * tmxdata.tileheight) // 2 * scale)
+    for obj in tmxdata.objects:
+        ox, oy = obj.x * scale, obj.y * scale
+        if obj.name == "Player":
+            player_spawn = (ox, oy)
+        elif obj.name == "heart":
+            hearts.append((ox, oy))
+        elif obj.name in OBSTACLE_OBJECT_NAMES:
+            if obj.gid not in tiles:
+                surface = tiled.get_scaled_tile(obj.gid, colorkey=OBSTACLE_COLORKEY)
+                tiles[obj.gid] = None if surface is None else _surface_to_record(surface, "RGBA")
+            if tiles[obj.gid] is not None:
+                obstacles.append((obj.name, (ox, oy), obj.gid))
+
+    return {
+        "version": CACHE_VERSION,
+        "source": tmx_path,
+        "scale": scale,
+        "tilewidth": tiled.tilewidth,
+        "tileheight": tiled.tileheight,
+        "width": tiled.width,
+        "height": tiled.height,
+        "map_layer": _surface_to_record(map_layer, "RGB"),
+        "tiles": {gid: record for gid, record in tiles.items() if record is not None},
+        "obstacles": obstacles,
+        "hearts": hearts,
+        "player_spawn": player_spawn,
+    }
+
+
+def load_map(tmx_path, scale=4, use_cache=True):
+    """
+    CompiledMap untuk tmx_path. Dibaca dari CACHE_DIR kalau key cocok,
+    selain itu dikompilasi ulang dan disimpan (file cache lama dihapus).
+    """
+    if not use_cache:
+        return CompiledMap(compile_map(tmx_path, scale))
+
+    key = map_cache_key(tmx_path, scale)
+    path = _cache_path(tmx_path, key)
+    if os.path.exists(path):
+        try:
+            with open(path, "rb") as f:
+                data = pickle.load(f)
+            if data.get("version") == CACHE_VERSION:
+                return CompiledMap(data)
+        except Exception as e:
+            print(f"[WARN] Cache map {path} rusak, kompilasi ulang: {e}")
+
+    start = time.perf_counter()
+    data = compile_map(tmx_path, scale)
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    prefix = os.path.basename(path).rsplit("-", 1)[0] + "-"
+    for old in os.listdir(CACHE_DIR):
+        if old.startswith(prefix) and old.endswith(".mapc"):
+            os.remove(os.path.join(CACHE_DIR, old))
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+    print(f"[DEBUG] Map {tmx_path} dikompilasi ke {path} ({(time.perf_counter() - start) * 1000:.0f} ms)")
+    return CompiledMap(data)
+
+
+if __name__ == "__main__":
+    # python code/map_cache.py map/*.tmx   -> kompilasi semua map ke cache
+    pygame.init()
+    pygame.display.set_mode((1, 1), pygame.HIDDEN)   # pytmx butuh display untuk convert()
+    for tmx in sys.argv[1:]:
+        try:
+            start = time.perf_counter()
+            load_map(tmx)
+            print(f"{tmx}: OK ({(time.perf_counter() - start) * 1000:.0f} ms)")
+        except Exception as e:
+            print(f"{tmx}: gagal ({e})")
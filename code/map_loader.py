@@ -2,7 +2,7 @@ import pygame
 import pytmx
 
 class TiledMap:
-    def __init__(self, filename, scale=4):
+    def __init__(self, filename, scale=4, atlas=False):
         self.tmxdata = pytmx.load_pygame(filename, pixelalpha=True)
 
         # simpan scale
@@ -18,22 +18,64 @@ class TiledMap:
 
         self.rect = pygame.Rect(0, 0, self.width, self.height)  # <-- safer
 
+        # Cache gid -> surface yang sudah di-scale, dipakai bersama oleh render()
+        # dan spawn object di Level (kebanyakan cell memakai gid yang sama)
+        self.tile_cache = {}
+        self.atlas = None
+        if atlas:
+            self.build_atlas()
+
+    def get_scaled_tile(self, gid, colorkey=None):
+        """
+        Surface tile gid yang sudah di-scale ke ukuran tile map, atau None.
+        colorkey: varian untuk tile object (convert_alpha + set_colorkey), di-cache terpisah.
+        """
+        key = (gid, colorkey)
+        if key in self.tile_cache:
+            return self.tile_cache[key]
+
+        tile = self.tmxdata.get_tile_image_by_gid(gid) if gid else None
+        if tile is not None:
+            if colorkey is not None:
+                tile = tile.convert_alpha()
+                tile.set_colorkey(colorkey)
+            # scale dengan nearest-neighbor (pixel perfect)
+            tile = pygame.transform.scale(tile, (self.tilewidth, self.tileheight))
+        self.tile_cache[key] = tile
+        return tile
+
+    def build_atlas(self):
+        """
+        Kemas semua tile layer yang dipakai map ke satu surface atlas; entri cache
+        menjadi subsurface atlas. Opsional (TiledMap(..., atlas=True)).
+        """
+        gids = sorted({gid for layer in self.tmxdata.visible_layers
+                       if isinstance(layer, pytmx.TiledTileLayer)
+                       for _, _, gid in layer if gid})
+        tiles = [(gid, self.get_scaled_tile(gid)) for gid in gids]
+        tiles = [(gid, tile) for gid, tile in tiles if tile is not None]
+        if not tiles:
+            return None
+
+        columns = max(1, int(len(tiles) ** 0.5 + 0.999))
+        rows = (len(tiles) + columns - 1) // columns
+        self.atlas = pygame.Surface((columns * self.tilewidth, rows * self.tileheight), pygame.SRCALPHA)
+        for index, (gid, tile) in enumerate(tiles):
+            cell = pygame.Rect((index % columns) * self.tilewidth, (index // columns) * self.tileheight,
+                               self.tilewidth, self.tileheight)
+            self.atlas.blit(tile, cell)
+            self.tile_cache[(gid, None)] = self.atlas.subsurface(cell)
+        return self.atlas
+
     def render(self, surface):
         for layer in self.tmxdata.visible_layers:
             if isinstance(layer, pytmx.TiledTileLayer):
+                blits = []
                 for x, y, gid in layer:
-                    tile = self.tmxdata.get_tile_image_by_gid(gid)
+                    tile = self.get_scaled_tile(gid)
                     if tile:
-                        
-                        scaled_tile = pygame.transform.scale(
-                            tile,
-                            (self.tilewidth, self.tileheight)
-                        )
-
-                        surface.blit(
-                            scaled_tile,
-                            (x * self.tilewidth, y * self.tileheight)
-                        )
-            
+                        blits.append((tile, (x * self.tilewidth, y * self.tileheight)))
+                surface.blits(blits, doreturn=False)
+
     def get_size(self):
         return (self.width, self.height)
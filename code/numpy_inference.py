@@ -0,0 +1,361 @@
+import io
+import json
+import sys
+import time
+import zipfile
+
+import numpy as np
+
+# Inferensi model .keras (Sequential: GRU/LSTM + Dense) murni dengan NumPy.
+# Bobot dibaca langsung dari model.weights.h5 di dalam arsip .keras, jadi game
+# tidak perlu meng-import TensorFlow sama sekali. Gunakan check_parity() untuk
+# membandingkan output dengan Keras di mesin yang punya TensorFlow.
+# Output Keras untuk semua model di folder model/ disimpan di PARITY_FIXTURE
+# (write_parity_fixture, butuh TensorFlow); check_parity_fixture() membandingkannya
+# tanpa TensorFlow dan dijalankan oleh `python code/benchmark.py check`.
+
+PARITY_FIXTURE = "model/parity_reference.npz"
+
+_ACTIVATIONS = {
+    "linear": lambda x: x,
+    None: lambda x: x,
+    "tanh": np.tanh,
+    "sigmoid": lambda x: 1.0 / (1.0 + np.exp(-x)),
+    "relu": lambda x: np.maximum(x, 0.0),
+}
+
+
+def _softmax(x):
+    e = np.exp(x - np.max(x, axis=-1, keepdims=True))
+    return e / np.sum(e, axis=-1, keepdims=True)
+
+
+_ACTIVATIONS["softmax"] = _softmax
+
+
+def _activation(name):
+    if name not in _ACTIVATIONS:
+        raise ValueError(f"Aktivasi '{name}' belum didukung oleh backend NumPy")
+    return _ACTIVATIONS[name]
+
+
+class _DenseLayer:
+    def __init__(self, config, weights):
+        self.kernel = weights[0]
+        self.bias = weights[1] if config.get("use_bias", True) else np.zeros(self.kernel.shape[1], np.float32)
+        self.activation = _activation(config.get("activation"))
+
+    def __call__(self, x):
+        return self.activation(x @ self.kernel + self.bias)
+
+
+class _GRULayer:
+    """Keras GRU (gate z, r, h). Mendukung reset_after=True (default Keras 3) dan False."""
+    def __init__(self, config, weights):
+        self.units = config["units"]
+        self.return_sequences = config.get("return_sequences", False)
+        self.reset_after = config.get("reset_after", True)
+        self.activation = _activation(config.get("activation", "tanh"))
+        self.recurrent_activation = _activation(config.get("recurrent_activation", "sigmoid"))
+        self.kernel, self.recurrent_kernel = weights[0], weights[1]
+
+        bias = weights[2] if len(weights) > 2 else np.zeros(3 * self.units, np.float32)
+        if self.reset_after:
+            self.input_bias, self.recurrent_bias = bias[0], bias[1]
+        else:
+            self.input_bias, self.recurrent_bias = bias, np.zeros(3 * self.units, np.float32)
+
+    def initial_state(self, batch):
+        return np.zeros((batch, self.units), np.float32)
+
+    def step(self, x_proj, h):
+        """Satu langkah sel; x_proj = x @ kernel + input_bias (sudah dihitung)."""
+        u = self.units
+        if self.reset_after:
+            rec = h @ self.recurrent_kernel + self.recurrent_bias
+            z = self.recurrent_activation(x_proj[:, :u] + rec[:, :u])
+            r = self.recurrent_activation(x_proj[:, u:2 * u] + rec[:, u:2 * u])
+            hh = self.activation(x_proj[:, 2 * u:] + r * rec[:, 2 * u:])
+        else:
+            rec = h @ self.recurrent_kernel[:, :2 * u]
+            z = self.recurrent_activation(x_proj[:, :u] + rec[:, :u])
+            r = self.recurrent_activation(x_proj[:, u:2 * u] + rec[:, u:2 * u])
+            hh = self.activation(x_proj[:, 2 * u:] + (r * h) @ self.recurrent_kernel[:, 2 * u:])
+        return z * h + (1.0 - z) * hh
+
+    def __call__(self, x, state=None):
+        batch, steps, _ = x.shape
+        # Proyeksi input untuk semua timestep sekaligus
+        x_proj = x @ self.kernel + self.input_bias
+        h = self.initial_state(batch) if state is None else state
+        outputs = []
+        for t in range(steps):
+            h = self.step(x_proj[:, t], h)
+            outputs.append(h)
+        out = np.stack(outputs, axis=1) if self.return_sequences else h
+        return out, h
+
+
+class _LSTMLayer:
+    """Keras LSTM (gate i, f, c, o)."""
+    def __init__(self, config, weights):
+        self.units = config["units"]
+        self.return_sequences = config.get("return_sequences", False)
+        self.activation = _activation(config.get("activation", "tanh"))
+        self.recurrent_activation = _activation(config.get("recurrent_activation", "sigmoid"))
+        self.kernel, self.recurrent_kernel = weights[0], weights[1]
+        self.bias = weights[2] if len(weights) > 2 else np.zeros(4 * self.units, np.float32)
+
+    def initial_state(self, batch):
+        return (np.zeros((batch, self.units), np.float32), np.zeros((batch, self.units), np.float32))
+
+    def step(self, x_proj, state):
+        u = self.units
+        h, c = state
+        gates = x_proj + h @ self.recurrent_kernel
+        i = self.recurrent_activation(gates[:, :u])
+        f = self.recurrent_activation(gates[:, u:2 * u])
+        c = f * c + i * self.activation(gates[:, 2 * u:3 * u])
+        o = self.recurrent_activation(gates[:, 3 * u:])
+        h = o * self.activation(c)
+        return h, c
+
+    def __call__(self, x, state=None):
+        batch, steps, _ = x.shape
+        x_proj = x @ self.kernel + self.bias
+        state = self.initial_state(batch) if state is None else state
+        outputs = []
+        for t in range(steps):
+            state = self.step(x_proj[:, t], state)
+            outputs.append(state[0])
+        out = np.stack(outputs, axis=1) if self.return_sequences else state[0]
+        return out, state
+
+
+_LAYER_TYPES = {"GRU": _GRULayer, "LSTM": _LSTMLayer, "Dense": _DenseLayer}
+# Layer tanpa efek saat inferensi
+_SKIPPED_LAYERS = {"InputLayer", "Dropout"}
+
+
+def _snake_case(name):
+    out = []
+    for i, ch in enumerate(name):
+        if ch.isupper() and i > 0 and not name[i - 1].isupper():
+            out.append("_")
+        out.append(ch.lower())
+    return "".join(out)
+
+
+def _read_layer_weights(h5_layers, group_name):
+    """Ambil list bobot layer (vars/0, vars/1, ...) dari file h5 Keras 3."""
+    group = h5_layers[group_name]
+    if "cell" in group:
+        group = group["cell"]
+    variables = group["vars"]
+    return [np.asarray(variables[str(i)], dtype=np.float32) for i in range(len(variables))]
+
+
+class NumpyGestureModel:
+    """
+    Pengganti keras Model.predict() untuk model gesture di folder model/.
+    predict(x) menerima (batch, timesteps, features) dan mengembalikan (batch, classes).
+    """
+    def __init__(self, model_path):
+        import h5py
+
+        self.model_path = model_path
+        with zipfile.ZipFile(model_path) as archive:
+            config = json.loads(archive.read("config.json"))
+            weights_bytes = archive.read("model.weights.h5")
+
+        if config.get("class_name") != "Sequential":
+            raise ValueError(f"{model_path}: hanya model Sequential yang didukung")
+
+        self.layers = []
+        self.input_shape = None
+        name_counts = {}
+        with h5py.File(io.BytesIO(weights_bytes), "r") as h5:
+            h5_layers = h5["layers"]
+            for layer in config["config"]["layers"]:
+                class_name = layer["class_name"]
+                layer_config = layer["config"]
+                if class_name == "InputLayer":
+                    self.input_shape = tuple(layer_config.get("batch_shape") or ())
+
+                # Nama grup h5 mengikuti urutan kemunculan: gru, gru_1, gru_2, ...
+                base = _snake_case(class_name)
+                index = name_counts.get(base, 0)
+                name_counts[base] = index + 1
+                if class_name in _SKIPPED_LAYERS:
+                    continue
+                if class_name not in _LAYER_TYPES:
+                    raise ValueError(f"{model_path}: layer {class_name} belum didukung oleh backend NumPy")
+
+                group_name = base if index == 0 else f"{base}_{index}"
+                weights = _read_layer_weights(h5_layers, group_name)
+                self.layers.append(_LAYER_TYPES[class_name](layer_config, weights))
+
+        self.predict_calls = 0
+        self._states = None     # state rekuren untuk predict_step(), per layer
+
+    def predict(self, x, verbose=0, batch_size=None):
+        """Kompatibel dengan keras Model.predict (argumen verbose diabaikan)."""
+        x = np.asarray(x, dtype=np.float32)
+        if x.ndim == 2:
+            x = x[:, None, :]
+        self.predict_calls += 1
+        if batch_size is None or len(x) <= batch_size:
+            return self._forward(x)
+        return np.concatenate([self._forward(x[i:i + batch_size]) for i in range(0, len(x), batch_size)])
+
+    def reset_state(self):
+        """Lupakan konteks temporal streaming (mis. saat tangan hilang dari kamera)."""
+        self._states = None
+
+    def predict_step(self, features):
+        """
+        Streaming: jalankan satu langkah sel untuk satu frame (76 fitur) dan simpan
+        hidden state tiap layer rekuren untuk frame berikutnya. Returns (1, classes).
+        """
+        out = np.asarray(features, dtype=np.float32).reshape(1, -1)
+        if self._states is None:
+            self._states = [layer.initial_state(1) if not isinstance(layer, _DenseLayer) else None
+                            for layer in self.layers]
+        self.predict_calls += 1
+        for i, layer in enumerate(self.layers):
+            if isinstance(layer, _DenseLayer):
+                out = layer(out)
+                continue
+            if isinstance(layer, _GRULayer):
+                state = layer.step(out @ layer.kernel + layer.input_bias, self._states[i])
+                out = state
+            else:
+                state = layer.step(out @ layer.kernel + layer.bias, self._states[i])
+                out = state[0]
+            self._states[i] = state
+        return out
+
+    def _forward(self, x):
+        out = x
+        for layer in self.layers:
+            if isinstance(layer, _DenseLayer):
+                out = layer(out)
+            else:
+                out, _ = layer(out)
+        return out
+
+
+def _load_keras_model(model_path):
+    from tensorflow.keras.models import load_model
+    from keras.initializers import Orthogonal
+    from keras.utils import custom_object_scope
+
+    with custom_object_scope({'Orthogonal': Orthogonal}):
+        return load_model(model_path, compile=False, safe_mode=False)
+
+
+def check_parity(model_path, samples=256, timesteps=1, atol=1e-4, seed=0):
+    """
+    Bandingkan output NumpyGestureModel dengan Keras untuk input acak.
+    Membutuhkan TensorFlow/Keras; return selisih absolut maksimum.
+    """
+    numpy_model = NumpyGestureModel(model_path)
+    features = numpy_model.input_shape[-1] if numpy_model.input_shape else 76
+    rng = np.random.default_rng(seed)
+    x = rng.normal(0.0, 0.5, (samples, timesteps, features)).astype(np.float32)
+
+    keras_model = _load_keras_model(model_path)
+
+    expected = keras_model.predict(x, verbose=0)
+    actual = numpy_model.predict(x)
+    max_diff = float(np.max(np.abs(expected - actual)))
+    same_label = float(np.mean(np.argmax(expected, axis=1) == np.argmax(actual, axis=1)))
+    status = "OK" if max_diff <= atol else "MISMATCH"
+    print(f"[{status}] {model_path}: max |diff| = {max_diff:.2e}, label sama = {same_label * 100:.1f}%")
+    return max_diff
+
+
+def _parity_inputs(input_shape, samples, seed):
+    """
+    Input referensi per bentuk input model: {kunci: (N, T, F)}.
+    Model dengan T=1 juga diberi urutan 4 langkah supaya recurrent kernel ikut teruji
+    (dan predict_step streaming bisa dibandingkan dengan output Keras untuk urutan itu).
+    """
+    timesteps = input_shape[1] or 1
+    features = input_shape[-1]
+    rng = np.random.default_rng(seed)
+    inputs = {f"{timesteps}x{features}": rng.normal(0.0, 0.5, (samples, timesteps, features))}
+    if timesteps == 1:
+        inputs[f"4x{features}"] = rng.normal(0.0, 0.5, (samples // 2, 4, features))
+    return {key: value.astype(np.float32) for key, value in inputs.items()}
+
+
+def write_parity_fixture(model_paths, path=PARITY_FIXTURE, samples=32, seed=0):
+    """Jalankan Keras (butuh TensorFlow) untuk semua model dan simpan input + output-nya ke `path`."""
+    import keras
+
+    arrays = {"paths": np.array(model_paths), "keras_version": np.array(keras.__version__)}
+    for i, model_path in enumerate(model_paths):
+        input_shape = NumpyGestureModel(model_path).input_shape
+        keras_model = _load_keras_model(model_path)
+        for key, x in _parity_inputs(input_shape, samples, seed).items():
+            arrays.setdefault(f"x_{key}", x)
+            arrays[f"y_{i}_{key}"] = keras_model.predict(x, verbose=0).astype(np.float32)
+        print(f"[DEBUG] Referensi Keras {model_path} ({input_shape})")
+    np.savez_compressed(path, **arrays)
+    print(f"[DEBUG] Fixture parity disimpan ke {path} ({len(model_paths)} model, keras {keras.__version__})")
+
+
+def check_parity_fixture(path=PARITY_FIXTURE, atol=1e-4):
+    """
+    Bandingkan NumpyGestureModel dengan output Keras yang tersimpan di `path`
+    (tanpa TensorFlow). Urutan multi-langkah juga dicek lewat predict_step.
+    Return list pesan kegagalan (kosong = semua model cocok).
+    """
+    failures = []
+    with np.load(path) as fixture:
+        arrays = {key: fixture[key] for key in fixture.files}
+    for i, model_path in enumerate(arrays["paths"].tolist()):
+        model = NumpyGestureModel(model_path)
+        for key in sorted(k[len(f"y_{i}_"):] for k in arrays if k.startswith(f"y_{i}_")):
+            x, expected = arrays[f"x_{key}"], arrays[f"y_{i}_{key}"]
+            max_diff = float(np.max(np.abs(model.predict(x) - expected)))
+            if x.shape[1] > 1 and model.input_shape[1] == 1:
+                # Streaming: predict_step frame demi frame = Keras pada urutan penuh
+                for sample, sequence in enumerate(x[:4]):
+                    model.reset_state()
+                    for frame in sequence:
+                        out = model.predict_step(frame)
+                    max_diff = max(max_diff, float(np.max(np.abs(out[0] - expected[sample]))))
+                model.reset_state()
+            status = "OK" if max_diff <= atol else "MISMATCH"
+            print(f"[{status}] {model_path} [{key}]: max |diff| = {max_diff:.2e}")
+            if max_diff > atol:
+                failures.append(f"{model_path} [{key}]: max |diff| {max_diff:.2e} > {atol:.0e} dari Keras "
+                                f"{arrays['keras_version']}")
+    return failures
+
+
+if __name__ == "__main__":
+    # python code/numpy_inference.py model/GRU/311025_GRU_3.keras [...]   -> cek parity dengan Keras
+    # python code/numpy_inference.py --write-fixture                       -> tulis ulang PARITY_FIXTURE (TensorFlow)
+    # python code/numpy_inference.py --check-fixture                       -> cek PARITY_FIXTURE (tanpa TensorFlow)
+    if sys.argv[1:2] == ["--write-fixture"]:
+        import glob
+        write_parity_fixture(sys.argv[2:] or sorted(glob.glob("model/**/*.keras", recursive=True)))
+        sys.exit(0)
+    if sys.argv[1:2] == ["--check-fixture"]:
+        sys.exit(1 if check_parity_fixture() else 0)
+    paths = sys.argv[1:] or ["model/GRU/311025_GRU_3.keras"]
+    for path in paths:
+        model = NumpyGestureModel(path)
+        sample = np.zeros((1, 1, model.input_shape[-1] if model.input_shape else 76), np.float32)
+        start = time.perf_counter()
+        for _ in range(1000):
+            model.predict(sample)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        print(f"{path}: {elapsed_ms / 1000:.3f} ms/predict (NumPy)")
+        try:
+            check_parity(path)
+        except ImportError:
+            print("TensorFlow tidak tersedia, parity check dilewati.")
@@ -0,0 +1,262 @@
+import argparse
+import glob
+import json
+import os
+import platform
+import sys
+import time
+
+import numpy as np
+
+from capture_sources import SyntheticSource
+from hand_features import FeatureEngine
+from numpy_inference import NumpyGestureModel
+
+# Evaluasi offline semua model gesture tanpa menjalankan game.
+# Landmark dari sesi rekaman / dataset berlabel dilewatkan ke pipeline fitur yang sama
+# dengan game (engineer_features_batch), lalu diprediksi batch besar oleh setiap model.
+# Hasil per model: laporan ala sklearn classification_report + latency & throughput.
+# Jalankan dari root repo (--data wajib):
+#     python code/rescore_models.py --data dataset.npz debug_logs/landmarks_*.lmk
+#     python code/rescore_models.py --models "model/GRU/*.keras" --data dataset.npz --output cache/rescore.json
+#     python code/rescore_models.py --data synthetic                  (smoke test, tanpa ranking)
+# Format data:
+#     .npz  : 'landmarks' (N, 21, 3) dan 'labels' (N,) dengan label 0..3
+#     .lmk  : sesi LandmarkRecorder; labelnya adalah prediksi game saat direkam
+#             (berguna untuk membandingkan model baru dengan model yang dipakai saat itu)
+#     synthetic : pose sintetis dari SyntheticSource (ground truth dari urutan gesture).
+#                 Hanya smoke test pipeline: akurasi di pose sintetis tidak mencerminkan data
+#                 pasien, jadi hasilnya tidak diurutkan dan tidak dipakai memilih model.
+
+CLASS_NAMES = ["palm", "fist", "thumb_index", "grabbing"]   # sama dengan classification_report*.json
+DEFAULT_MODELS = "model/**/*.keras"
+DEFAULT_OUTPUT = "cache/rescore/report.json"
+
+
+# ==============================================================================
+# Data
+# ==============================================================================
+def load_synthetic(seed=0, cycles=5, fps=30.0):
+    """Semua frame berlabel dari SyntheticSource (jeda tanpa tangan dibuang)."""
+    source = SyntheticSource(gestures=list(range(len(CLASS_NAMES))) * cycles, fps=fps, seed=seed, loop=False)
+    landmarks, labels = [], []
+    index = 0
+    while True:
+        frame = source.grab()
+        if frame is None:
+            break
+        label = source.expected_label(index)
+        index += 1
+        if frame.landmarks is not None and label is not None:
+            landmarks.append(frame.landmarks)
+            labels.append(label)
+    return np.asarray(landmarks, dtype=np.float32), np.asarray(labels, dtype=np.int64)
+
+
+def load_dataset(path):
+    """(landmarks (N, 21, 3), labels (N,)) dari .npz atau .lmk; frame tanpa tangan/label dibuang."""
+    if path == "synthetic":
+        return load_synthetic()
+    if path.endswith(".lmk"):
+        from landmark_recorder import load_landmark_session
+        session = load_landmark_session(path)
+        keep = (session["detected"] == 1) & (session["label"] >= 0)
+        return (np.asarray(session["landmarks"][keep], dtype=np.float32),
+                np.asarray(session["label"][keep], dtype=np.int64))
+    if path.endswith(".npz"):
+        data = np.load(path)
+        labels = data["labels"] if "labels" in data else data["label"]
+        landmarks = np.asarray(data["landmarks"], dtype=np.float32)
+        keep = ~np.isnan(landmarks).any(axis=(1, 2)) & (labels >= 0)
+        return landmarks[keep], np.asarray(labels[keep], dtype=np.int64)
+    raise ValueError(f"{path}: format data tidak dikenal (pakai .npz, .lmk atau 'synthetic')")
+
+
+# ==============================================================================
+# Metrik
+# ==============================================================================
+def confusion_matrix(y_true, y_pred, num_classes):
+    matrix = np.zeros((num_classes, num_classes), dtype=np.int64)
+    np.add.at(matrix, (y_true, y_pred), 1)
+    return matrix
+
+
+def classification_report(y_true, y_pred, class_names=CLASS_NAMES):
+    """Dict dengan struktur sama seperti sklearn classification_report(output_dict=True)."""
+    matrix = confusion_matrix(y_true, y_pred, len(class_names))
+    true_positive = np.diag(matrix).astype(np.float64)
+    support = matrix.sum(axis=1).astype(np.float64)
+    predicted = matrix.sum(axis=0).astype(np.float64)
+    precision = np.divide(true_positive, predicted, out=np.zeros_like(true_positive), where=predicted > 0)
+    recall = np.divide(true_positive, support, out=np.zeros_like(true_positive), where=support > 0)
+    denom = precision + recall
+    f1 = np.divide(2 * precision * recall, denom, out=np.zeros_like(denom), where=denom > 0)
+
+    report = {}
+    for i, name in enumerate(class_names):
+        report[name] = {"precision": float(precision[i]), "recall": float(recall[i]),
+                        "f1-score": float(f1[i]), "support": float(support[i])}
+    total = support.sum()
+    report["accuracy"] = float(true_positive.sum() / total) if total else 0.0
+    report["macro avg"] = {"precision": float(precision.mean()), "recall": float(recall.mean()),
+                           "f1-score": float(f1.mean()), "support": float(total)}
+    weights = support / total if total else np.zeros_like(support)
+    report["weighted avg"] = {"precision": float((precision * weights).sum()),
+                              "recall": float((recall * weights).sum()),
+                              "f1-score": float((f1 * weights).sum()), "support": float(total)}
+    return report, matrix
+
+
+# ==============================================================================
+# Evaluasi
+# ==============================================================================
+def score_model(model_path, features, labels, batch_size, latency_samples):
+    start = time.perf_counter()
+    model = NumpyGestureModel(model_path)
+    load_ms = (time.perf_counter() - start) * 1000
+    if model.input_shape and model.input_shape[-1] != features.shape[1]:
+        raise ValueError(f"model butuh {model.input_shape[-1]} fitur, pipeline menghasilkan {features.shape[1]}")
+
+    x = features.reshape(len(features), 1, -1)
+
+    # Batch besar: throughput
+    start = time.perf_counter()
+    probabilities = model.predict(x, batch_size=batch_size)
+    batch_s = time.perf_counter() - start
+    predictions = np.argmax(probabilities, axis=1)
+
+    # Satu sampel per panggilan, seperti di game: distribusi latency
+    count = min(latency_samples, len(x))
+    single = np.empty(count, dtype=np.float64)
+    for i in range(count):
+        t = time.perf_counter_ns()
+        model.predict(x[i:i + 1])
+        single[i] = time.perf_counter_ns() - t
+    single /= 1e6
+
+    report, matrix = classification_report(labels, predictions)
+    confidence = probabilities[np.arange(len(predictions)), predictions]
+    return {
+        "report": report,
+        "confusion_matrix": matrix.tolist(),
+        "mean_confidence": float(confidence.mean()) if len(confidence) else 0.0,
+        "latency": {
+            "load_ms": load_ms,
+            "batch_size": batch_size,
+            "batch_per_sample_ms": batch_s * 1000 / len(x) if len(x) else 0.0,
+            "throughput_samples_per_s": len(x) / batch_s if batch_s > 0 else 0.0,
+            "single_p50_ms": float(np.percentile(single, 50)) if count else 0.0,
+            "single_p95_ms": float(np.percentile(single, 95)) if count else 0.0,
+            "single_p99_ms": float(np.percentile(single, 99)) if count else 0.0,
+            "single_samples": count,
+        },
+    }
+
+
+def rescore(model_paths, data_paths, batch_size=1024, latency_samples=500):
+    landmarks, labels = [], []
+    datasets = {}
+    for path in data_paths:
+        data_landmarks, data_labels = load_dataset(path)
+        datasets[path] = int(len(data_labels))
+        print(f"[DEBUG] Data {path}: {len(data_labels)} sampel")
+        landmarks.append(data_landmarks)
+        labels.append(data_labels)
+    landmarks = np.concatenate(landmarks) if landmarks else np.zeros((0, 21, 3), np.float32)
+    labels = np.concatenate(labels) if labels else np.zeros(0, np.int64)
+    if len(labels) == 0:
+        raise ValueError("Tidak ada sampel berlabel untuk dievaluasi")
+
+    start = time.perf_counter()
+    features = FeatureEngine(capacity=len(landmarks)).extract_batch(landmarks).copy()
+    features_ms = (time.perf_counter() - start) * 1000
+    print(f"[DEBUG] Fitur {len(features)} sampel: {features_ms:.1f} ms")
+
+    models = {}
+    skipped = {}
+    for path in model_paths:
+        try:
+            models[path] = score_model(path, features, labels, batch_size, latency_samples)
+            result = models[path]
+            print(f"[DEBUG] {path}: akurasi {result['report']['accuracy'] * 100:.2f}%, "
+                  f"{result['latency']['single_p50_ms']:.3f} ms/sampel")
+        except Exception as e:
+            skipped[path] = str(e)
+            print(f"[WARN] Model {path} dilewati: {e}")
+
+    smoke_test = "synthetic" in datasets
+    ranking = [] if smoke_test else [
+        path for path, _ in sorted(models.items(), key=lambda item: (-item[1]["report"]["accuracy"],
+                                                                      item[1]["latency"]["single_p50_ms"]))]
+    return {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "numpy": np.__version__,
+            "classes": CLASS_NAMES,
+            "samples": int(len(labels)),
+            "datasets": datasets,
+            "features_ms": features_ms,
+            "smoke_test": smoke_test,
+        },
+        "ranking": ranking,     # terbaik dulu (akurasi, lalu latency); kosong untuk smoke test
+        "models": models,
+        "skipped": skipped,
+    }
+
+
+def print_summary(result):
+    if result["meta"]["smoke_test"]:
+        print("\n[WARN] SMOKE TEST: data sintetis ikut dievaluasi; akurasi tidak untuk memilih model, "
+              "urutan tidak diranking")
+        rows = sorted(result["models"].items())
+    else:
+        rows = [(path, result["models"][path]) for path in result["ranking"]]
+    print(f"\n{'model':<52} {'acc %':>7} {'macro f1':>9} {'p50 ms':>8} {'p95 ms':>8} {'batch/s':>11}")
+    for path, scores in rows:
+        report, latency = scores["report"], scores["latency"]
+        print(f"{path:<52} {report['accuracy'] * 100:>7.2f} {report['macro avg']['f1-score']:>9.4f} "
+              f"{latency['single_p50_ms']:>8.3f} {latency['single_p95_ms']:>8.3f} "
+              f"{latency['throughput_samples_per_s']:>11.0f}")
+    for path, reason in result["skipped"].items():
+        print(f"{path:<52} dilewati: {reason}")
+    if result["ranking"]:
+        print(f"\n[DEBUG] Model terbaik: {result['ranking'][0]}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Evaluasi offline semua model gesture.")
+    parser.add_argument("--models", nargs="*", default=[DEFAULT_MODELS],
+                        help=f"path/glob model .keras (default {DEFAULT_MODELS})")
+    parser.add_argument("--data", nargs="+", required=True,
+                        help="file/glob .npz/.lmk berlabel, atau 'synthetic' (smoke test, tanpa ranking)")
+    parser.add_argument("--batch-size", type=int, default=1024)
+    parser.add_argument("--latency-samples", type=int, default=500)
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    args = parser.parse_args(argv)
+
+    model_paths = sorted({path for pattern in args.models for path in glob.glob(pattern, recursive=True)})
+    data_paths = [path for pattern in args.data
+                  for path in ([pattern] if pattern == "synthetic" else sorted(glob.glob(pattern)))]
+    if not model_paths:
+        print(f"[ERROR] Tidak ada model yang cocok dengan {args.models}")
+        return 1
+    if not data_paths:
+        print(f"[ERROR] Tidak ada data yang cocok dengan {args.data}")
+        return 1
+
+    result = rescore(model_paths, data_paths, args.batch_size, args.latency_samples)
+    print_summary(result)
+
+    directory = os.path.dirname(args.output)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2)
+    print(f"\n[DEBUG] Laporan disimpan ke {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -44,4 +44,34 @@ HITBOX_OFFSET = {
     'grass': -10,
     'invisible': 0,
     'tile': 0,
-}
\ No newline at end of file
+}
+
+# Gesture recognition
+# True: capture, MediaPipe dan model dijalankan di proses terpisah (lihat inference_worker.py)
+GESTURE_WORKER_PROCESS = False
+
+# Sumber input kamera (lihat capture_sources.create_capture_source), contoh:
+#   {"type": "video", "path": "sesi.mp4"}
+#   {"type": "landmarks", "path": "sesi.npy"}
+#   {"type": "synthetic", "seed": 0}
+CAPTURE_SOURCE = {"type": "webcam"}
+
+# Rekam landmark tiap frame ke debug_logs/landmarks_*.lmk (lihat landmark_recorder.py)
+RECORD_LANDMARKS = False
+
+# Backend inferensi model gesture: "numpy" (tanpa TensorFlow, lihat numpy_inference.py) atau "keras"
+INFERENCE_BACKEND = "numpy"
+
+# Streaming inference: hidden state GRU dibawa antar frame, di-reset saat tangan tidak terdeteksi
+STREAMING_INFERENCE = False
+
+# Motion gate: selama dwell stabil pada gesture yang terakhir dikonfirmasi, pakai ulang prediksi
+# terakhir kalau landmark ternormalisasi bergeser < epsilon (satuan ukuran tangan); model tetap
+# jalan setiap frame kedua. None = selalu inferensi tiap frame. Diabaikan saat STREAMING_INFERENCE.
+# Nilai ini divalidasi oleh `python code/benchmark.py check` (aksi terkonfirmasi sama dengan tanpa gate).
+MOTION_GATE_EPSILON = 0.05
+
+# Daftar level (map, target heart, threshold confidence, level berikutnya), lihat level_registry.py
+LEVEL_MANIFEST = "map/levels.json"
+# Jumlah data map level yang disimpan di memori (LRU)
+LEVEL_CACHE_SIZE = 3
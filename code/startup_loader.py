@@ -0,0 +1,63 @@
+import threading
+import time
+
+class StartupLoader:
+    """
+    Menjalankan tahap startup yang berat (probe kamera, MediaPipe, load model) di
+    thread background supaya window dan menu bisa tampil langsung.
+    start(fn, *args) memanggil fn(*args, progress=self.report); fn melaporkan tahapnya
+    lewat progress("Memuat model", 0.6). wait() mengembalikan hasil fn (None kalau gagal).
+    """
+    def __init__(self):
+        self.stage = "Menunggu"
+        self.progress = 0.0
+        self.result = None
+        self.error = None
+        self.done = threading.Event()
+        self.lock = threading.Lock()
+        self.thread = None
+        self.start_time = None
+        self.elapsed_ms = None
+
+    def start(self, fn, *args):
+        self.start_time = time.perf_counter()
+        self.thread = threading.Thread(target=self._run, args=(fn, args), name="StartupLoader", daemon=True)
+        self.thread.start()
+
+    def _run(self, fn, args):
+        try:
+            self.result = fn(*args, progress=self.report)
+        except Exception as e:
+            self.error = e
+            print(f"[WARN] Startup gagal: {e}")
+        self.elapsed_ms = (time.perf_counter() - self.start_time) * 1000
+        self.report("Siap" if self.error is None else "Gagal", 1.0)
+        print(f"[DEBUG] Startup selesai ({self.elapsed_ms:.0f} ms)")
+        self.done.set()
+
+    def report(self, stage, progress):
+        """Dipanggil dari thread background untuk memperbarui tahap yang sedang berjalan."""
+        with self.lock:
+            self.stage = stage
+            self.progress = max(0.0, min(1.0, progress))
+        print(f"[DEBUG] Startup: {stage} ({progress * 100:.0f}%)")
+
+    def is_ready(self):
+        return self.done.is_set()
+
+    def status(self):
+        """(tahap, progress 0..1) saat ini, aman dibaca dari game thread."""
+        with self.lock:
+            return self.stage, self.progress
+
+    def status_text(self):
+        """Teks singkat untuk menu, atau None kalau startup sudah selesai."""
+        if self.is_ready():
+            return None
+        stage, progress = self.status()
+        return f"{stage}... {progress * 100:.0f}%"
+
+    def wait(self, timeout=None):
+        if not self.done.wait(timeout):
+            return None
+        return self.result
@@ -0,0 +1,131 @@
+import threading
+import time
+
+import numpy as np
+
+# Tracing latency per tahap pipeline (capture, deteksi, fitur, inferensi, render).
+# Setiap tahap punya ring buffer ukuran tetap berisi durasi (ms) frame-frame terakhir,
+# jadi overhead-nya hanya dua perf_counter() dan satu penulisan array per span.
+# Pemakaian:
+#     from tracing import tracer
+#     with tracer.span("inference"):
+#         model.predict(...)
+#     tracer.percentiles("inference")  -> {"p50": ..., "p95": ..., "p99": ...}
+
+# Urutan tahap untuk laporan / log debugger
+STAGES = ("capture", "detection", "features", "inference", "camera",
+          "update", "render_world", "render_hud", "present", "frame")
+
+
+class _StageBuffer:
+    __slots__ = ("durations", "index", "count", "total")
+
+    def __init__(self, capacity):
+        self.durations = np.zeros(capacity, dtype=np.float64)
+        self.index = 0
+        self.count = 0
+        self.total = 0     # jumlah sampel sejak awal
+
+    def add(self, duration_ms):
+        self.durations[self.index] = duration_ms
+        self.index = (self.index + 1) % len(self.durations)
+        if self.count < len(self.durations):
+            self.count += 1
+        self.total += 1
+
+    def window(self):
+        return self.durations[:self.count]
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "start")
+
+    def __init__(self, tracer, name):
+        self.tracer = tracer
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.tracer.record(self.name, (time.perf_counter() - self.start) * 1000)
+        return False
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Tracer:
+    def __init__(self, capacity=600, enabled=True):
+        self.capacity = capacity        # 600 sampel = 10 detik pada 60 FPS
+        self.enabled = enabled
+        self.stages = {}
+        self.lock = threading.Lock()    # dibaca dari thread GameDebugger
+
+    def span(self, name):
+        """Context manager yang mencatat durasi blok ke tahap `name`."""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name)
+
+    def record(self, name, duration_ms):
+        """Catat durasi (ms) yang diukur sendiri, mis. oleh worker process."""
+        if not self.enabled:
+            return
+        buffer = self.stages.get(name)
+        if buffer is None:
+            with self.lock:
+                buffer = self.stages.setdefault(name, _StageBuffer(self.capacity))
+        buffer.add(duration_ms)
+
+    def percentiles(self, name, q=(50, 95, 99)):
+        """Rolling percentile (ms) untuk satu tahap, None kalau belum ada sampel."""
+        buffer = self.stages.get(name)
+        if buffer is None or buffer.count == 0:
+            return None
+        values = np.percentile(buffer.window().copy(), q)
+        return {f"p{int(p)}": float(v) for p, v in zip(q, values)}
+
+    def last(self, name):
+        buffer = self.stages.get(name)
+        if buffer is None or buffer.count == 0:
+            return 0.0
+        return float(buffer.durations[buffer.index - 1])
+
+    def summary(self):
+        """{tahap: {"p50", "p95", "p99", "count"}} untuk semua tahap yang tercatat."""
+        with self.lock:
+            names = list(self.stages)
+        ordered = [s for s in STAGES if s in names] + [s for s in names if s not in STAGES]
+        result = {}
+        for name in ordered:
+            stats = self.percentiles(name)
+            if stats is not None:
+                stats["count"] = self.stages[name].total
+                result[name] = stats
+        return result
+
+    def report(self):
+        lines = [f"{'stage':<14}{'p50':>9}{'p95':>9}{'p99':>9}  (ms)"]
+        for name, stats in self.summary().items():
+            lines.append(f"{name:<14}{stats['p50']:>9.2f}{stats['p95']:>9.2f}{stats['p99']:>9.2f}")
+        return "\n".join(lines)
+
+    def reset(self):
+        with self.lock:
+            self.stages = {}
+
+
+# Instance global yang dipakai camera, level, ui dan main
+tracer = Tracer()
@@ -1,4 +1,5 @@
 import pygame, os
+from assets import assets
 
 class TutorialOverlay:
     def __init__(self, screen):
@@ -8,15 +9,15 @@ class TutorialOverlay:
         self.popup_h = 520
 
         # Font mengikuti gaya sebelumnya
-        self.font = pygame.font.Font(None, 22)
-        self.title_font = pygame.font.Font(None, 32)
+        self.font = assets.font(None, 22)
+        self.title_font = assets.font(None, 32)
 
-        # Load gesture images
+        # Load gesture images (sudah di-resize 200x100, sama dengan panel gesture di Level)
         self.gestures = {
-            "thumb_index": pygame.image.load("graphics/tutorials/kiri.png"),
-            "grabbing": pygame.image.load("graphics/tutorials/kanan.png"),
-            "palm": pygame.image.load("graphics/tutorials/atas.png"),
-            "fist": pygame.image.load("graphics/tutorials/bawah.png")
+            "thumb_index": assets.image("graphics/tutorials/kiri.png", size=(200, 100), smooth=True),
+            "grabbing": assets.image("graphics/tutorials/kanan.png", size=(200, 100), smooth=True),
+            "palm": assets.image("graphics/tutorials/atas.png", size=(200, 100), smooth=True),
+            "fist": assets.image("graphics/tutorials/bawah.png", size=(200, 100), smooth=True)
         }
 
         # Instructions
@@ -78,8 +79,7 @@ class TutorialOverlay:
             y = 0
 
             for label in gesture_labels:
-                img = pygame.transform.smoothscale(self.gestures[label], (200, 100))
-                content_surface.blit(img, (0, y))
+                content_surface.blit(self.gestures[label], (0, y))
 
                 wrapped = self.wrap_text(self.instructions[label], self.font, 360)
                 ty = y
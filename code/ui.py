@@ -1,20 +1,43 @@
 import pygame
 import math
 from settings import *
-from camera import HandGestureCamera
+from tracing import tracer
+from assets import assets
+
+
+class HudLayer:
+    """
+    Widget HUD yang di-cache sebagai surface jadi.
+    render_fn(value) -> (surface, topleft) hanya dipanggil ulang kalau value berubah;
+    frame lain cukup blit surface yang sama.
+    """
+    def __init__(self, render_fn):
+        self.render_fn = render_fn
+        self.value = None
+        self.surface = None
+        self.topleft = (0, 0)
+        self.renders = 0
+
+    def draw(self, target, value=None):
+        if self.surface is None or value != self.value:
+            self.surface, self.topleft = self.render_fn(value)
+            self.value = value
+            self.renders += 1
+        target.blit(self.surface, self.topleft)
+        return self.surface.get_rect(topleft=self.topleft)
+
 
 class UI:
     def __init__(self, screen_surface):
         self.display_surface = screen_surface
-        self.font = pygame.font.Font(None, 30)
+        self.font = assets.font(None, 30)
         
         # Load item graphics
         self.item_graphics = {}
         for item in ITEM_TYPES:
             try:
                 graphic_path = 'graphics/items/heart.png'
-                self.item_graphics[item] = pygame.image.load(graphic_path).convert_alpha()
-                self.item_graphics[item] = pygame.transform.scale(self.item_graphics[item], (50, 50))
+                self.item_graphics[item] = assets.image(graphic_path, size=(50, 50))
             except Exception as e:
                 print(f"Could not load graphic for {item}: {e}. Creating placeholder.")
                 surf = pygame.Surface((32, 32))
@@ -35,6 +58,12 @@ class UI:
         self.pause_button_rect = pygame.Rect(20, 90, 100, 40)
         self.is_paused = False
 
+        # Layer HUD yang di-cache (render ulang hanya saat nilainya berubah)
+        self.inventory_layer = HudLayer(self.render_inventory)
+        self.pause_button_layer = HudLayer(self.render_pause_button)
+        self.pause_overlay_layer = HudLayer(self.render_pause_overlay)
+        self.pause_text_layer = HudLayer(self.render_pause_text)
+
     # ===============================
     # ==== CAMERA & DWELL CLOCK ====
     # ===============================
@@ -47,12 +76,15 @@ class UI:
         self.show_camera_feed = not self.show_camera_feed
 
     def display_camera_feed(self):
-        """Displays the camera feed in the top-right corner."""
+        """
+        Displays the camera feed in the top-right corner.
+        Hanya merender FrameResult terakhir dari camera.process(), tanpa membaca kamera lagi.
+        """
         if self.camera_object and self.show_camera_feed:
             try:
-                cam_surface = self.camera_object.get_frame()
+                frame_result = getattr(self.camera_object, "last_result", None)
+                cam_surface = self.camera_object.render_preview(frame_result)
                 if cam_surface:
-                    cam_surface = pygame.transform.scale(cam_surface, (200, 160))
                     cam_rect = cam_surface.get_rect(topright=(self.display_surface.get_width() - 10, 10))
                     self.display_surface.blit(cam_surface, cam_rect)
                     pygame.draw.rect(self.display_surface, (255, 255, 255), cam_rect, 2)
@@ -82,26 +114,43 @@ class UI:
     # ==== INVENTORY PANEL ====
     # ==========================
     def show_inventory(self, inventory, target):
+        self.inventory_layer.draw(self.display_surface, (tuple(inventory.items()), target))
+
+        # --- Gambar tombol pause di posisi tetap ---
+        self.draw_pause_button(90)
+
+    def render_inventory(self, value):
+        """Render panel inventory (kotak item + teks 'n / target') ke satu surface."""
+        items, target = value
         x, y = 20, 20
-        for index, (item, amount) in enumerate(inventory.items()):
+        parts = []
+        for index, (item, amount) in enumerate(items):
             item_image = self.item_graphics.get(item)
             if item_image:
                 item_rect = item_image.get_rect(topleft=(x, y + index * 60))
                 bg_rect = item_rect.inflate(20, 20)
-                pygame.draw.rect(self.display_surface, UI_BG_COLOR, bg_rect, border_radius=5)
-                self.display_surface.blit(item_image, item_rect)
-                pygame.draw.rect(self.display_surface, UI_BORDER_COLOR, bg_rect, 3, border_radius=5)
-                
+
                 display_text = f'{amount} / {target}'
                 amount_text = self.font.render(display_text, False, TEXT_COLOR)
                 amount_rect = amount_text.get_rect(midleft=(item_rect.right + 10, item_rect.centery))
                 bg_text_rect = amount_rect.inflate(10, 10)
-                pygame.draw.rect(self.display_surface, UI_BG_COLOR, bg_text_rect, border_radius=5)
-                self.display_surface.blit(amount_text, amount_rect)
-                pygame.draw.rect(self.display_surface, UI_BORDER_COLOR, bg_text_rect, 3, border_radius=5)
+                parts.append((item_image, item_rect, bg_rect, amount_text, amount_rect, bg_text_rect))
 
-        # --- Gambar tombol pause di posisi tetap ---
-        self.draw_pause_button(90)
+        if not parts:
+            return pygame.Surface((0, 0)), (x, y)
+
+        bounds = parts[0][2].unionall([rect for part in parts for rect in (part[2], part[5])])
+        surface = pygame.Surface(bounds.size, pygame.SRCALPHA)
+        dx, dy = -bounds.x, -bounds.y
+        for item_image, item_rect, bg_rect, amount_text, amount_rect, bg_text_rect in parts:
+            pygame.draw.rect(surface, UI_BG_COLOR, bg_rect.move(dx, dy), border_radius=5)
+            surface.blit(item_image, item_rect.move(dx, dy))
+            pygame.draw.rect(surface, UI_BORDER_COLOR, bg_rect.move(dx, dy), 3, border_radius=5)
+
+            pygame.draw.rect(surface, UI_BG_COLOR, bg_text_rect.move(dx, dy), border_radius=5)
+            surface.blit(amount_text, amount_rect.move(dx, dy))
+            pygame.draw.rect(surface, UI_BORDER_COLOR, bg_text_rect.move(dx, dy), 3, border_radius=5)
+        return surface, bounds.topleft
 
 
     # ==========================
@@ -109,13 +158,35 @@ class UI:
     # ==========================
     def draw_pause_button(self, y_offset=None):
         """Menampilkan tombol pause di pojok kiri atas."""
+        y = self.pause_button_rect.y if y_offset is None else y_offset
+        self.pause_button_layer.draw(self.display_surface, y)
+
+    def render_pause_button(self, y):
         rect = self.pause_button_rect.copy()
-        if y_offset is not None:
-            rect.y = y_offset
-        pygame.draw.rect(self.display_surface, (0, 120, 200), rect, border_radius=8)
+        rect.y = y
+        surface = pygame.Surface(rect.size, pygame.SRCALPHA)
+        pygame.draw.rect(surface, (0, 120, 200), surface.get_rect(), border_radius=8)
         text = self.font.render("Pause", True, (255, 255, 255))
-        text_rect = text.get_rect(center=rect.center)
-        self.display_surface.blit(text, text_rect)
+        text_rect = text.get_rect(center=surface.get_rect().center)
+        surface.blit(text, text_rect)
+        return surface, rect.topleft
+
+    def draw_pause_overlay(self):
+        """Overlay gelap + teks 'Game Paused' (di-cache per ukuran layar)."""
+        size = self.display_surface.get_size()
+        self.pause_overlay_layer.draw(self.display_surface, size)
+        self.pause_text_layer.draw(self.display_surface, size)
+
+    def render_pause_overlay(self, size):
+        overlay = pygame.Surface(size, pygame.SRCALPHA)
+        overlay.fill((0, 0, 0, 150))
+        return overlay, (0, 0)
+
+    def render_pause_text(self, size):
+        font = assets.font(None, 60)
+        text = font.render("Game Paused", True, (255, 255, 255))
+        text_rect = text.get_rect(center=(size[0] // 2, size[1] // 2))
+        return text, text_rect.topleft
 
     def handle_pause_click(self, pos):
         """True jika tombol pause diklik."""
@@ -136,9 +207,10 @@ class UI:
     # ==========================
     def display(self, player, target):
         """Displays all UI elements."""
-        if player and hasattr(player, 'inventory'):
-            self.show_inventory(player.inventory, target)
-        
-        camera_rect = self.display_camera_feed()
-        self.display_dwell_clock(camera_rect)
-        self.draw_pause_button()
+        with tracer.span("render_hud"):
+            if player and hasattr(player, 'inventory'):
+                self.show_inventory(player.inventory, target)
+
+            camera_rect = self.display_camera_feed()
+            self.display_dwell_clock(camera_rect)
+            self.draw_pause_button()